@@ -1,9 +1,19 @@
+import asyncio
+
+# uvloop o'rnatilgan bo'lsa tezroq event loop (loader dan oldin bo'lishi shart)
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
 from aiogram import executor
 
 from loader import dp, user_db, group_db,channel_db,cache_db,book_db
 import middlewares, filters, handlers
 from utils.notify_admins import on_startup_notify
 from utils.set_bot_commands import set_default_commands
+from utils.periodic_flush import periodic_flush, flush_pending_writes
 
 
 async def on_startup(dispatcher):
@@ -22,9 +32,20 @@ async def on_startup(dispatcher):
     except Exception as err:
         print(f"Error while creating tables: {err}")
 
+    # Ro'yxatdan o'tgan foydalanuvchilarni xotiraga yuklash
+    user_db.load_known_users()
+
+    # Faollik kabi yozuvlarni fon rejimida bazaga yozib turish
+    asyncio.create_task(periodic_flush())
+
     # Bot ishga tushgani haqida adminga xabar berish
     await on_startup_notify(dispatcher)
 
 
+async def on_shutdown(dispatcher):
+    # Qolgan yozuvlarni yo'qotmaslik
+    flush_pending_writes()
+
+
 if __name__ == '__main__':
-    executor.start_polling(dp, on_startup=on_startup)
+    executor.start_polling(dp, on_startup=on_startup, on_shutdown=on_shutdown)
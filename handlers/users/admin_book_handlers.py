@@ -16,7 +16,7 @@ from aiogram import types
 from aiogram.dispatcher import FSMContext
 from aiogram.dispatcher.filters import Text
 from aiogram.dispatcher.filters.state import State, StatesGroup
-from typing import Optional, List, Union
+from typing import Dict, Optional, List, Union
 import logging
 import re
 
@@ -32,8 +32,8 @@ from utils.db_api.book_database import (
 # Keyboard imports
 from keyboards.default.admin_keyboards import (
     # Reply keyboards
-    admin_main_menu, admin_category_menu, admin_book_menu,
-    admin_cancel_btn, admin_skip_btn, admin_done_btn,
+    admin_main_menu_json, admin_category_menu_json, admin_book_menu_json,
+    admin_cancel_btn_json, admin_skip_btn_json, admin_done_btn_json,
     admin_back_btn, admin_confirm_reply_btn,
     # Inline keyboards
     adm_categories_kb, adm_subcategories_kb, adm_parent_select_kb,
@@ -107,52 +107,54 @@ async def is_admin(user_id: int) -> bool:
     if user_id in ADMINS:
         return True
 
-    # Database dan tekshirish
-    user = user_db.select_user(telegram_id=user_id)
-    if user:
-        # user[0] = id (database id)
-        return user_db.check_if_admin(user_id=user[0])
+    # Database dan tekshirish (Users.id xotiradagi xaritadan olinadi)
+    db_id = user_db.get_user_id(user_id)
+    if db_id:
+        return user_db.check_if_admin(user_id=db_id)
     return False
 
 
 def get_user_db_id(telegram_id: int) -> Optional[int]:
     """Telegram ID dan database ID olish"""
-    user = user_db.select_user(telegram_id=telegram_id)
-    return user[0] if user else None
+    return user_db.get_user_id(telegram_id)
 
 
 def format_book_info(book: Book, detailed: bool = False) -> str:
     """Kitob ma'lumotlarini formatlash"""
     emoji = AdminEmoji.BOOK_PDF if book.file_type == FileType.PDF else AdminEmoji.BOOK_AUDIO
 
-    text = f"{emoji} <b>{book.title}</b>\n\n"
-    text += f"✍️ Muallif: {book.author or '—'}\n"
+    parts = [
+        f"{emoji} <b>{book.title}</b>\n\n",
+        f"✍️ Muallif: {book.author or '—'}\n",
+    ]
 
     if book.file_type == FileType.AUDIO:
-        text += f"🎙 Hikoyachi: {book.narrator or '—'}\n"
-        text += f"⏱ Davomiylik: {book.duration_formatted or '—'}\n"
+        parts.append(f"🎙 Hikoyachi: {book.narrator or '—'}\n")
+        parts.append(f"⏱ Davomiylik: {book.duration_formatted or '—'}\n")
 
-    text += f"📁 Kategoriya: {book.category_name or '—'}\n"
-    text += f"📦 Hajmi: {book.file_size_formatted or '—'}\n"
-    text += f"📥 Yuklab olishlar: {book.download_count}\n"
+    parts.append(f"📁 Kategoriya: {book.category_name or '—'}\n")
+    parts.append(f"📦 Hajmi: {book.file_size_formatted or '—'}\n")
+    parts.append(f"📥 Yuklab olishlar: {book.download_count}\n")
 
     if detailed and book.description:
-        text += f"\n📄 <i>{truncate_text(book.description, 200)}</i>"
+        parts.append(f"\n📄 <i>{truncate_text(book.description, 200)}</i>")
 
-    return text
+    return "".join(parts)
 
 
 def format_category_info(category: Category, book_count: int = 0) -> str:
     """Kategoriya ma'lumotlarini formatlash"""
-    text = f"📁 <b>{category.name}</b>\n\n"
-    text += f"📄 Tavsif: {category.description or '—'}\n"
-    text += f"📚 Kitoblar: {book_count} ta\n"
+    parts = [
+        f"📁 <b>{category.name}</b>\n\n",
+        f"📄 Tavsif: {category.description or '—'}\n",
+        f"📚 Kitoblar: {book_count} ta\n",
+    ]
 
     if category.parent_id:
         path = book_db.get_category_path(category.id)
-        text += f"📂 Yo'l: {path}\n"
+        parts.append(f"📂 Yo'l: {path}\n")
 
-    return text
+    return "".join(parts)
 
 
 def parse_caption(caption: str, file_name: str = None) -> dict:
@@ -273,7 +275,7 @@ async def admin_panel(message: types.Message):
     if stats.deleted_books > 0 or stats.deleted_categories > 0:
         text += f"\n🗑 O'chirilgan: {stats.deleted_books} kitob, {stats.deleted_categories} kategoriya"
 
-    await message.answer(text, reply_markup=admin_main_menu())
+    await message.answer(text, reply_markup=admin_main_menu_json())
 
 
 @dp.message_handler(Text(equals=f"{AdminEmoji.BACK} Admin menyu"))
@@ -286,7 +288,7 @@ async def back_to_admin_menu(message: types.Message, state: FSMContext):
     if current:
         await state.finish()
 
-    await message.answer("👨‍💼 <b>Admin Panel</b>", reply_markup=admin_main_menu())
+    await message.answer("👨‍💼 <b>Admin Panel</b>", reply_markup=admin_main_menu_json())
 
 
 @dp.message_handler(Text(equals=f"{AdminEmoji.HOME} Bosh menyu"))
@@ -296,8 +298,8 @@ async def go_home(message: types.Message, state: FSMContext):
     if current:
         await state.finish()
 
-    from keyboards.default.user_keyboards import user_main_menu
-    await message.answer("🏠 Bosh menyu", reply_markup=user_main_menu())
+    from keyboards.default.user_keyboards import user_main_menu_json
+    await message.answer("🏠 Bosh menyu", reply_markup=user_main_menu_json())
 
 
 # =================== KATEGORIYALAR BO'LIMI ===================
@@ -307,7 +309,7 @@ async def categories_section(message: types.Message):
     """Kategoriyalar bo'limi"""
     if not await is_admin(message.from_user.id):
         return
-    await message.answer("📁 <b>Kategoriyalar boshqaruvi</b>", reply_markup=admin_category_menu())
+    await message.answer("📁 <b>Kategoriyalar boshqaruvi</b>", reply_markup=admin_category_menu_json())
 
 
 @dp.message_handler(Text(equals=f"{AdminEmoji.ADD} Kategoriya"))
@@ -329,11 +331,11 @@ async def add_category_start(message: types.Message, state: FSMContext):
         await AdminCategoryState.select_parent.set()
     else:
         await state.update_data(parent_id=None)
-        await message.answer("📝 <b>Kategoriya nomini kiriting:</b>", reply_markup=admin_cancel_btn())
+        await message.answer("📝 <b>Kategoriya nomini kiriting:</b>", reply_markup=admin_cancel_btn_json())
         await AdminCategoryState.enter_name.set()
 
 
-@dp.callback_query_handler(lambda c: c.data.startswith("adm_parent:"), state=AdminCategoryState.select_parent)
+@dp.callback_query_handler(Text(startswith="adm_parent:"), state=AdminCategoryState.select_parent)
 async def category_parent_selected(callback: types.CallbackQuery, state: FSMContext):
     """Parent tanlandi"""
     parent_id = AdminCallbackParser.get_int_param(callback.data, 0)
@@ -347,7 +349,7 @@ async def category_parent_selected(callback: types.CallbackQuery, state: FSMCont
             await callback.message.edit_text(f"📂 <b>'{parent.name}'</b> ichiga subkategoriya")
 
     await state.update_data(parent_id=parent_id)
-    await callback.message.answer("📝 <b>Kategoriya nomini kiriting:</b>", reply_markup=admin_cancel_btn())
+    await callback.message.answer("📝 <b>Kategoriya nomini kiriting:</b>", reply_markup=admin_cancel_btn_json())
     await AdminCategoryState.enter_name.set()
     await callback.answer()
 
@@ -357,7 +359,7 @@ async def category_name_entered(message: types.Message, state: FSMContext):
     """Kategoriya nomi kiritildi"""
     if message.text == f"{AdminEmoji.CANCEL} Bekor":
         await state.finish()
-        await message.answer("❌ Bekor qilindi", reply_markup=admin_category_menu())
+        await message.answer("❌ Bekor qilindi", reply_markup=admin_category_menu_json())
         return
 
     name = message.text.strip()
@@ -372,7 +374,7 @@ async def category_name_entered(message: types.Message, state: FSMContext):
         return
 
     await state.update_data(cat_name=name)
-    await message.answer("📄 <b>Tavsif kiriting:</b>\n<i>(Yoki o'tkazib yuboring)</i>", reply_markup=admin_skip_btn())
+    await message.answer("📄 <b>Tavsif kiriting:</b>\n<i>(Yoki o'tkazib yuboring)</i>", reply_markup=admin_skip_btn_json())
     await AdminCategoryState.enter_description.set()
 
 
@@ -381,7 +383,7 @@ async def category_desc_entered(message: types.Message, state: FSMContext):
     """Kategoriya tavsifi"""
     if message.text == f"{AdminEmoji.CANCEL} Bekor":
         await state.finish()
-        await message.answer("❌ Bekor qilindi", reply_markup=admin_category_menu())
+        await message.answer("❌ Bekor qilindi", reply_markup=admin_category_menu_json())
         return
 
     description = None
@@ -392,7 +394,7 @@ async def category_desc_entered(message: types.Message, state: FSMContext):
     user_id = get_user_db_id(message.from_user.id)
 
     if not user_id:
-        await message.answer("❌ Foydalanuvchi topilmadi!", reply_markup=admin_category_menu())
+        await message.answer("❌ Foydalanuvchi topilmadi!", reply_markup=admin_category_menu_json())
         await state.finish()
         return
 
@@ -405,12 +407,12 @@ async def category_desc_entered(message: types.Message, state: FSMContext):
         )
         path = book_db.get_category_path(cat_id)
         await message.answer(f"✅ <b>Kategoriya qo'shildi!</b>\n\n📁 {path}\n📄 {description or '—'}",
-                             reply_markup=admin_category_menu())
+                             reply_markup=admin_category_menu_json())
         logger.info(f"Category added: {data['cat_name']} by user {message.from_user.id}")
     except ValueError as e:
-        await message.answer(f"⚠️ {e}", reply_markup=admin_category_menu())
+        await message.answer(f"⚠️ {e}", reply_markup=admin_category_menu_json())
     except Exception as e:
-        await message.answer(f"❌ Xatolik: {e}", reply_markup=admin_category_menu())
+        await message.answer(f"❌ Xatolik: {e}", reply_markup=admin_category_menu_json())
         logger.error(f"Error adding category: {e}")
 
     await state.finish()
@@ -426,20 +428,24 @@ async def list_categories(message: types.Message):
     main_cats = [c for c in categories if c.parent_id is None]
 
     if not main_cats:
-        await message.answer("📂 Kategoriyalar yo'q.", reply_markup=admin_category_menu())
+        await message.answer("📂 Kategoriyalar yo'q.", reply_markup=admin_category_menu_json())
         return
 
-    text = "📚 <b>Kategoriyalar:</b>\n\n"
+    subcats_by_parent: Dict[int, List[Category]] = {}
+    for c in categories:
+        if c.parent_id is not None:
+            subcats_by_parent.setdefault(c.parent_id, []).append(c)
+
+    parts = ["📚 <b>Kategoriyalar:</b>\n\n"]
     for i, cat in enumerate(main_cats, 1):
-        text += f"{i}. 📁 <b>{cat.name}</b> — {cat.book_count} ta\n"
+        parts.append(f"{i}. 📁 <b>{cat.name}</b> — {cat.book_count} ta\n")
         if cat.description:
-            text += f"   <i>{truncate_text(cat.description, 50)}</i>\n"
-        subcats = [c for c in categories if c.parent_id == cat.id]
-        for sub in subcats:
-            text += f"   └─ 📂 {sub.name} — {sub.book_count} ta\n"
-        text += "\n"
+            parts.append(f"   <i>{truncate_text(cat.description, 50)}</i>\n")
+        for sub in subcats_by_parent.get(cat.id, []):
+            parts.append(f"   └─ 📂 {sub.name} — {sub.book_count} ta\n")
+        parts.append("\n")
 
-    await message.answer(text, reply_markup=admin_category_menu())
+    await message.answer("".join(parts), reply_markup=admin_category_menu_json())
 
 
 # =================== KITOBLAR BO'LIMI ===================
@@ -449,7 +455,7 @@ async def books_section(message: types.Message):
     """Kitoblar bo'limi"""
     if not await is_admin(message.from_user.id):
         return
-    await message.answer("📖 <b>Kitoblar boshqaruvi</b>", reply_markup=admin_book_menu())
+    await message.answer("📖 <b>Kitoblar boshqaruvi</b>", reply_markup=admin_book_menu_json())
 
 
 @dp.message_handler(Text(equals=f"{AdminEmoji.UPLOAD} Kitob yuklash"))
@@ -460,7 +466,7 @@ async def add_book_start(message: types.Message, state: FSMContext):
 
     main_cats = book_db.get_main_categories()
     if not main_cats:
-        await message.answer("⚠️ Avval kategoriya qo'shing!", reply_markup=admin_book_menu())
+        await message.answer("⚠️ Avval kategoriya qo'shing!", reply_markup=admin_book_menu_json())
         return
 
     keyboard = adm_categories_kb(main_cats, prefix="adm_add_cat", back_callback="adm_back:book_menu")
@@ -468,7 +474,7 @@ async def add_book_start(message: types.Message, state: FSMContext):
     await AdminBookState.select_category.set()
 
 
-@dp.callback_query_handler(lambda c: c.data.startswith("adm_add_cat:"), state=AdminBookState.select_category)
+@dp.callback_query_handler(Text(startswith="adm_add_cat:"), state=AdminBookState.select_category)
 async def add_book_category(callback: types.CallbackQuery, state: FSMContext):
     """Kategoriya tanlandi"""
     cat_id = AdminCallbackParser.get_int_param(callback.data, 0)
@@ -490,14 +496,14 @@ async def add_book_category(callback: types.CallbackQuery, state: FSMContext):
         await callback.message.edit_text(f"✅ Kategoriya: <b>{category.name}</b>")
         await callback.message.answer(
             f"📤 <b>Faylni yuklang:</b>\n• {AdminEmoji.BOOK_PDF} PDF\n• {AdminEmoji.BOOK_AUDIO} Audio",
-            reply_markup=admin_cancel_btn()
+            reply_markup=admin_cancel_btn_json()
         )
         await AdminBookState.upload_file.set()
 
     await callback.answer()
 
 
-@dp.callback_query_handler(lambda c: c.data.startswith("adm_add_sub:"), state=AdminBookState.select_subcategory)
+@dp.callback_query_handler(Text(startswith="adm_add_sub:"), state=AdminBookState.select_subcategory)
 async def add_book_subcategory(callback: types.CallbackQuery, state: FSMContext):
     """Subkategoriya tanlandi"""
     sub_id = AdminCallbackParser.get_int_param(callback.data, 0)
@@ -512,13 +518,13 @@ async def add_book_subcategory(callback: types.CallbackQuery, state: FSMContext)
     await callback.message.edit_text(f"✅ Kategoriya: <b>{path}</b>")
     await callback.message.answer(
         f"📤 <b>Faylni yuklang:</b>\n• {AdminEmoji.BOOK_PDF} PDF\n• {AdminEmoji.BOOK_AUDIO} Audio",
-        reply_markup=admin_cancel_btn()
+        reply_markup=admin_cancel_btn_json()
     )
     await AdminBookState.upload_file.set()
     await callback.answer()
 
 
-@dp.callback_query_handler(lambda c: c.data.startswith("adm_add_sub_direct:"), state=AdminBookState.select_subcategory)
+@dp.callback_query_handler(Text(startswith="adm_add_sub_direct:"), state=AdminBookState.select_subcategory)
 async def add_book_direct_category(callback: types.CallbackQuery, state: FSMContext):
     """To'g'ridan-to'g'ri kategoriyaga"""
     cat_id = AdminCallbackParser.get_int_param(callback.data, 0)
@@ -532,7 +538,7 @@ async def add_book_direct_category(callback: types.CallbackQuery, state: FSMCont
     await callback.message.edit_text(f"✅ Kategoriya: <b>{category.name}</b>")
     await callback.message.answer(
         f"📤 <b>Faylni yuklang:</b>\n• {AdminEmoji.BOOK_PDF} PDF\n• {AdminEmoji.BOOK_AUDIO} Audio",
-        reply_markup=admin_cancel_btn()
+        reply_markup=admin_cancel_btn_json()
     )
     await AdminBookState.upload_file.set()
     await callback.answer()
@@ -558,7 +564,7 @@ async def add_book_file(message: types.Message, state: FSMContext):
 
     await message.answer(
         f"✅ <b>Fayl qabul qilindi!</b>\n{emoji} {file_data['file_name']}\n\n📝 <b>Kitob nomini kiriting:</b>",
-        reply_markup=admin_cancel_btn())
+        reply_markup=admin_cancel_btn_json())
     await AdminBookState.enter_title.set()
 
 
@@ -567,7 +573,7 @@ async def add_book_title(message: types.Message, state: FSMContext):
     """Kitob nomi"""
     if message.text == f"{AdminEmoji.CANCEL} Bekor":
         await state.finish()
-        await message.answer("❌ Bekor qilindi", reply_markup=admin_book_menu())
+        await message.answer("❌ Bekor qilindi", reply_markup=admin_book_menu_json())
         return
 
     title = message.text.strip()
@@ -576,7 +582,7 @@ async def add_book_title(message: types.Message, state: FSMContext):
         return
 
     await state.update_data(title=title)
-    await message.answer("✍️ <b>Muallif:</b>", reply_markup=admin_skip_btn())
+    await message.answer("✍️ <b>Muallif:</b>", reply_markup=admin_skip_btn_json())
     await AdminBookState.enter_author.set()
 
 
@@ -585,7 +591,7 @@ async def add_book_author(message: types.Message, state: FSMContext):
     """Muallif"""
     if message.text == f"{AdminEmoji.CANCEL} Bekor":
         await state.finish()
-        await message.answer("❌ Bekor qilindi", reply_markup=admin_book_menu())
+        await message.answer("❌ Bekor qilindi", reply_markup=admin_book_menu_json())
         return
 
     author = None
@@ -596,10 +602,10 @@ async def add_book_author(message: types.Message, state: FSMContext):
     data = await state.get_data()
 
     if data['file_type'] == FileType.AUDIO:
-        await message.answer("🎙 <b>Hikoyachi:</b>", reply_markup=admin_skip_btn())
+        await message.answer("🎙 <b>Hikoyachi:</b>", reply_markup=admin_skip_btn_json())
         await AdminBookState.enter_narrator.set()
     else:
-        await message.answer("📄 <b>Tavsif:</b>", reply_markup=admin_skip_btn())
+        await message.answer("📄 <b>Tavsif:</b>", reply_markup=admin_skip_btn_json())
         await AdminBookState.enter_description.set()
 
 
@@ -608,7 +614,7 @@ async def add_book_narrator(message: types.Message, state: FSMContext):
     """Hikoyachi"""
     if message.text == f"{AdminEmoji.CANCEL} Bekor":
         await state.finish()
-        await message.answer("❌ Bekor qilindi", reply_markup=admin_book_menu())
+        await message.answer("❌ Bekor qilindi", reply_markup=admin_book_menu_json())
         return
 
     narrator = None
@@ -616,7 +622,7 @@ async def add_book_narrator(message: types.Message, state: FSMContext):
         narrator = message.text.strip()[:100]
 
     await state.update_data(narrator=narrator)
-    await message.answer("📄 <b>Tavsif:</b>", reply_markup=admin_skip_btn())
+    await message.answer("📄 <b>Tavsif:</b>", reply_markup=admin_skip_btn_json())
     await AdminBookState.enter_description.set()
 
 
@@ -625,7 +631,7 @@ async def add_book_description(message: types.Message, state: FSMContext):
     """Tavsif va saqlash"""
     if message.text == f"{AdminEmoji.CANCEL} Bekor":
         await state.finish()
-        await message.answer("❌ Bekor qilindi", reply_markup=admin_book_menu())
+        await message.answer("❌ Bekor qilindi", reply_markup=admin_book_menu_json())
         return
 
     description = None
@@ -636,7 +642,7 @@ async def add_book_description(message: types.Message, state: FSMContext):
     user_id = get_user_db_id(message.from_user.id)
 
     if not user_id:
-        await message.answer("❌ Foydalanuvchi topilmadi!", reply_markup=admin_book_menu())
+        await message.answer("❌ Foydalanuvchi topilmadi!", reply_markup=admin_book_menu_json())
         await state.finish()
         return
 
@@ -657,13 +663,13 @@ async def add_book_description(message: types.Message, state: FSMContext):
         emoji = AdminEmoji.BOOK_PDF if data['file_type'] == FileType.PDF else AdminEmoji.BOOK_AUDIO
         await message.answer(
             f"✅ <b>Kitob qo'shildi!</b>\n\n{emoji} {data['title']}\n✍️ {data.get('author') or '—'}\n📁 {data['category_name']}",
-            reply_markup=admin_book_menu()
+            reply_markup=admin_book_menu_json()
         )
         logger.info(f"Book added: {data['title']} (ID: {book_id})")
     except ValueError as e:
-        await message.answer(f"⚠️ {e}", reply_markup=admin_book_menu())
+        await message.answer(f"⚠️ {e}", reply_markup=admin_book_menu_json())
     except Exception as e:
-        await message.answer(f"❌ Xatolik: {e}", reply_markup=admin_book_menu())
+        await message.answer(f"❌ Xatolik: {e}", reply_markup=admin_book_menu_json())
         logger.error(f"Error adding book: {e}")
 
     await state.finish()
@@ -679,7 +685,7 @@ async def bulk_upload_start(message: types.Message, state: FSMContext):
 
     main_cats = book_db.get_main_categories()
     if not main_cats:
-        await message.answer("⚠️ Avval kategoriya qo'shing!", reply_markup=admin_book_menu())
+        await message.answer("⚠️ Avval kategoriya qo'shing!", reply_markup=admin_book_menu_json())
         return
 
     keyboard = adm_categories_kb(main_cats, prefix="adm_bulk_cat", back_callback="adm_back:book_menu")
@@ -687,7 +693,7 @@ async def bulk_upload_start(message: types.Message, state: FSMContext):
     await AdminBulkState.select_category.set()
 
 
-@dp.callback_query_handler(lambda c: c.data.startswith("adm_bulk_cat:"), state=AdminBulkState.select_category)
+@dp.callback_query_handler(Text(startswith="adm_bulk_cat:"), state=AdminBulkState.select_category)
 async def bulk_category_selected(callback: types.CallbackQuery, state: FSMContext):
     """Bulk uchun kategoriya"""
     cat_id = AdminCallbackParser.get_int_param(callback.data, 0)
@@ -713,7 +719,7 @@ async def bulk_category_selected(callback: types.CallbackQuery, state: FSMContex
     await callback.answer()
 
 
-@dp.callback_query_handler(lambda c: c.data.startswith("adm_bulk_sub:"), state=AdminBulkState.select_subcategory)
+@dp.callback_query_handler(Text(startswith="adm_bulk_sub:"), state=AdminBulkState.select_subcategory)
 async def bulk_subcategory_selected(callback: types.CallbackQuery, state: FSMContext):
     """Bulk uchun subkategoriya"""
     sub_id = AdminCallbackParser.get_int_param(callback.data, 0)
@@ -731,7 +737,7 @@ async def bulk_subcategory_selected(callback: types.CallbackQuery, state: FSMCon
     await callback.answer()
 
 
-@dp.callback_query_handler(lambda c: c.data.startswith("adm_bulk_sub_direct:"), state=AdminBulkState.select_subcategory)
+@dp.callback_query_handler(Text(startswith="adm_bulk_sub_direct:"), state=AdminBulkState.select_subcategory)
 async def bulk_direct_category(callback: types.CallbackQuery, state: FSMContext):
     """Bulk uchun asosiy kategoriyaga"""
     cat_id = AdminCallbackParser.get_int_param(callback.data, 0)
@@ -758,7 +764,7 @@ async def _send_bulk_instructions(message: types.Message):
         f"<b>Caption formatlari:</b>\n"
         f"<code>Kitob nomi | Muallif</code>\n"
         f"<code>Kitob nomi | Muallif | Hikoyachi</code>",
-        reply_markup=admin_done_btn()
+        reply_markup=admin_done_btn_json()
     )
 
 
@@ -813,13 +819,13 @@ async def bulk_finish(message: types.Message, state: FSMContext):
     errors = data.get('errors', [])
 
     if not queue:
-        await message.answer("⚠️ Hech qanday fayl yuklanmadi!", reply_markup=admin_book_menu())
+        await message.answer("⚠️ Hech qanday fayl yuklanmadi!", reply_markup=admin_book_menu_json())
         await state.finish()
         return
 
     user_id = get_user_db_id(message.from_user.id)
     if not user_id:
-        await message.answer("❌ Foydalanuvchi topilmadi!", reply_markup=admin_book_menu())
+        await message.answer("❌ Foydalanuvchi topilmadi!", reply_markup=admin_book_menu_json())
         await state.finish()
         return
 
@@ -849,11 +855,11 @@ async def bulk_finish(message: types.Message, state: FSMContext):
         if errors:
             text += f"\n\n⚠️ <b>Xatolar:</b>\n" + "\n".join(f"• {e}" for e in errors[:5])
 
-        await message.answer(text, reply_markup=admin_book_menu())
+        await message.answer(text, reply_markup=admin_book_menu_json())
         logger.info(f"Bulk upload: {added_count} books to category {category_id}")
     except Exception as e:
         await progress_msg.delete()
-        await message.answer(f"❌ Xatolik: {e}", reply_markup=admin_book_menu())
+        await message.answer(f"❌ Xatolik: {e}", reply_markup=admin_book_menu_json())
         logger.error(f"Bulk upload error: {e}")
 
     await state.finish()
@@ -871,7 +877,7 @@ async def list_books(message: types.Message):
     main_cats = [c for c in categories if c.parent_id is None]
 
     if not main_cats:
-        await message.answer("📂 Kategoriyalar yo'q.", reply_markup=admin_book_menu())
+        await message.answer("📂 Kategoriyalar yo'q.", reply_markup=admin_book_menu_json())
         return
 
     keyboard = adm_categories_kb(main_cats, prefix="adm_list_cat", show_book_count=True,
@@ -879,7 +885,7 @@ async def list_books(message: types.Message):
     await message.answer("📁 <b>Kategoriyani tanlang:</b>", reply_markup=keyboard)
 
 
-@dp.callback_query_handler(lambda c: c.data.startswith("adm_list_cat:"))
+@dp.callback_query_handler(Text(startswith="adm_list_cat:"))
 async def list_books_category(callback: types.CallbackQuery):
     """Kategoriya bo'yicha"""
     cat_id = AdminCallbackParser.get_int_param(callback.data, 0)
@@ -897,8 +903,7 @@ async def list_books_category(callback: types.CallbackQuery):
         keyboard = adm_subcategories_kb(subcats_filtered, parent_id=cat_id, prefix="adm_list_sub", allow_direct=True)
         await callback.message.edit_text(f"📁 <b>{category.name}</b>\n\nSubkategoriyani tanlang:", reply_markup=keyboard)
     else:
-        pdf_count = book_db.count_books_by_category(cat_id, FileType.PDF)
-        audio_count = book_db.count_books_by_category(cat_id, FileType.AUDIO)
+        pdf_count, audio_count = book_db.count_books_by_type(cat_id)
 
         if pdf_count == 0 and audio_count == 0:
             await callback.message.edit_text(f"📂 <b>{category.name}</b> — kitoblar yo'q.")
@@ -911,7 +916,7 @@ async def list_books_category(callback: types.CallbackQuery):
     await callback.answer()
 
 
-@dp.callback_query_handler(lambda c: c.data.startswith("adm_type:"))
+@dp.callback_query_handler(Text(startswith="adm_type:"))
 async def list_books_by_type(callback: types.CallbackQuery):
     """Tur bo'yicha kitoblar"""
     parts = callback.data.split(":")
@@ -935,7 +940,7 @@ async def list_books_by_type(callback: types.CallbackQuery):
     await callback.answer()
 
 
-@dp.callback_query_handler(lambda c: c.data.startswith("adm_pg:"))
+@dp.callback_query_handler(Text(startswith="adm_pg:"))
 async def books_pagination(callback: types.CallbackQuery):
     """Pagination"""
     parts = callback.data.split(":")
@@ -955,7 +960,7 @@ async def books_pagination(callback: types.CallbackQuery):
 
 # =================== KITOB TAFSILOTLARI ===================
 
-@dp.callback_query_handler(lambda c: c.data.startswith("adm_book:") and not c.data.startswith("adm_book_"))
+@dp.callback_query_handler(Text(startswith="adm_book:"))
 async def show_book_admin(callback: types.CallbackQuery):
     """Kitob tafsilotlari"""
     book_id = AdminCallbackParser.get_int_param(callback.data, 0)
@@ -971,7 +976,7 @@ async def show_book_admin(callback: types.CallbackQuery):
     await callback.answer()
 
 
-@dp.callback_query_handler(lambda c: c.data.startswith("adm_view_book:"))
+@dp.callback_query_handler(Text(startswith="adm_view_book:"))
 async def view_book_file(callback: types.CallbackQuery):
     """Faylni ko'rish"""
     book_id = AdminCallbackParser.get_int_param(callback.data, 0)
@@ -985,7 +990,7 @@ async def view_book_file(callback: types.CallbackQuery):
     await callback.answer("✅ Yuborildi" if success else "❌ Xatolik", show_alert=not success)
 
 
-@dp.callback_query_handler(lambda c: c.data.startswith("adm_edit_book:"))
+@dp.callback_query_handler(Text(startswith="adm_edit_book:"))
 async def edit_book_menu(callback: types.CallbackQuery):
     """Tahrirlash menyusi"""
     book_id = AdminCallbackParser.get_int_param(callback.data, 0)
@@ -1000,7 +1005,7 @@ async def edit_book_menu(callback: types.CallbackQuery):
     await callback.answer()
 
 
-@dp.callback_query_handler(lambda c: c.data.startswith("adm_edit_title:"))
+@dp.callback_query_handler(Text(startswith="adm_edit_title:"))
 async def edit_book_title_start(callback: types.CallbackQuery, state: FSMContext):
     """Nom tahrirlash"""
     book_id = AdminCallbackParser.get_int_param(callback.data, 0)
@@ -1012,7 +1017,7 @@ async def edit_book_title_start(callback: types.CallbackQuery, state: FSMContext
 
     await state.update_data(edit_book_id=book_id, old_value=book.title)
     await callback.message.edit_text(f"📝 <b>Hozirgi nom:</b> {book.title}\n\nYangi nomni kiriting:")
-    await callback.message.answer("Yangi nom:", reply_markup=admin_cancel_btn())
+    await callback.message.answer("Yangi nom:", reply_markup=admin_cancel_btn_json())
     await AdminEditBookState.edit_title.set()
     await callback.answer()
 
@@ -1022,7 +1027,7 @@ async def edit_book_title_done(message: types.Message, state: FSMContext):
     """Nom yangilandi"""
     if message.text == f"{AdminEmoji.CANCEL} Bekor":
         await state.finish()
-        await message.answer("❌ Bekor qilindi", reply_markup=admin_book_menu())
+        await message.answer("❌ Bekor qilindi", reply_markup=admin_book_menu_json())
         return
 
     new_title = message.text.strip()
@@ -1034,13 +1039,13 @@ async def edit_book_title_done(message: types.Message, state: FSMContext):
     try:
         book_db.update_book(data['edit_book_id'], title=new_title)
         await message.answer(f"✅ Nom yangilandi!\n<s>{data['old_value']}</s> → <b>{new_title}</b>",
-                             reply_markup=admin_book_menu())
+                             reply_markup=admin_book_menu_json())
     except Exception as e:
-        await message.answer(f"❌ Xatolik: {e}", reply_markup=admin_book_menu())
+        await message.answer(f"❌ Xatolik: {e}", reply_markup=admin_book_menu_json())
     await state.finish()
 
 
-@dp.callback_query_handler(lambda c: c.data.startswith("adm_edit_author:"))
+@dp.callback_query_handler(Text(startswith="adm_edit_author:"))
 async def edit_book_author_start(callback: types.CallbackQuery, state: FSMContext):
     """Muallif tahrirlash"""
     book_id = AdminCallbackParser.get_int_param(callback.data, 0)
@@ -1052,7 +1057,7 @@ async def edit_book_author_start(callback: types.CallbackQuery, state: FSMContex
 
     await state.update_data(edit_book_id=book_id)
     await callback.message.edit_text(f"✍️ <b>Hozirgi muallif:</b> {book.author or '—'}\n\nYangi muallifni kiriting:")
-    await callback.message.answer("Yangi muallif:", reply_markup=admin_cancel_btn())
+    await callback.message.answer("Yangi muallif:", reply_markup=admin_cancel_btn_json())
     await AdminEditBookState.edit_author.set()
     await callback.answer()
 
@@ -1062,15 +1067,15 @@ async def edit_book_author_done(message: types.Message, state: FSMContext):
     """Muallif yangilandi"""
     if message.text == f"{AdminEmoji.CANCEL} Bekor":
         await state.finish()
-        await message.answer("❌ Bekor qilindi", reply_markup=admin_book_menu())
+        await message.answer("❌ Bekor qilindi", reply_markup=admin_book_menu_json())
         return
 
     data = await state.get_data()
     try:
         book_db.update_book(data['edit_book_id'], author=message.text.strip()[:100])
-        await message.answer("✅ Muallif yangilandi!", reply_markup=admin_book_menu())
+        await message.answer("✅ Muallif yangilandi!", reply_markup=admin_book_menu_json())
     except Exception as e:
-        await message.answer(f"❌ Xatolik: {e}", reply_markup=admin_book_menu())
+        await message.answer(f"❌ Xatolik: {e}", reply_markup=admin_book_menu_json())
     await state.finish()
 
 
@@ -1086,7 +1091,7 @@ async def delete_book_start(message: types.Message):
     main_cats = [c for c in categories if c.parent_id is None]
 
     if not main_cats:
-        await message.answer("📂 Kategoriyalar yo'q.", reply_markup=admin_book_menu())
+        await message.answer("📂 Kategoriyalar yo'q.", reply_markup=admin_book_menu_json())
         return
 
     keyboard = adm_categories_kb(main_cats, prefix="adm_delb_cat", show_book_count=True,
@@ -1094,7 +1099,7 @@ async def delete_book_start(message: types.Message):
     await message.answer("🗑 <b>Kategoriyani tanlang:</b>", reply_markup=keyboard)
 
 
-@dp.callback_query_handler(lambda c: c.data.startswith("adm_delb_cat:"))
+@dp.callback_query_handler(Text(startswith="adm_delb_cat:"))
 async def delete_book_category(callback: types.CallbackQuery):
     """O'chirish uchun kategoriya"""
     cat_id = AdminCallbackParser.get_int_param(callback.data, 0)
@@ -1111,7 +1116,7 @@ async def delete_book_category(callback: types.CallbackQuery):
     await callback.answer()
 
 
-@dp.callback_query_handler(lambda c: c.data.startswith("adm_del_book:"))
+@dp.callback_query_handler(Text(startswith="adm_del_book:"))
 async def delete_book_confirm(callback: types.CallbackQuery):
     """Tasdiqlash"""
     book_id = AdminCallbackParser.get_int_param(callback.data, 0)
@@ -1129,7 +1134,7 @@ async def delete_book_confirm(callback: types.CallbackQuery):
     await callback.answer()
 
 
-@dp.callback_query_handler(lambda c: c.data.startswith("adm_del_cat:"))
+@dp.callback_query_handler(Text(startswith="adm_del_cat:"))
 async def delete_category_confirm(callback: types.CallbackQuery):
     """Kategoriya o'chirishni tasdiqlash"""
     cat_id = AdminCallbackParser.get_int_param(callback.data, 0)
@@ -1147,7 +1152,7 @@ async def delete_category_confirm(callback: types.CallbackQuery):
     await callback.answer()
 
 
-@dp.callback_query_handler(lambda c: c.data.startswith("adm_restore_book:"))
+@dp.callback_query_handler(Text(startswith="adm_restore_book:"))
 async def restore_book(callback: types.CallbackQuery):
     """Qayta tiklash"""
     book_id = AdminCallbackParser.get_int_param(callback.data, 0)
@@ -1160,7 +1165,7 @@ async def restore_book(callback: types.CallbackQuery):
     await callback.answer()
 
 
-@dp.callback_query_handler(lambda c: c.data.startswith("adm_restore_cat:"))
+@dp.callback_query_handler(Text(startswith="adm_restore_cat:"))
 async def restore_category(callback: types.CallbackQuery):
     """Kategoriyani qayta tiklash"""
     cat_id = AdminCallbackParser.get_int_param(callback.data, 0)
@@ -1173,7 +1178,7 @@ async def restore_category(callback: types.CallbackQuery):
     await callback.answer()
 
 
-@dp.callback_query_handler(lambda c: c.data.startswith("adm_yes:"))
+@dp.callback_query_handler(Text(startswith="adm_yes:"))
 async def confirm_yes(callback: types.CallbackQuery):
     """Ha - tasdiqlash"""
     parts = callback.data.replace("adm_yes:", "").split(":")
@@ -1221,7 +1226,7 @@ async def confirm_yes(callback: types.CallbackQuery):
     await callback.answer()
 
 
-@dp.callback_query_handler(lambda c: c.data.startswith("adm_no:"))
+@dp.callback_query_handler(Text(startswith="adm_no:"))
 async def confirm_no(callback: types.CallbackQuery):
     """Yo'q - bekor"""
     await callback.message.edit_text("❌ Bekor qilindi")
@@ -1243,7 +1248,7 @@ async def deleted_items_section(message: types.Message):
         reply_markup=keyboard)
 
 
-@dp.callback_query_handler(lambda c: c.data.startswith("adm_deleted:"))
+@dp.callback_query_handler(Text(startswith="adm_deleted:"))
 async def show_deleted_items(callback: types.CallbackQuery):
     """O'chirilganlarni ko'rsatish"""
     item_type = AdminCallbackParser.get_param(callback.data, 0)
@@ -1269,7 +1274,7 @@ async def show_deleted_items(callback: types.CallbackQuery):
     await callback.answer()
 
 
-@dp.callback_query_handler(lambda c: c.data.startswith("adm_del_item_book:"))
+@dp.callback_query_handler(Text(startswith="adm_del_item_book:"))
 async def show_deleted_book(callback: types.CallbackQuery):
     """O'chirilgan kitob"""
     book_id = AdminCallbackParser.get_int_param(callback.data, 0)
@@ -1285,7 +1290,7 @@ async def show_deleted_book(callback: types.CallbackQuery):
     await callback.answer()
 
 
-@dp.callback_query_handler(lambda c: c.data == "adm_purge_all")
+@dp.callback_query_handler(Text(equals="adm_purge_all"))
 async def purge_all_confirm(callback: types.CallbackQuery):
     """Hammasini tozalash"""
     await callback.message.edit_text(
@@ -1295,7 +1300,7 @@ async def purge_all_confirm(callback: types.CallbackQuery):
     await callback.answer()
 
 
-@dp.callback_query_handler(lambda c: c.data.startswith("adm_stats:"))
+@dp.callback_query_handler(Text(startswith="adm_stats:"))
 async def stats_details(callback: types.CallbackQuery):
     """Statistika tafsilotlari"""
     stat_type = AdminCallbackParser.get_param(callback.data, 0)
@@ -1308,27 +1313,26 @@ async def stats_details(callback: types.CallbackQuery):
         await callback.message.edit_text(text, reply_markup=adm_stats_kb())
 
     elif stat_type == "books":
-        categories = book_db.get_categories_with_book_count()
-        text = "📖 <b>Kategoriyalar bo'yicha:</b>\n\n"
-        for cat in categories[:20]:
-            if cat.book_count > 0:
-                text += f"📁 {cat.name}: {cat.book_count} ta\n"
+        categories = book_db.get_top_categories(limit=20)
+        text = "📖 <b>Kategoriyalar bo'yicha:</b>\n\n" + "".join(
+            f"📁 {cat.name}: {cat.book_count} ta\n" for cat in categories
+        )
         await callback.message.edit_text(text, reply_markup=adm_stats_kb())
 
     elif stat_type == "downloads":
         popular = book_db.get_popular_books(20)
-        text = "📥 <b>Eng ko'p yuklangan:</b>\n\n"
+        parts = ["📥 <b>Eng ko'p yuklangan:</b>\n\n"]
         for i, book in enumerate(popular, 1):
             emoji = AdminEmoji.BOOK_PDF if book.file_type == FileType.PDF else AdminEmoji.BOOK_AUDIO
-            text += f"{i}. {emoji} {truncate_text(book.title, 30)} — {book.download_count}\n"
-        await callback.message.edit_text(text, reply_markup=adm_stats_kb())
+            parts.append(f"{i}. {emoji} {truncate_text(book.title, 30)} — {book.download_count}\n")
+        await callback.message.edit_text("".join(parts), reply_markup=adm_stats_kb())
 
     await callback.answer()
 
 
 # =================== BACK HANDLERS ===================
 
-@dp.callback_query_handler(lambda c: c.data.startswith("adm_back:"))
+@dp.callback_query_handler(Text(startswith="adm_back:"))
 async def admin_back_handler(callback: types.CallbackQuery, state: FSMContext):
     """Orqaga"""
     target = AdminCallbackParser.get_param(callback.data, 0)
@@ -1339,7 +1343,7 @@ async def admin_back_handler(callback: types.CallbackQuery, state: FSMContext):
 
     if target == "main":
         await callback.message.delete()
-        await callback.message.answer("👨‍💼 <b>Admin Panel</b>", reply_markup=admin_main_menu())
+        await callback.message.answer("👨‍💼 <b>Admin Panel</b>", reply_markup=admin_main_menu_json())
 
     elif target == "categories":
         categories = book_db.get_categories_with_book_count()
@@ -1353,11 +1357,11 @@ async def admin_back_handler(callback: types.CallbackQuery, state: FSMContext):
 
     elif target == "book_menu":
         await callback.message.delete()
-        await callback.message.answer("📖 <b>Kitoblar</b>", reply_markup=admin_book_menu())
+        await callback.message.answer("📖 <b>Kitoblar</b>", reply_markup=admin_book_menu_json())
 
     elif target == "cat_menu":
         await callback.message.delete()
-        await callback.message.answer("📁 <b>Kategoriyalar</b>", reply_markup=admin_category_menu())
+        await callback.message.answer("📁 <b>Kategoriyalar</b>", reply_markup=admin_category_menu_json())
 
     elif target == "deleted":
         counts = book_db.get_deleted_items_count()
@@ -1369,8 +1373,7 @@ async def admin_back_handler(callback: types.CallbackQuery, state: FSMContext):
         if cat_id:
             category = book_db.get_category_by_id(cat_id)
             if category:
-                pdf_count = book_db.count_books_by_category(cat_id, FileType.PDF)
-                audio_count = book_db.count_books_by_category(cat_id, FileType.AUDIO)
+                pdf_count, audio_count = book_db.count_books_by_type(cat_id)
                 keyboard = adm_file_type_kb(cat_id, pdf_count, audio_count)
                 await callback.message.edit_text(f"📁 <b>{category.name}</b>\n\nTurni tanlang:", reply_markup=keyboard)
 
@@ -1385,12 +1388,12 @@ async def cancel_any(message: types.Message, state: FSMContext):
     current = await state.get_state()
     if current:
         await state.finish()
-    await message.answer("❌ Bekor qilindi", reply_markup=admin_main_menu())
+    await message.answer("❌ Bekor qilindi", reply_markup=admin_main_menu_json())
 
 
 # =================== EMPTY CALLBACKS ===================
 
-@dp.callback_query_handler(lambda c: c.data in ["adm_empty", "adm_page_info", "current_page"])
+@dp.callback_query_handler(Text(equals=["adm_empty", "adm_page_info", "current_page"]))
 async def empty_callback(callback: types.CallbackQuery):
     """Bo'sh callback"""
     await callback.answer()
\ No newline at end of file
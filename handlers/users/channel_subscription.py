@@ -23,11 +23,10 @@ async def check_super_admin_permission(telegram_id: int):
 
 async def check_admin_permission(telegram_id: int):
     logging.info(f"Checking admin permission for telegram_id: {telegram_id}")
-    user = user_db.select_user(telegram_id=telegram_id)
-    if not user:
+    user_id = user_db.get_user_id(telegram_id)  # Users jadvalidagi id (user_id)
+    if not user_id:
         logging.info(f"No user found with telegram_id {telegram_id}")
         return False
-    user_id = user[0]  # Users jadvalidagi id (user_id)
     admin = user_db.check_if_admin(user_id=user_id)
     logging.info(f"Admin check result for user_id {user_id}: {admin}")
     return admin
@@ -123,10 +122,10 @@ async def process_channel_remove(message: types.Message, state: FSMContext):
         else:
             channel_data = channel_db.get_channel_by_invite_link(channel_identifier)
             if channel_data:
-                channel_id = channel_data[1]  # channel_id ni indeks orqali olish
+                channel_id = channel_data["channel_id"]
                 channel_db.remove_channel(channel_id=channel_id)
                 logging.info(f"Channel removed: ID {channel_id}")
-                await message.answer(f"✅ Kanal {channel_data[2]} muvaffaqiyatli o'chirildi!")  # title ni indeks orqali olish
+                await message.answer(f"✅ Kanal {channel_data['title']} muvaffaqiyatli o'chirildi!")
             else:
                 await message.answer("❌ Bunday kanal topilmadi.")
     except Exception as e:
@@ -148,7 +147,7 @@ async def list_all_channels(message: types.Message):
 
         channel_list = []
         for channel in channels:
-            channel_list.append(f"ID: {channel[1]} | Nomi: {channel[2]} | Invite Link: {channel[3]}")
+            channel_list.append(f"ID: {channel['channel_id']} | Nomi: {channel['title']} | Invite Link: {channel['invite_link']}")
 
         full_channel_list = "\n".join(channel_list)
         await message.answer(f"📋 Kanallar ro'yxati:\n\n{full_channel_list}")
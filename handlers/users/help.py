@@ -3,11 +3,14 @@ from aiogram.dispatcher.filters.builtin import CommandHelp
 
 from loader import dp
 
+# Matn o'zgarmaydi, bir marta yig'iladi
+HELP_TEXT = "\n".join((
+    "Buyruqlar: ",
+    "/start - Botni ishga tushirish",
+    "/help - Yordam",
+))
+
 
 @dp.message_handler(CommandHelp())
 async def bot_help(message: types.Message):
-    text = ("Buyruqlar: ",
-            "/start - Botni ishga tushirish",
-            "/help - Yordam")
-    
-    await message.answer("\n".join(text))
\ No newline at end of file
+    await message.answer(HELP_TEXT)
\ No newline at end of file
@@ -57,7 +57,7 @@ class Advertisement:
             if not self.running:
                 break
             try:
-                await send_advertisement_to_user(user[1], self)
+                await send_advertisement_to_user(user["telegram_id"], self)
                 self.sent_count += 1
             except (BotBlocked, ChatNotFound, Unauthorized):
                 self.failed_count += 1
@@ -143,10 +143,9 @@ async def check_super_admin_permission(telegram_id: int):
     return telegram_id in ADMINS
 
 async def check_admin_permission(telegram_id: int):
-    user = user_db.select_user(telegram_id=telegram_id)
-    if not user:
+    user_id = user_db.get_user_id(telegram_id)
+    if not user_id:
         return False
-    user_id = user[0]
     admin = user_db.check_if_admin(user_id=user_id)
     return admin
 
@@ -160,13 +159,13 @@ async def reklama_handler(message: types.Message):
     else:
         await message.reply("Sizda ushbu amalni bajarish uchun ruxsat yo'q.")
 
-@dp.callback_query_handler(lambda c: c.data in ["ad_type_text", "ad_type_forward", "ad_type_button", "ad_type_any"], state=ReklamaTuriState.tur)
+@dp.callback_query_handler(Text(equals=["ad_type_text", "ad_type_forward", "ad_type_button", "ad_type_any"]), state=ReklamaTuriState.tur)
 async def handle_ad_type(callback_query: types.CallbackQuery, state: FSMContext):
     await state.update_data(ad_type=callback_query.data)
     await ReklamaTuriState.vaqt.set()
     await callback_query.message.edit_text("Reklama yuborish vaqtini tanlang:", reply_markup=get_time_keyboard())
 
-@dp.callback_query_handler(lambda c: c.data in ["send_now", "send_later"], state=ReklamaTuriState.vaqt)
+@dp.callback_query_handler(Text(equals=["send_now", "send_later"]), state=ReklamaTuriState.vaqt)
 async def handle_send_time(callback_query: types.CallbackQuery, state: FSMContext):
     await state.update_data(send_time=callback_query.data)
     if callback_query.data == "send_later":
@@ -222,19 +221,21 @@ async def handle_buttons_input(message: types.Message, state: FSMContext):
     except Exception as e:
         await message.reply("❌ Tugmalar formati noto'g'ri. Iltimos, qaytadan kiriting.\nFormat: Button1 Text - URL1, Button2 Text - URL2")
         return
-    keyboard = types.InlineKeyboardMarkup()
-    keyboard.add(*buttons)
+    # add(*buttons) kabi qatorda 3 tadan, lekin qatorlar bir martada beriladi
+    keyboard = types.InlineKeyboardMarkup(
+        inline_keyboard=[buttons[i:i + 3] for i in range(0, len(buttons), 3)]
+    )
     data = await state.get_data()
     ad_message = data.get('ad_content')
     await state.update_data(keyboard=keyboard)
     await bot.send_message(chat_id=message.chat.id, text="Reklamani yuborishni tasdiqlaysizmi?", reply_markup=get_confirm_keyboard())
 
-@dp.callback_query_handler(lambda c: c.data == "cancel_ad", state='*')
+@dp.callback_query_handler(Text(equals="cancel_ad"), state='*')
 async def cancel_ad_handler(callback_query: types.CallbackQuery, state: FSMContext):
     await state.finish()
     await callback_query.message.edit_text("Reklama yuborish bekor qilindi 🤖❌")
 
-@dp.callback_query_handler(lambda c: c.data == "confirm_ad", state='*')
+@dp.callback_query_handler(Text(equals="confirm_ad"), state='*')
 async def confirm_ad_handler(callback_query: types.CallbackQuery, state: FSMContext):
     data = await state.get_data()
     ad_type = data.get('ad_type')
@@ -255,7 +256,7 @@ async def confirm_ad_handler(callback_query: types.CallbackQuery, state: FSMCont
     await callback_query.message.edit_text(f"Reklama #{ad_id} yuborish jadvalga qo'shildi.")
     advertisement.task = asyncio.create_task(advertisement.start())
 
-@dp.callback_query_handler(lambda c: c.data.startswith("pause_ad_"))
+@dp.callback_query_handler(Text(startswith="pause_ad_"))
 async def pause_ad_handler(callback_query: types.CallbackQuery):
     ad_id = int(callback_query.data.split("_")[-1])
     advertisement = next((ad for ad in advertisements if ad.ad_id == ad_id), None)
@@ -265,7 +266,7 @@ async def pause_ad_handler(callback_query: types.CallbackQuery):
     else:
         await callback_query.answer("Reklama topilmadi.", show_alert=True)
 
-@dp.callback_query_handler(lambda c: c.data.startswith("resume_ad_"))
+@dp.callback_query_handler(Text(startswith="resume_ad_"))
 async def resume_ad_handler(callback_query: types.CallbackQuery):
     ad_id = int(callback_query.data.split("_")[-1])
     advertisement = next((ad for ad in advertisements if ad.ad_id == ad_id), None)
@@ -275,7 +276,7 @@ async def resume_ad_handler(callback_query: types.CallbackQuery):
     else:
         await callback_query.answer("Reklama topilmadi.", show_alert=True)
 
-@dp.callback_query_handler(lambda c: c.data.startswith("stop_ad_"))
+@dp.callback_query_handler(Text(startswith="stop_ad_"))
 async def stop_ad_handler(callback_query: types.CallbackQuery):
     ad_id = int(callback_query.data.split("_")[-1])
     advertisement = next((ad for ad in advertisements if ad.ad_id == ad_id), None)
@@ -286,35 +287,36 @@ async def stop_ad_handler(callback_query: types.CallbackQuery):
         await callback_query.answer("Reklama topilmadi.", show_alert=True)
 
 def get_cancel_keyboard():
-    keyboard = types.InlineKeyboardMarkup()
-    keyboard.add(types.InlineKeyboardButton("❌ Bekor qilish", callback_data="cancel_ad"))
-    return keyboard
+    return types.InlineKeyboardMarkup(inline_keyboard=[
+        [types.InlineKeyboardButton("❌ Bekor qilish", callback_data="cancel_ad")],
+    ])
 
 def get_confirm_keyboard():
-    keyboard = types.InlineKeyboardMarkup()
-    keyboard.add(types.InlineKeyboardButton("✅ Tasdiqlash", callback_data="confirm_ad"))
-    keyboard.add(types.InlineKeyboardButton("❌ Bekor qilish", callback_data="cancel_ad"))
-    return keyboard
+    return types.InlineKeyboardMarkup(inline_keyboard=[
+        [types.InlineKeyboardButton("✅ Tasdiqlash", callback_data="confirm_ad")],
+        [types.InlineKeyboardButton("❌ Bekor qilish", callback_data="cancel_ad")],
+    ])
 
 def get_ad_type_keyboard():
-    keyboard = types.InlineKeyboardMarkup()
-    keyboard.add(types.InlineKeyboardButton("Matnli", callback_data="ad_type_text"))
-    keyboard.add(types.InlineKeyboardButton("Forward", callback_data="ad_type_forward"))
-    keyboard.add(types.InlineKeyboardButton("Tugmali", callback_data="ad_type_button"))
-    keyboard.add(types.InlineKeyboardButton("Har qanday kontent", callback_data="ad_type_any"))
-    return keyboard
+    return types.InlineKeyboardMarkup(inline_keyboard=[
+        [types.InlineKeyboardButton("Matnli", callback_data="ad_type_text")],
+        [types.InlineKeyboardButton("Forward", callback_data="ad_type_forward")],
+        [types.InlineKeyboardButton("Tugmali", callback_data="ad_type_button")],
+        [types.InlineKeyboardButton("Har qanday kontent", callback_data="ad_type_any")],
+    ])
 
 def get_time_keyboard():
-    keyboard = types.InlineKeyboardMarkup()
-    keyboard.add(types.InlineKeyboardButton("Hozir", callback_data="send_now"))
-    keyboard.add(types.InlineKeyboardButton("Keyingi vaqt", callback_data="send_later"))
-    return keyboard
+    return types.InlineKeyboardMarkup(inline_keyboard=[
+        [types.InlineKeyboardButton("Hozir", callback_data="send_now")],
+        [types.InlineKeyboardButton("Keyingi vaqt", callback_data="send_later")],
+    ])
 
 def get_status_keyboard(ad_id, paused=False):
-    keyboard = types.InlineKeyboardMarkup()
     if paused:
-        keyboard.add(types.InlineKeyboardButton("▶️ Davom ettirish", callback_data=f"resume_ad_{ad_id}"))
+        toggle = types.InlineKeyboardButton("▶️ Davom ettirish", callback_data=f"resume_ad_{ad_id}")
     else:
-        keyboard.add(types.InlineKeyboardButton("⏸ Pauza", callback_data=f"pause_ad_{ad_id}"))
-    keyboard.add(types.InlineKeyboardButton("⛔️ To'xtatish", callback_data=f"stop_ad_{ad_id}"))
-    return keyboard
+        toggle = types.InlineKeyboardButton("⏸ Pauza", callback_data=f"pause_ad_{ad_id}")
+    return types.InlineKeyboardMarkup(inline_keyboard=[
+        [toggle],
+        [types.InlineKeyboardButton("⛔️ To'xtatish", callback_data=f"stop_ad_{ad_id}")],
+    ])
@@ -17,11 +17,15 @@ from aiogram import types
 from aiogram.dispatcher import FSMContext
 from aiogram.dispatcher.filters import Text, CommandStart
 from aiogram.dispatcher.filters.state import State, StatesGroup
-from typing import Optional, Dict, Any
+from aiogram.utils.exceptions import MessageNotModified
+from typing import Optional, Dict, Any, List, Set, Tuple
+from functools import lru_cache
+import asyncio
 import logging
-from datetime import datetime
+import re
 
 from loader import dp, bot, book_db, user_db
+from utils.misc.ttl_cache import TTLCache
 
 # Database imports
 from utils.db_api.book_database import (
@@ -32,15 +36,15 @@ from utils.db_api.book_database import (
 # Keyboard imports
 from keyboards.default.user_keyboards import (
     # Reply keyboards
-    user_main_menu, back_button, cancel_button, back_and_home,
+    user_main_menu_json, cancel_button_json,
     # Inline keyboards
     categories_keyboard, subcategories_keyboard,
     book_type_keyboard, books_paginated_keyboard, book_detail_keyboard,
     search_type_keyboard, search_results_keyboard,
     popular_keyboard, popular_books_keyboard, recent_books_keyboard,
-    close_keyboard,
+    close_keyboard_json,
     # Helpers
-    Emoji, CallbackParser, truncate_text, get_book_emoji
+    Emoji, MenuText, CallbackParser, truncate_text, get_book_emoji, rank_label
 )
 
 logger = logging.getLogger(__name__)
@@ -60,6 +64,34 @@ SEARCH_RESULTS_LIMIT = 30
 POPULAR_LIMIT = 20
 RECENT_LIMIT = 20
 
+# Ko'p maydonli callbacklar uchun oldindan kompilyatsiya qilingan regexlar
+_RE_TYPE = re.compile(r"u_type:(pdf|audio):(\d+)")
+_RE_PAGE = re.compile(r"u_pg:(\d+):(\d+)(?::(\w+))?")
+_RE_STYPE = re.compile(r"u_stype:(pdf|audio):(\d+)")
+_RE_SPAGE = re.compile(r"u_sp:(\d+):(\d+):(\w+)")
+
+# Statik keyboard va matnlar (bir marta yaratiladi, o'zgartirilmaydi).
+# Keyboardlar tayyor JSON satr ko'rinishida - yuborishda qayta serializatsiya yo'q
+_MAIN_MENU = user_main_menu_json()
+_CANCEL_KB = cancel_button_json()
+_CLOSE_KB = close_keyboard_json()
+_MAIN_MENU_TEXT = "🏠 <b>Bosh menyu</b>"
+_HELP_TEXT = (
+    "ℹ️ <b>Yordam</b>\n\n"
+    "<b>Bot imkoniyatlari:</b>\n\n"
+    "📁 <b>Kategoriyalar</b> — Kitoblarni kategoriyalar bo'yicha ko'rish\n\n"
+    "🔍 <b>Qidirish</b> — Kitob nomi, muallif yoki hikoyachi bo'yicha qidirish\n\n"
+    "🔥 <b>Mashhurlar</b> — Eng ko'p yuklangan kitoblar\n\n"
+    "🆕 <b>Yangilar</b> — So'nggi qo'shilgan kitoblar\n\n"
+    "📊 <b>Statistika</b> — Kutubxona statistikasi\n\n"
+    "<b>Qanday foydalanish:</b>\n"
+    "1. Kategoriya tanlang\n"
+    "2. PDF yoki Audio ni tanlang\n"
+    "3. Kitobni bosing — avtomatik yuklanadi!\n\n"
+    "<b>Savol va takliflar uchun:</b>\n"
+    "@admin_username"
+)
+
 
 # =================== HELPERS ===================
 
@@ -67,30 +99,32 @@ def format_book_info(book: Book, show_category: bool = True) -> str:
     """Kitob ma'lumotlarini formatlash"""
     emoji = get_book_emoji(book.file_type)
 
-    text = f"{emoji} <b>{book.title}</b>\n\n"
+    parts = [f"{emoji} <b>{book.title}</b>\n\n"]
 
     if book.author:
-        text += f"✍️ <b>Muallif:</b> {book.author}\n"
+        parts.append(f"✍️ <b>Muallif:</b> {book.author}\n")
 
     if book.file_type == FileType.AUDIO:
         if book.narrator:
-            text += f"🎙 <b>Hikoyachi:</b> {book.narrator}\n"
-        if book.duration_formatted:
-            text += f"⏱ <b>Davomiylik:</b> {book.duration_formatted}\n"
+            parts.append(f"🎙 <b>Hikoyachi:</b> {book.narrator}\n")
+        duration = book.duration_formatted
+        if duration:
+            parts.append(f"⏱ <b>Davomiylik:</b> {duration}\n")
 
     if show_category and book.category_name:
-        text += f"📁 <b>Kategoriya:</b> {book.category_name}\n"
+        parts.append(f"📁 <b>Kategoriya:</b> {book.category_name}\n")
 
-    if book.file_size_formatted:
-        text += f"📦 <b>Hajmi:</b> {book.file_size_formatted}\n"
+    file_size = book.file_size_formatted
+    if file_size:
+        parts.append(f"📦 <b>Hajmi:</b> {file_size}\n")
 
-    text += f"📥 <b>Yuklab olishlar:</b> {book.download_count}\n"
+    parts.append(f"📥 <b>Yuklab olishlar:</b> {book.download_count}\n")
 
     if book.description:
         desc = truncate_text(book.description, 300)
-        text += f"\n📄 <i>{desc}</i>"
+        parts.append(f"\n📄 <i>{desc}</i>")
 
-    return text
+    return "".join(parts)
 
 
 def format_statistics(stats: Statistics) -> str:
@@ -107,7 +141,24 @@ def format_statistics(stats: Statistics) -> str:
     )
 
 
-async def send_book_file(message: types.Message, book: Book) -> bool:
+async def edit_if_changed(
+        message: types.Message,
+        text: str,
+        reply_markup: Optional[types.InlineKeyboardMarkup] = None
+) -> bool:
+    """Xabar matni yoki keyboardi o'zgargan bo'lsagina tahrirlash"""
+    old_markup = message.reply_markup.to_python() if message.reply_markup else None
+    new_markup = reply_markup.to_python() if reply_markup else None
+    if message.html_text == text and old_markup == new_markup:
+        return False
+    try:
+        await message.edit_text(text, reply_markup=reply_markup)
+    except MessageNotModified:
+        return False
+    return True
+
+
+async def _send_book(chat_id: int, book: Book) -> bool:
     """Kitob faylini yuborish"""
     try:
         emoji = get_book_emoji(book.file_type)
@@ -120,7 +171,8 @@ async def send_book_file(message: types.Message, book: Book) -> bool:
             if book.narrator:
                 caption += f"\n🎙 {book.narrator}"
 
-            await message.answer_audio(
+            await bot.send_audio(
+                chat_id=chat_id,
                 audio=book.file_id,
                 caption=caption,
                 duration=book.duration,
@@ -128,13 +180,14 @@ async def send_book_file(message: types.Message, book: Book) -> bool:
                 performer=book.author
             )
         else:
-            await message.answer_document(
+            await bot.send_document(
+                chat_id=chat_id,
                 document=book.file_id,
                 caption=caption
             )
 
-        # Download count ni oshirish
-        book_db.increment_download_count(book.id)
+        # Download count xotirada yig'iladi, bazaga davriy flush da yoziladi
+        book_db.queue_download(book.id)
         logger.info(f"Book downloaded: {book.title} (ID: {book.id})")
         return True
 
@@ -143,40 +196,122 @@ async def send_book_file(message: types.Message, book: Book) -> bool:
         return False
 
 
-async def send_book_file_callback(callback: types.CallbackQuery, book: Book) -> bool:
-    """Kitob faylini callback orqali yuborish"""
-    try:
-        emoji = get_book_emoji(book.file_type)
-        caption = f"{emoji} <b>{book.title}</b>"
+# Fon vazifalariga kuchli havola (GC yig'ib yubormasligi uchun)
+_background_tasks: Set[asyncio.Task] = set()
 
-        if book.author:
-            caption += f"\n✍️ {book.author}"
 
-        if book.file_type == FileType.AUDIO:
-            if book.narrator:
-                caption += f"\n🎙 {book.narrator}"
+async def _deliver_book(chat_id: int, book: Book):
+    """Kitobni yuborish, xato bo'lsa foydalanuvchiga xabar berish"""
+    if not await _send_book(chat_id, book):
+        # Fon vazifasi hech kim tomonidan kutilmaydi: xato shu yerda loglanishi kerak
+        try:
+            await bot.send_message(chat_id, "❌ Xatolik yuz berdi. Iltimos, keyinroq urinib ko'ring.")
+        except Exception as e:
+            logger.error(f"Error notifying {chat_id} about failed delivery of book {book.id}: {e}")
 
-            await callback.message.answer_audio(
-                audio=book.file_id,
-                caption=caption,
-                duration=book.duration,
-                title=book.title,
-                performer=book.author
-            )
-        else:
-            await callback.message.answer_document(
-                document=book.file_id,
-                caption=caption
-            )
 
-        # Download count ni oshirish
-        book_db.increment_download_count(book.id)
-        logger.info(f"Book downloaded: {book.title} (ID: {book.id})")
-        return True
+def send_book_in_background(chat_id: int, book: Book):
+    """Faylni fon vazifasida yuborish (handler Telegram javobini kutmaydi)"""
+    task = asyncio.create_task(_deliver_book(chat_id, book))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
 
-    except Exception as e:
-        logger.error(f"Error sending book file: {e}")
-        return False
+
+# =================== CATEGORY CACHE ===================
+# Kategoriyalar ro'yxati BookDatabase da TTL bilan keshlanadi,
+# menyu (matn + keyboard) esa shu ro'yxat o'zgarmaguncha qayta ishlatiladi
+_CATEGORIES_TEXT = "📚 <b>Kategoriyalar</b>\n\nQaysi kategoriyadan kitob izlaysiz?"
+_NO_CATEGORIES_TEXT = "📭 <b>Kategoriyalar mavjud emas</b>\n\nTez orada kitoblar qo'shiladi!"
+
+_cat_cache: Dict[str, Any] = {
+    "rows": None,
+    "view": (_NO_CATEGORIES_TEXT, None),
+    "by_id": {},
+    "children": {},
+}
+
+
+def _refresh_cat_cache():
+    """Keshlangan kategoriyalar ro'yxati o'zgargan bo'lsa, menyu va indekslarni qayta qurish"""
+    rows = book_db.get_categories_with_book_count()
+    if rows is _cat_cache["rows"]:
+        return
+
+    by_id: Dict[int, Category] = {}
+    children: Dict[Optional[int], List[Category]] = {}
+    for cat in rows:
+        by_id[cat.id] = cat
+        children.setdefault(cat.parent_id, []).append(cat)
+
+    main_cats = children.get(None)
+    if main_cats:
+        # Asosiy kategoriyalarda subkategoriyalardagi kitoblar ham sanaladi (bitta so'rov)
+        totals = book_db.count_books_grouped_by_category(include_subcategories=True)
+        view = (_CATEGORIES_TEXT, categories_keyboard(
+            main_cats, prefix="u_cat", show_book_count=True, book_counts=totals
+        ))
+    else:
+        view = (_NO_CATEGORIES_TEXT, None)
+    _cat_cache.update(rows=rows, view=view, by_id=by_id, children=children)
+
+
+def _render_categories() -> Tuple[str, Optional[types.InlineKeyboardMarkup]]:
+    """Kategoriyalar menyusi: (matn, keyboard). Kategoriya bo'lmasa keyboard None"""
+    _refresh_cat_cache()
+    return _cat_cache["view"]
+
+
+def get_cached_category(category_id: int) -> Tuple[Optional[Category], List[Category]]:
+    """Kategoriya va uning subkategoriyalari (bazaga so'rovsiz, keshdan)"""
+    _refresh_cat_cache()
+    return _cat_cache["by_id"].get(category_id), _cat_cache["children"].get(category_id, [])
+
+
+# =================== TYPE MENU CACHE ===================
+# PDF/Audio tanlash ekrani faqat kategoriya, yo'l va sonlarga bog'liq
+
+@lru_cache(maxsize=512)
+def _render_type_menu(
+        cat_id: int,
+        title: str,
+        icon: str,
+        pdf_count: int,
+        audio_count: int,
+        back_callback: str
+) -> Tuple[str, types.InlineKeyboardMarkup]:
+    """Tur tanlash ekrani: (matn, keyboard)"""
+    text = (
+        f"{icon} <b>{title}</b>\n\n"
+        f"{Emoji.BOOK_PDF} PDF: {pdf_count} ta\n"
+        f"{Emoji.BOOK_AUDIO} Audio: {audio_count} ta\n\n"
+        f"Turni tanlang:"
+    )
+    keyboard = book_type_keyboard(
+        cat_id,
+        pdf_count=pdf_count,
+        audio_count=audio_count,
+        back_callback=back_callback
+    )
+    return text, keyboard
+
+
+# =================== POPULAR CACHE ===================
+# Mashhur kitoblar keyboardi faqat sonlar yoki keshlangan ro'yxat o'zgarganda quriladi
+_popular_views: Dict[str, Tuple[List[Book], types.InlineKeyboardMarkup]] = {}
+
+
+@lru_cache(maxsize=64)
+def _popular_menu(pdf_count: int, audio_count: int) -> types.InlineKeyboardMarkup:
+    """PDF/Audio tanlash keyboardi (sonlar bo'yicha memo)"""
+    return popular_keyboard(pdf_count=pdf_count, audio_count=audio_count)
+
+
+def _popular_books_markup(books: List[Book], file_type_str: str) -> types.InlineKeyboardMarkup:
+    """Mashhur kitoblar keyboardi (ro'yxat o'zgarmagan bo'lsa tayyorini qaytaradi)"""
+    cached = _popular_views.get(file_type_str)
+    if cached is None or cached[0] is not books:
+        cached = _popular_views[file_type_str] = (books, popular_books_keyboard(books, file_type_str))
+    return cached[1]
 
 
 # =================== SEARCH CACHE ===================
@@ -184,8 +319,13 @@ async def send_book_file_callback(callback: types.CallbackQuery, book: Book) ->
 _search_cache: Dict[int, Dict[str, Any]] = {}
 _search_id_counter = 0
 
+# Natijalar (sonlar va sahifalar) qisqa muddat saqlanadi: o'chirilgan/yangi
+# qo'shilgan kitoblar ko'pi bilan SEARCH_RESULTS_TTL soniyadan keyin ko'rinadi
+SEARCH_RESULTS_TTL = 300
+_search_results = TTLCache(ttl=SEARCH_RESULTS_TTL, maxsize=1024)
 
-def cache_search(query: str, user_id: int) -> int:
+
+def cache_search(query: str, user_id: int, counts: Tuple[int, int] = None) -> int:
     """Qidiruv so'rovini cache qilish"""
     global _search_id_counter
     _search_id_counter += 1
@@ -193,8 +333,10 @@ def cache_search(query: str, user_id: int) -> int:
     _search_cache[_search_id_counter] = {
         'query': query,
         'user_id': user_id,
-        'timestamp': datetime.now()
     }
+    # (pdf, audio) soni allaqachon hisoblangan bo'lsa, qayta so'ralmaydi
+    if counts is not None:
+        _search_results.set((_search_id_counter, 'counts'), counts)
 
     # Eski cache larni tozalash (100 dan ortiq bo'lsa)
     if len(_search_cache) > 100:
@@ -212,6 +354,29 @@ def get_cached_search(search_id: int) -> Optional[str]:
     return None
 
 
+def get_search_counts(search_id: int) -> Tuple[int, int]:
+    """Qidiruvning (pdf, audio) natijalar soni (TTL ichida bir marta hisoblanadi)"""
+    query = _search_cache[search_id]['query']
+    return _search_results.get_or_set(
+        (search_id, 'counts'),
+        lambda: book_db.count_search_books(query)
+    )
+
+
+def get_search_page(search_id: int, file_type: FileType, page: int) -> PaginatedResult:
+    """Qidiruv natijalari sahifasi (TTL ichida qayta ochilganda bazaga so'rov yubormaydi)"""
+    query = _search_cache[search_id]['query']
+    return _search_results.get_or_set(
+        (search_id, file_type.value, page),
+        lambda: book_db.search_books(
+            query,
+            file_type=file_type,
+            page=page,
+            per_page=BOOKS_PER_PAGE
+        )
+    )
+
+
 # =================== START & MAIN MENU ===================
 
 @dp.message_handler(CommandStart())
@@ -222,15 +387,15 @@ async def cmd_start(message: types.Message, state: FSMContext):
     if current:
         await state.finish()
 
-    # Foydalanuvchini ro'yxatdan o'tkazish
-    user = user_db.select_user(telegram_id=message.from_user.id)
-    if not user:
+    # Foydalanuvchini ro'yxatdan o'tkazish (faollikni ActivityMiddleware belgilaydi)
+    if not user_db.is_known_user(message.from_user.id):
         try:
-            user_db.add_user(
+            is_new = user_db.upsert_user(
                 telegram_id=message.from_user.id,
                 username=message.from_user.username
             )
-            logger.info(f"New user registered: {message.from_user.id}")
+            if is_new:
+                logger.info(f"New user registered: {message.from_user.id}")
         except Exception as e:
             logger.error(f"Error registering user: {e}")
 
@@ -246,72 +411,53 @@ async def cmd_start(message: types.Message, state: FSMContext):
         f"Quyidagi menyudan foydalaning:"
     )
 
-    await message.answer(text, reply_markup=user_main_menu())
+    await message.answer(text, reply_markup=_MAIN_MENU)
 
 
-@dp.message_handler(Text(equals=f"{Emoji.HOME} Bosh menyu"))
+@dp.message_handler(Text(equals=MenuText.HOME))
 async def go_home(message: types.Message, state: FSMContext):
     """Bosh menyuga qaytish"""
     current = await state.get_state()
     if current:
         await state.finish()
 
-    await message.answer("🏠 <b>Bosh menyu</b>", reply_markup=user_main_menu())
+    await message.answer(_MAIN_MENU_TEXT, reply_markup=_MAIN_MENU)
 
 
-@dp.message_handler(Text(equals=f"{Emoji.BACK} Orqaga"))
+@dp.message_handler(Text(equals=MenuText.BACK))
 async def go_back(message: types.Message, state: FSMContext):
     """Orqaga (state ni tozalash)"""
     current = await state.get_state()
     if current:
         await state.finish()
-        await message.answer("🏠 <b>Bosh menyu</b>", reply_markup=user_main_menu())
+        await message.answer(_MAIN_MENU_TEXT, reply_markup=_MAIN_MENU)
     else:
-        await message.answer("🏠 <b>Bosh menyu</b>", reply_markup=user_main_menu())
+        await message.answer(_MAIN_MENU_TEXT, reply_markup=_MAIN_MENU)
 
 
 # =================== KATEGORIYALAR ===================
 
-@dp.message_handler(Text(equals=f"{Emoji.FOLDER} Kategoriyalar"))
+@dp.message_handler(Text(equals=MenuText.CATEGORIES))
 async def show_categories(message: types.Message):
     """Kategoriyalarni ko'rsatish"""
-    categories = book_db.get_categories_with_book_count()
-    main_cats = [c for c in categories if c.parent_id is None]
+    text, keyboard = _render_categories()
+    await message.answer(text, reply_markup=keyboard or _MAIN_MENU)
 
-    if not main_cats:
-        await message.answer(
-            "📭 <b>Kategoriyalar mavjud emas</b>\n\n"
-            "Tez orada kitoblar qo'shiladi!",
-            reply_markup=user_main_menu()
-        )
-        return
 
-    text = "📚 <b>Kategoriyalar</b>\n\nQaysi kategoriyadan kitob izlaysiz?"
-    keyboard = categories_keyboard(main_cats, prefix="u_cat", show_book_count=True)
-
-    await message.answer(text, reply_markup=keyboard)
-
-
-@dp.callback_query_handler(lambda c: c.data.startswith("u_cat:"))
+@dp.callback_query_handler(Text(startswith="u_cat:"))
 async def category_selected(callback: types.CallbackQuery):
     """Kategoriya tanlandi"""
     cat_id = CallbackParser.get_int_param(callback.data, 0)
-    category = book_db.get_category_by_id(cat_id)
+    category, subcats = get_cached_category(cat_id)
 
     if not category:
         await callback.answer("❌ Kategoriya topilmadi!", show_alert=True)
         return
 
-    # Subkategoriyalar bor-yo'qligini tekshirish
-    subcats = book_db.get_subcategories(cat_id)
-
     if subcats:
         # Subkategoriyalarni ko'rsatish
-        subcats_with_count = book_db.get_categories_with_book_count()
-        subcats_filtered = [c for c in subcats_with_count if c.parent_id == cat_id]
-
         keyboard = subcategories_keyboard(
-            subcats_filtered,
+            subcats,
             parent_id=cat_id,
             show_book_count=True
         )
@@ -322,73 +468,51 @@ async def category_selected(callback: types.CallbackQuery):
         )
     else:
         # Kitob turini tanlash
-        pdf_count = book_db.count_books_by_category(cat_id, FileType.PDF)
-        audio_count = book_db.count_books_by_category(cat_id, FileType.AUDIO)
-
-        keyboard = book_type_keyboard(
-            cat_id,
-            pdf_count=pdf_count,
-            audio_count=audio_count,
-            back_callback="u_back:categories"
-        )
-
-        await callback.message.edit_text(
-            f"📁 <b>{category.name}</b>\n\n"
-            f"{Emoji.BOOK_PDF} PDF: {pdf_count} ta\n"
-            f"{Emoji.BOOK_AUDIO} Audio: {audio_count} ta\n\n"
-            f"Turni tanlang:",
-            reply_markup=keyboard
+        pdf_count, audio_count = book_db.count_books_by_type(cat_id)
+        text, keyboard = _render_type_menu(
+            cat_id, category.name, "📁", pdf_count, audio_count, "u_back:categories"
         )
+        await callback.message.edit_text(text, reply_markup=keyboard)
 
     await callback.answer()
 
 
-@dp.callback_query_handler(lambda c: c.data.startswith("u_subcat:"))
+@dp.callback_query_handler(Text(startswith="u_subcat:"))
 async def subcategory_selected(callback: types.CallbackQuery):
     """Subkategoriya tanlandi"""
     sub_id = CallbackParser.get_int_param(callback.data, 0)
-    subcategory = book_db.get_category_by_id(sub_id)
+    subcategory, _ = get_cached_category(sub_id)
 
     if not subcategory:
         await callback.answer("❌ Kategoriya topilmadi!", show_alert=True)
         return
 
     # Kitob turini tanlash
-    pdf_count = book_db.count_books_by_category(sub_id, FileType.PDF)
-    audio_count = book_db.count_books_by_category(sub_id, FileType.AUDIO)
-
+    pdf_count, audio_count = book_db.count_books_by_type(sub_id)
     path = book_db.get_category_path(sub_id)
 
-    keyboard = book_type_keyboard(
-        sub_id,
-        pdf_count=pdf_count,
-        audio_count=audio_count,
-        back_callback=f"u_cat:{subcategory.parent_id}"
-    )
-
-    await callback.message.edit_text(
-        f"📂 <b>{path}</b>\n\n"
-        f"{Emoji.BOOK_PDF} PDF: {pdf_count} ta\n"
-        f"{Emoji.BOOK_AUDIO} Audio: {audio_count} ta\n\n"
-        f"Turni tanlang:",
-        reply_markup=keyboard
+    text, keyboard = _render_type_menu(
+        sub_id, path, "📂", pdf_count, audio_count, f"u_cat:{subcategory.parent_id}"
     )
+    await callback.message.edit_text(text, reply_markup=keyboard)
 
     await callback.answer()
 
 
-@dp.callback_query_handler(lambda c: c.data.startswith("u_type:"))
+@dp.callback_query_handler(Text(startswith="u_type:"))
 async def book_type_selected(callback: types.CallbackQuery):
     """Kitob turi tanlandi (pdf/audio)"""
-    parts = callback.data.split(":")
-    file_type_str = parts[1]
-    cat_id = int(parts[2])
+    match = _RE_TYPE.match(callback.data)
+    if not match:
+        await callback.answer()
+        return
+    file_type_str, cat_id = match.group(1), int(match.group(2))
 
     file_type = FileType.PDF if file_type_str == "pdf" else FileType.AUDIO
 
-    # Kitoblarni olish
-    result = book_db.get_books(
-        category_id=cat_id,
+    # Kategoriya va kitoblarni bitta so'rovda olish
+    category, result = book_db.get_category_with_books(
+        cat_id,
         file_type=file_type,
         page=1,
         per_page=BOOKS_PER_PAGE
@@ -397,13 +521,17 @@ async def book_type_selected(callback: types.CallbackQuery):
     if not result.items:
         await callback.message.edit_text(
             "📭 Bu kategoriyada kitoblar yo'q.",
-            reply_markup=book_type_keyboard(cat_id, 0, 0, "back:categories")
+            reply_markup=book_type_keyboard(cat_id, 0, 0, "u_back:categories")
         )
         await callback.answer()
         return
 
-    category = book_db.get_category_by_id(cat_id)
-    path = book_db.get_category_path(cat_id) if category else "Kategoriya"
+    if not category:
+        path = "Kategoriya"
+    elif category.parent_id is None:
+        path = category.name
+    else:
+        path = book_db.get_category_path(cat_id)
     emoji = Emoji.BOOK_PDF if file_type == FileType.PDF else Emoji.BOOK_AUDIO
 
     keyboard = books_paginated_keyboard(
@@ -423,13 +551,16 @@ async def book_type_selected(callback: types.CallbackQuery):
     await callback.answer()
 
 
-@dp.callback_query_handler(lambda c: c.data.startswith("u_pg:"))
+@dp.callback_query_handler(Text(startswith="u_pg:"))
 async def books_pagination(callback: types.CallbackQuery):
     """Kitoblar pagination"""
-    parts = callback.data.split(":")
-    page = int(parts[1])
-    cat_id = int(parts[2]) if parts[2] != "0" else None
-    file_type_str = parts[3] if len(parts) > 3 else "all"
+    match = _RE_PAGE.match(callback.data)
+    if not match:
+        await callback.answer()
+        return
+    page = int(match.group(1))
+    cat_id = int(match.group(2)) or None
+    file_type_str = match.group(3) or "all"
 
     file_type = FileType.PDF if file_type_str == "pdf" else FileType.AUDIO if file_type_str == "audio" else None
 
@@ -460,7 +591,7 @@ async def books_pagination(callback: types.CallbackQuery):
 
 # =================== KITOB YUKLAB OLISH ===================
 
-@dp.callback_query_handler(lambda c: c.data.startswith("u_dl:"))
+@dp.callback_query_handler(Text(startswith="u_dl:"))
 async def download_book(callback: types.CallbackQuery):
     """Kitobni yuklab olish"""
     book_id = CallbackParser.get_int_param(callback.data, 0)
@@ -470,17 +601,11 @@ async def download_book(callback: types.CallbackQuery):
         await callback.answer("❌ Kitob topilmadi!", show_alert=True)
         return
 
+    send_book_in_background(callback.message.chat.id, book)
     await callback.answer("📥 Yuklanmoqda...")
 
-    success = await send_book_file_callback(callback, book)
-
-    if not success:
-        await callback.message.answer(
-            "❌ Xatolik yuz berdi. Iltimos, keyinroq urinib ko'ring."
-        )
 
-
-@dp.callback_query_handler(lambda c: c.data.startswith("u_book:"))
+@dp.callback_query_handler(Text(startswith="u_book:"))
 async def show_book_detail(callback: types.CallbackQuery):
     """Kitob tafsilotlari"""
     book_id = CallbackParser.get_int_param(callback.data, 0)
@@ -499,23 +624,23 @@ async def show_book_detail(callback: types.CallbackQuery):
 
 # =================== QIDIRUV ===================
 
-@dp.message_handler(Text(equals=f"{Emoji.SEARCH} Qidirish"))
+@dp.message_handler(Text(equals=MenuText.SEARCH))
 async def search_start(message: types.Message, state: FSMContext):
     """Qidiruvni boshlash"""
     await message.answer(
         f"🔍 <b>Qidiruv</b>\n\n"
         f"Kitob nomi, muallif yoki hikoyachi ismini kiriting:\n\n"
         f"<i>Masalan: Python, Alisher Navoiy, audio kitoblar...</i>",
-        reply_markup=cancel_button()
+        reply_markup=_CANCEL_KB
     )
     await SearchState.waiting_query.set()
 
 
-@dp.message_handler(Text(equals=f"{Emoji.CANCEL} Bekor qilish"), state=SearchState.waiting_query)
+@dp.message_handler(Text(equals=MenuText.CANCEL), state=SearchState.waiting_query)
 async def search_cancel(message: types.Message, state: FSMContext):
     """Qidiruvni bekor qilish"""
     await state.finish()
-    await message.answer("❌ Qidiruv bekor qilindi", reply_markup=user_main_menu())
+    await message.answer("❌ Qidiruv bekor qilindi", reply_markup=_MAIN_MENU)
 
 
 @dp.message_handler(state=SearchState.waiting_query)
@@ -526,35 +651,34 @@ async def search_process(message: types.Message, state: FSMContext):
     if len(query) < 2:
         await message.answer(
             "⚠️ Kamida 2 ta belgi kiriting!",
-            reply_markup=cancel_button()
+            reply_markup=_CANCEL_KB
         )
         return
 
     if len(query) > 100:
         query = query[:100]
 
-    # Cache qilish
-    search_id = cache_search(query, message.from_user.id)
+    # PDF va Audio natijalar soni (bitta COUNT so'rovda)
+    pdf_count, audio_count = book_db.count_search_books(query)
 
-    # PDF va Audio natijalarni alohida hisoblash
-    pdf_result = book_db.search_books(query, file_type=FileType.PDF, page=1, per_page=1)
-    audio_result = book_db.search_books(query, file_type=FileType.AUDIO, page=1, per_page=1)
+    # Cache qilish (sonlar bilan birga, orqaga qaytishda qayta hisoblanmaydi)
+    search_id = cache_search(query, message.from_user.id, (pdf_count, audio_count))
 
-    total = pdf_result.total + audio_result.total
+    total = pdf_count + audio_count
 
     if total == 0:
         await message.answer(
             f"😔 <b>Hech narsa topilmadi</b>\n\n"
             f"<i>\"{truncate_text(query, 50)}\"</i> bo'yicha natija yo'q.\n\n"
             f"Boshqa so'z bilan qidirib ko'ring.",
-            reply_markup=user_main_menu()
+            reply_markup=_MAIN_MENU
         )
         await state.finish()
         return
 
     keyboard = search_type_keyboard(
-        pdf_count=pdf_result.total,
-        audio_count=audio_result.total,
+        pdf_count=pdf_count,
+        audio_count=audio_count,
         search_id=search_id
     )
 
@@ -568,12 +692,14 @@ async def search_process(message: types.Message, state: FSMContext):
     await state.finish()
 
 
-@dp.callback_query_handler(lambda c: c.data.startswith("u_stype:"))
+@dp.callback_query_handler(Text(startswith="u_stype:"))
 async def search_type_selected(callback: types.CallbackQuery):
     """Qidiruv natijasi turi tanlandi"""
-    parts = callback.data.split(":")
-    file_type_str = parts[1]
-    search_id = int(parts[2])
+    match = _RE_STYPE.match(callback.data)
+    if not match:
+        await callback.answer()
+        return
+    file_type_str, search_id = match.group(1), int(match.group(2))
 
     query = get_cached_search(search_id)
     if not query:
@@ -582,12 +708,7 @@ async def search_type_selected(callback: types.CallbackQuery):
 
     file_type = FileType.PDF if file_type_str == "pdf" else FileType.AUDIO
 
-    result = book_db.search_books(
-        query,
-        file_type=file_type,
-        page=1,
-        per_page=BOOKS_PER_PAGE
-    )
+    result = get_search_page(search_id, file_type, 1)
 
     if not result.items:
         await callback.message.edit_text("😔 Natijalar topilmadi.")
@@ -615,13 +736,15 @@ async def search_type_selected(callback: types.CallbackQuery):
     await callback.answer()
 
 
-@dp.callback_query_handler(lambda c: c.data.startswith("u_sp:"))
+@dp.callback_query_handler(Text(startswith="u_sp:"))
 async def search_pagination(callback: types.CallbackQuery):
     """Qidiruv natijalari pagination"""
-    parts = callback.data.split(":")
-    page = int(parts[1])
-    search_id = int(parts[2])
-    file_type_str = parts[3]
+    match = _RE_SPAGE.match(callback.data)
+    if not match:
+        await callback.answer()
+        return
+    page, search_id = int(match.group(1)), int(match.group(2))
+    file_type_str = match.group(3)
 
     query = get_cached_search(search_id)
     if not query:
@@ -630,12 +753,7 @@ async def search_pagination(callback: types.CallbackQuery):
 
     file_type = FileType.PDF if file_type_str == "pdf" else FileType.AUDIO
 
-    result = book_db.search_books(
-        query,
-        file_type=file_type,
-        page=page,
-        per_page=BOOKS_PER_PAGE
-    )
+    result = get_search_page(search_id, file_type, page)
 
     keyboard = search_results_keyboard(
         result.items,
@@ -656,7 +774,7 @@ async def search_pagination(callback: types.CallbackQuery):
     await callback.answer()
 
 
-@dp.callback_query_handler(lambda c: c.data.startswith("u_sback:"))
+@dp.callback_query_handler(Text(startswith="u_sback:"))
 async def search_back_to_types(callback: types.CallbackQuery):
     """Qidiruv turi tanlash sahifasiga qaytish"""
     search_id = CallbackParser.get_int_param(callback.data, 0)
@@ -667,13 +785,11 @@ async def search_back_to_types(callback: types.CallbackQuery):
         await callback.message.delete()
         return
 
-    # Qayta hisoblash
-    pdf_result = book_db.search_books(query, file_type=FileType.PDF, page=1, per_page=1)
-    audio_result = book_db.search_books(query, file_type=FileType.AUDIO, page=1, per_page=1)
+    pdf_count, audio_count = get_search_counts(search_id)
 
     keyboard = search_type_keyboard(
-        pdf_count=pdf_result.total,
-        audio_count=audio_result.total,
+        pdf_count=pdf_count,
+        audio_count=audio_count,
         search_id=search_id
     )
 
@@ -689,20 +805,19 @@ async def search_back_to_types(callback: types.CallbackQuery):
 
 # =================== MASHHUR KITOBLAR ===================
 
-@dp.message_handler(Text(equals=f"{Emoji.FIRE} Mashhurlar"))
+@dp.message_handler(Text(equals=MenuText.POPULAR))
 async def show_popular(message: types.Message):
     """Mashhur kitoblar"""
-    pdf_count = book_db.count_books(file_type=FileType.PDF.value)
-    audio_count = book_db.count_books(file_type=FileType.AUDIO.value)
+    pdf_count, audio_count = book_db.count_books_by_type()
 
     if pdf_count == 0 and audio_count == 0:
         await message.answer(
             "📭 <b>Kitoblar mavjud emas</b>",
-            reply_markup=user_main_menu()
+            reply_markup=_MAIN_MENU
         )
         return
 
-    keyboard = popular_keyboard(pdf_count=pdf_count, audio_count=audio_count)
+    keyboard = _popular_menu(pdf_count, audio_count)
 
     await message.answer(
         f"🔥 <b>Mashhur kitoblar</b>\n\n"
@@ -712,7 +827,7 @@ async def show_popular(message: types.Message):
     )
 
 
-@dp.callback_query_handler(lambda c: c.data.startswith("u_popular:"))
+@dp.callback_query_handler(Text(startswith="u_popular:"))
 async def popular_type_selected(callback: types.CallbackQuery):
     """Mashhur kitoblar turi"""
     file_type_str = CallbackParser.get_param(callback.data, 0)
@@ -727,7 +842,7 @@ async def popular_type_selected(callback: types.CallbackQuery):
 
     emoji = Emoji.BOOK_PDF if file_type == FileType.PDF else Emoji.BOOK_AUDIO
 
-    keyboard = popular_books_keyboard(books, file_type_str)
+    keyboard = _popular_books_markup(books, file_type_str)
 
     await callback.message.edit_text(
         f"{emoji} <b>TOP-{len(books)} Mashhur kitoblar</b>\n\n"
@@ -740,7 +855,7 @@ async def popular_type_selected(callback: types.CallbackQuery):
 
 # =================== YANGI KITOBLAR ===================
 
-@dp.message_handler(Text(equals=f"{Emoji.NEW} Yangilar"))
+@dp.message_handler(Text(equals=MenuText.RECENT))
 async def show_recent(message: types.Message):
     """Yangi qo'shilgan kitoblar"""
     books = book_db.get_recent_books(limit=RECENT_LIMIT)
@@ -748,7 +863,7 @@ async def show_recent(message: types.Message):
     if not books:
         await message.answer(
             "📭 <b>Yangi kitoblar yo'q</b>",
-            reply_markup=user_main_menu()
+            reply_markup=_MAIN_MENU
         )
         return
 
@@ -764,7 +879,7 @@ async def show_recent(message: types.Message):
 
 # =================== STATISTIKA ===================
 
-@dp.message_handler(Text(equals=f"{Emoji.STATS} Statistika"))
+@dp.message_handler(Text(equals=MenuText.STATS))
 async def show_statistics(message: types.Message):
     """Statistikani ko'rsatish"""
     stats = book_db.get_statistics()
@@ -781,74 +896,49 @@ async def show_statistics(message: types.Message):
     # TOP 5 kitoblar
     popular = book_db.get_popular_books(5)
     if popular:
-        text += "\n\n⭐️ <b>TOP-5 kitoblar:</b>\n"
-        for i, book in enumerate(popular, 1):
-            emoji = get_book_emoji(book.file_type)
-            medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}."
-            text += f"{medal} {emoji} {truncate_text(book.title, 25)} — {book.download_count}\n"
+        lines = [
+            f"{rank_label(i)} {get_book_emoji(book.file_type)} "
+            f"{truncate_text(book.title, 25)} — {book.download_count}\n"
+            for i, book in enumerate(popular, 1)
+        ]
+        text = f"{text}\n\n⭐️ <b>TOP-5 kitoblar:</b>\n{''.join(lines)}"
 
-    await message.answer(text, reply_markup=close_keyboard())
+    await message.answer(text, reply_markup=_CLOSE_KB)
 
 
 # =================== YORDAM ===================
 
-@dp.message_handler(Text(equals=f"{Emoji.HELP} Yordam"))
+@dp.message_handler(Text(equals=MenuText.HELP))
 async def show_help(message: types.Message):
     """Yordam"""
-    text = (
-        f"ℹ️ <b>Yordam</b>\n\n"
-        f"<b>Bot imkoniyatlari:</b>\n\n"
-        f"📁 <b>Kategoriyalar</b> — Kitoblarni kategoriyalar bo'yicha ko'rish\n\n"
-        f"🔍 <b>Qidirish</b> — Kitob nomi, muallif yoki hikoyachi bo'yicha qidirish\n\n"
-        f"🔥 <b>Mashhurlar</b> — Eng ko'p yuklangan kitoblar\n\n"
-        f"🆕 <b>Yangilar</b> — So'nggi qo'shilgan kitoblar\n\n"
-        f"📊 <b>Statistika</b> — Kutubxona statistikasi\n\n"
-        f"<b>Qanday foydalanish:</b>\n"
-        f"1. Kategoriya tanlang\n"
-        f"2. PDF yoki Audio ni tanlang\n"
-        f"3. Kitobni bosing — avtomatik yuklanadi!\n\n"
-        f"<b>Savol va takliflar uchun:</b>\n"
-        f"@admin_username"
-    )
-
-    await message.answer(text, reply_markup=close_keyboard())
+    await message.answer(_HELP_TEXT, reply_markup=_CLOSE_KB)
 
 
 # =================== BACK HANDLERS ===================
 
-@dp.callback_query_handler(lambda c: c.data.startswith("u_back:"))
+@dp.callback_query_handler(Text(startswith="u_back:"))
 async def back_handler(callback: types.CallbackQuery):
     """Orqaga navigatsiya"""
     target = CallbackParser.get_param(callback.data, 0)
 
     if target == "main":
         await callback.message.delete()
-        await callback.message.answer("🏠 <b>Bosh menyu</b>", reply_markup=user_main_menu())
+        await callback.message.answer(_MAIN_MENU_TEXT, reply_markup=_MAIN_MENU)
 
     elif target == "categories":
-        categories = book_db.get_categories_with_book_count()
-        main_cats = [c for c in categories if c.parent_id is None]
-
-        keyboard = categories_keyboard(main_cats, prefix="u_cat", show_book_count=True)
-        await callback.message.edit_text(
-            "📚 <b>Kategoriyalar</b>\n\nQaysi kategoriyadan kitob izlaysiz?",
-            reply_markup=keyboard
-        )
+        text, keyboard = _render_categories()
+        await edit_if_changed(callback.message, text, keyboard)
 
     elif target == "popular":
-        pdf_count = book_db.count_books(file_type=FileType.PDF.value)
-        audio_count = book_db.count_books(file_type=FileType.AUDIO.value)
+        pdf_count, audio_count = book_db.count_books_by_type()
 
-        keyboard = popular_keyboard(pdf_count=pdf_count, audio_count=audio_count)
-        await callback.message.edit_text(
-            f"🔥 <b>Mashhur kitoblar</b>\n\nTurni tanlang:",
-            reply_markup=keyboard
-        )
+        keyboard = _popular_menu(pdf_count, audio_count)
+        await edit_if_changed(callback.message, "🔥 <b>Mashhur kitoblar</b>\n\nTurni tanlang:", keyboard)
 
     await callback.answer()
 
 
-@dp.callback_query_handler(lambda c: c.data.startswith("u_backtype:"))
+@dp.callback_query_handler(Text(startswith="u_backtype:"))
 async def back_to_type(callback: types.CallbackQuery):
     """Tur tanlash sahifasiga qaytish"""
     cat_id = CallbackParser.get_int_param(callback.data, 0)
@@ -856,52 +946,39 @@ async def back_to_type(callback: types.CallbackQuery):
     if cat_id == 0:
         # Bosh menyuga
         await callback.message.delete()
-        await callback.message.answer("🏠 <b>Bosh menyu</b>", reply_markup=user_main_menu())
+        await callback.message.answer(_MAIN_MENU_TEXT, reply_markup=_MAIN_MENU)
         return
 
-    category = book_db.get_category_by_id(cat_id)
+    category, _ = get_cached_category(cat_id)
     if not category:
         await callback.answer("❌ Kategoriya topilmadi!", show_alert=True)
         return
 
-    pdf_count = book_db.count_books_by_category(cat_id, FileType.PDF)
-    audio_count = book_db.count_books_by_category(cat_id, FileType.AUDIO)
+    pdf_count, audio_count = book_db.count_books_by_type(cat_id)
 
     path = book_db.get_category_path(cat_id)
 
     # Orqaga callback ni aniqlash
     if category.parent_id:
-        back_callback = f"cat:{category.parent_id}"
+        back_callback = f"u_cat:{category.parent_id}"
     else:
-        back_callback = "back:categories"
-
-    keyboard = book_type_keyboard(
-        cat_id,
-        pdf_count=pdf_count,
-        audio_count=audio_count,
-        back_callback=back_callback
-    )
+        back_callback = "u_back:categories"
 
-    await callback.message.edit_text(
-        f"📁 <b>{path}</b>\n\n"
-        f"{Emoji.BOOK_PDF} PDF: {pdf_count} ta\n"
-        f"{Emoji.BOOK_AUDIO} Audio: {audio_count} ta\n\n"
-        f"Turni tanlang:",
-        reply_markup=keyboard
-    )
+    text, keyboard = _render_type_menu(cat_id, path, "📁", pdf_count, audio_count, back_callback)
+    await edit_if_changed(callback.message, text, keyboard)
 
     await callback.answer()
 
 
 # =================== EMPTY & CLOSE ===================
 
-@dp.callback_query_handler(lambda c: c.data in ["u_empty", "u_page_info"])
+@dp.callback_query_handler(Text(equals=["u_empty", "u_page_info"]))
 async def empty_callback(callback: types.CallbackQuery):
     """Bo'sh callback"""
     await callback.answer()
 
 
-@dp.callback_query_handler(lambda c: c.data == "u_close")
+@dp.callback_query_handler(Text(equals="u_close"))
 async def close_callback(callback: types.CallbackQuery):
     """Yopish"""
     await callback.message.delete()
@@ -922,5 +999,5 @@ async def unknown_message(message: types.Message, state: FSMContext):
     await message.answer(
         "🤔 Tushunmadim.\n\n"
         "Quyidagi menyudan foydalaning:",
-        reply_markup=user_main_menu()
+        reply_markup=_MAIN_MENU
     )
\ No newline at end of file
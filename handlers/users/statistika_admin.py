@@ -1,4 +1,5 @@
 from aiogram import types
+from aiogram.dispatcher.filters import Text
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from loader import user_db, dp
 from data.config import ADMINS  # ADMINS ro'yxatini import qilish
@@ -11,10 +12,9 @@ async def check_super_admin_permission(telegram_id: int):
 
 async def check_admin_permission(telegram_id: int):
 
-    user = user_db.select_user(telegram_id=telegram_id)
-    if not user:
+    user_id = user_db.get_user_id(telegram_id)  # Users jadvalidagi id (user_id)
+    if not user_id:
         return False
-    user_id = user[0]  # Users jadvalidagi id (user_id)
     admin = user_db.check_if_admin(user_id=user_id)
     return admin
 
@@ -53,7 +53,7 @@ async def admin_statistics_handler(message: types.Message):
         await message.answer(stats_text, reply_markup=markup, parse_mode="HTML")
 
 # Callback query uchun batafsil statistika
-@dp.callback_query_handler(lambda c: c.data == "detailed_statistics")
+@dp.callback_query_handler(Text(equals="detailed_statistics"))
 async def detailed_statistics_callback_handler(call: types.CallbackQuery):
     total_admins = user_db.get_all_admins()
 
@@ -16,7 +16,11 @@ from aiogram.types import (
     ReplyKeyboardMarkup, KeyboardButton,
     InlineKeyboardMarkup, InlineKeyboardButton
 )
-from typing import List, Optional, Union
+from dataclasses import dataclass
+from typing import Final, List, Optional, Tuple, Union
+from functools import lru_cache
+import re
+import sys
 
 # Type imports
 from typing import TYPE_CHECKING
@@ -78,28 +82,121 @@ class AdminEmoji:
 MAX_CALLBACK_LENGTH = 64
 
 
+# =================== BUTTON LABELS ===================
+# Statik tugma matnlari import paytida bir marta formatlanadi
+
+_LBL_CATEGORIES_MENU: Final[str] = "🗂 Kategoriyalar boshqaruvi"
+_LBL_BOOKS_MENU: Final[str] = "📚 Kitoblar boshqaruvi"
+_LBL_STATS: Final[str] = f"{AdminEmoji.STATS} Statistika"
+_LBL_SEARCH: Final[str] = f"{AdminEmoji.SEARCH} Qidirish"
+_LBL_TRASH: Final[str] = f"{AdminEmoji.TRASH} O'chirilganlar"
+_LBL_HOME: Final[str] = f"{AdminEmoji.HOME} Bosh menyu"
+_LBL_ADD_CATEGORY: Final[str] = f"{AdminEmoji.ADD} Kategoriya"
+_LBL_LIST: Final[str] = f"{AdminEmoji.LIST} Ro'yxat"
+_LBL_EDIT: Final[str] = f"{AdminEmoji.EDIT} Tahrirlash"
+_LBL_DELETE: Final[str] = f"{AdminEmoji.DELETE} O'chirish"
+_LBL_BACK_ADMIN: Final[str] = f"{AdminEmoji.BACK} Admin menyu"
+_LBL_UPLOAD: Final[str] = f"{AdminEmoji.UPLOAD} Kitob yuklash"
+_LBL_BULK: Final[str] = f"{AdminEmoji.BULK} Bulk yuklash"
+_LBL_BOOK_LIST: Final[str] = f"{AdminEmoji.LIST} Kitoblar"
+_LBL_CANCEL: Final[str] = f"{AdminEmoji.CANCEL} Bekor"
+_LBL_SKIP: Final[str] = f"{AdminEmoji.SKIP} O'tkazish"
+_LBL_DONE: Final[str] = f"{AdminEmoji.DONE} Tugatish"
+_LBL_YES: Final[str] = f"{AdminEmoji.YES} Ha"
+_LBL_NO: Final[str] = f"{AdminEmoji.NO} Yo'q"
+_LBL_BACK: Final[str] = f"{AdminEmoji.BACK} Orqaga"
+_LBL_BACK_CATEGORIES: Final[str] = f"{AdminEmoji.BACK} Kategoriyalar"
+_LBL_DIRECT: Final[str] = f"{AdminEmoji.FOLDER} Shu kategoriyaga"
+_LBL_ROOT: Final[str] = f"{AdminEmoji.FOLDER} Asosiy kategoriya"
+_LBL_ROOT_FULL: Final[str] = f"{AdminEmoji.FOLDER} Asosiy kategoriya (root)"
+_LBL_PREV: Final[str] = AdminEmoji.PREV
+_LBL_NEXT: Final[str] = AdminEmoji.NEXT
+_LBL_RESTORE: Final[str] = f"{AdminEmoji.RESTORE} Qayta tiklash"
+_LBL_HARD_DELETE: Final[str] = f"{AdminEmoji.DELETE} Butunlay o'chirish"
+_LBL_EDIT_SHORT: Final[str] = f"{AdminEmoji.EDIT} Tahrir"
+_LBL_VIEW: Final[str] = f"{AdminEmoji.VIEW} Ko'rish"
+_LBL_CATEGORY: Final[str] = f"{AdminEmoji.FOLDER} Kategoriya"
+_LBL_REPLACE_FILE: Final[str] = f"{AdminEmoji.UPLOAD} Faylni almashtirish"
+_LBL_PARENT: Final[str] = f"{AdminEmoji.FOLDER} Parent"
+_LBL_VIEW_BOOKS: Final[str] = f"{AdminEmoji.BOOKS} Kitoblarni ko'rish"
+_LBL_PURGE: Final[str] = f"{AdminEmoji.WARNING} Hammasini tozalash"
+_LBL_UPLOAD_MORE: Final[str] = f"{AdminEmoji.UPLOAD} Yana yuklash"
+_LBL_STATS_BOOKS: Final[str] = f"{AdminEmoji.BOOK} Kitoblar"
+_LBL_STATS_CATEGORIES: Final[str] = f"{AdminEmoji.FOLDER} Kategoriyalar"
+_LBL_STATS_DOWNLOADS: Final[str] = f"{AdminEmoji.DOWNLOAD} Yuklab olishlar"
+
+
+# =================== CALLBACK CONSTANTS ===================
+# Tez-tez ishlatiladigan callbacklar intern qilinadi: barcha markuplarda bitta obyekt
+
+_CB_EMPTY = sys.intern("adm_empty")
+_CB_PAGE_INFO = sys.intern("adm_page_info")
+_CB_BACK_MAIN = sys.intern("adm_back:main")
+_CB_BACK_BOOKS = sys.intern("adm_back:books")
+_CB_BACK_CATEGORIES = sys.intern("adm_back:categories")
+_CB_BACK_CAT_LIST = sys.intern("adm_back:cat_list")
+_CB_PARENT_ROOT = sys.intern("adm_parent:0")
+_CB_PURGE_ALL = sys.intern("adm_purge_all")
+_CB_DELETED_BOOKS = sys.intern("adm_deleted:books")
+_CB_DELETED_CATEGORIES = sys.intern("adm_deleted:categories")
+_CB_BULK_STATUS = sys.intern("adm_bulk_status")
+_CB_STATS_BOOKS = sys.intern("adm_stats:books")
+_CB_STATS_CATEGORIES = sys.intern("adm_stats:categories")
+_CB_STATS_DOWNLOADS = sys.intern("adm_stats:downloads")
+_CB_STATS_REFRESH = sys.intern("adm_stats:refresh")
+
+
+# =================== STATIC BUTTONS ===================
+# Matni va callbacki o'zgarmas tugmalar bir marta yaratilib, barcha klaviaturalarda qayta ishlatiladi
+
+_BTN_BACK_CATEGORIES = InlineKeyboardButton(_LBL_BACK_CATEGORIES, callback_data=_CB_BACK_CATEGORIES)
+_BTN_ROOT = InlineKeyboardButton(_LBL_ROOT_FULL, callback_data=_CB_PARENT_ROOT)
+_BTN_BACK_BOOKS = InlineKeyboardButton(_LBL_BACK, callback_data=_CB_BACK_BOOKS)
+_BTN_BACK_CAT_LIST = InlineKeyboardButton(_LBL_BACK, callback_data=_CB_BACK_CAT_LIST)
+_BTN_BACK_TO_CATEGORIES = InlineKeyboardButton(_LBL_BACK, callback_data=_CB_BACK_CATEGORIES)
+_BTN_PURGE_ALL = InlineKeyboardButton(_LBL_PURGE, callback_data=_CB_PURGE_ALL)
+_BTN_BACK_MAIN = InlineKeyboardButton(_LBL_BACK_ADMIN, callback_data=_CB_BACK_MAIN)
+_BTN_STATS_BOOKS = InlineKeyboardButton(_LBL_STATS_BOOKS, callback_data=_CB_STATS_BOOKS)
+_BTN_STATS_CATEGORIES = InlineKeyboardButton(_LBL_STATS_CATEGORIES, callback_data=_CB_STATS_CATEGORIES)
+_BTN_STATS_DOWNLOADS = InlineKeyboardButton(_LBL_STATS_DOWNLOADS, callback_data=_CB_STATS_DOWNLOADS)
+_BTN_STATS_REFRESH = InlineKeyboardButton("🔄 Yangilash", callback_data=_CB_STATS_REFRESH)
+
+
 # =================== HELPER FUNCTIONS ===================
+# Bir xil nom va callbacklar har bir klaviaturada takrorlanadi, shuning uchun keshlanadi
+
+_ELLIPSIS = "..."
 
-def truncate_text(text: str, max_length: int = 30, suffix: str = "...") -> str:
+
+@lru_cache(maxsize=4096)
+def truncate_text(text: str, max_length: int = 30, suffix: str = _ELLIPSIS) -> str:
     """Matnni qisqartirish"""
     if not text:
         return ""
-    if len(text) <= max_length:
+    # Qisqa nomlar (eng ko'p holat) uchun bo'sh kesma tekshiruvi yetarli
+    if not text[max_length:]:
         return text
     return text[:max_length - len(suffix)] + suffix
 
 
+@lru_cache(maxsize=4096)
 def safe_callback(callback: str) -> str:
     """Callback data xavfsizligini tekshirish"""
-    if len(callback.encode('utf-8')) > MAX_CALLBACK_LENGTH:
-        raise ValueError(f"Callback too long: {len(callback.encode('utf-8'))} bytes")
+    # ASCII callbacklarda belgilar soni = baytlar soni, encode shart emas
+    size = len(callback) if callback.isascii() else len(callback.encode('utf-8'))
+    if size > MAX_CALLBACK_LENGTH:
+        raise ValueError(f"Callback too long: {size} bytes")
     return callback
 
 
+# FileType str enum: a'zolari o'z qiymati bilan bir xil hash/teng, shuning uchun
+# lug'at ham FileType.PDF, ham "pdf" bo'yicha ishlaydi
+_BOOK_EMOJI_BY_TYPE = {"pdf": AdminEmoji.BOOK_PDF}
+
+
 def get_book_emoji(file_type) -> str:
     """Kitob turi uchun emoji"""
-    file_type_str = file_type.value if hasattr(file_type, 'value') else str(file_type)
-    return AdminEmoji.BOOK_PDF if file_type_str == "pdf" else AdminEmoji.BOOK_AUDIO
+    return _BOOK_EMOJI_BY_TYPE.get(file_type, AdminEmoji.BOOK_AUDIO)
 
 
 def build_grid_keyboard(
@@ -108,111 +205,150 @@ def build_grid_keyboard(
         footer_buttons: List[InlineKeyboardButton] = None
 ) -> InlineKeyboardMarkup:
     """Grid shaklidagi keyboard yaratish"""
-    keyboard = InlineKeyboardMarkup(row_width=row_width)
-
-    for i in range(0, len(buttons), row_width):
-        row = buttons[i:i + row_width]
-        keyboard.row(*row)
-
+    # Qatorlar bitta ro'yxat sifatida yig'iladi va markupga bir marta beriladi;
+    # bitta iteratorni row_width marta zip qilish to'liq qatorlarni guruhlaydi,
+    # to'lmagan oxirgi qator esa bitta kesma bilan qo'shiladi (None filtrlash yo'q)
+    rows = [list(chunk) for chunk in zip(*[iter(buttons)] * row_width)]
+    tail = len(buttons) % row_width
+    if tail:
+        rows.append(buttons[-tail:])
     if footer_buttons:
-        for btn in footer_buttons:
-            keyboard.row(btn)
+        rows.extend([btn] for btn in footer_buttons)
+    return InlineKeyboardMarkup(row_width=row_width, inline_keyboard=rows)
 
-    return keyboard
+
+@lru_cache(maxsize=32)
+def _empty_state_kb(
+        text: str,
+        back_text: Optional[str] = None,
+        back_callback: Optional[str] = None
+) -> InlineKeyboardMarkup:
+    """Bo'sh holat keyboard (har bir matn/callback uchun bir marta quriladi)"""
+    rows = [[InlineKeyboardButton(text, callback_data=_CB_EMPTY)]]
+    if back_callback:
+        rows.append([InlineKeyboardButton(back_text, callback_data=back_callback)])
+    return InlineKeyboardMarkup(inline_keyboard=rows)
 
 
 # =================== REPLY KEYBOARDS ===================
+# Reply keyboardlar o'zgarmaydi: har biri deklarativ spetsifikatsiyadan
+# (qatorlar x tugma matnlari) bir marta quriladi va qayta ishlatiladi
+
+_MAIN_MENU_SPEC = (
+    (_LBL_CATEGORIES_MENU, _LBL_BOOKS_MENU),
+    (_LBL_STATS, _LBL_SEARCH),
+    (_LBL_TRASH, _LBL_HOME),
+)
+_CATEGORY_MENU_SPEC = (
+    (_LBL_ADD_CATEGORY, _LBL_LIST),
+    (_LBL_EDIT, _LBL_DELETE),
+    (_LBL_BACK_ADMIN,),
+)
+_BOOK_MENU_SPEC = (
+    (_LBL_UPLOAD, _LBL_BULK),
+    (_LBL_BOOK_LIST, _LBL_DELETE),
+    (_LBL_BACK_ADMIN,),
+)
+_CANCEL_SPEC = ((_LBL_CANCEL,),)
+_SKIP_SPEC = ((_LBL_SKIP, _LBL_CANCEL),)
+_DONE_SPEC = ((_LBL_DONE, _LBL_CANCEL),)
+_CONFIRM_REPLY_SPEC = ((_LBL_YES, _LBL_NO),)
+
+
+def _reply_kb(spec: tuple, row_width: int = 2) -> ReplyKeyboardMarkup:
+    """Spetsifikatsiyadan reply keyboard yaratish"""
+    return ReplyKeyboardMarkup(
+        keyboard=[[KeyboardButton(text) for text in row] for row in spec],
+        resize_keyboard=True,
+        row_width=row_width
+    )
+
 
+@lru_cache(maxsize=None)
 def admin_main_menu() -> ReplyKeyboardMarkup:
     """Admin asosiy menyu"""
-    keyboard = ReplyKeyboardMarkup(resize_keyboard=True, row_width=2)
-    keyboard.add(
-        KeyboardButton(f"🗂 Kategoriyalar boshqaruvi"),
-        KeyboardButton(f"📚 Kitoblar boshqaruvi")
-    )
-    keyboard.add(
-        KeyboardButton(f"{AdminEmoji.STATS} Statistika"),
-        KeyboardButton(f"{AdminEmoji.SEARCH} Qidirish")
-    )
-    keyboard.add(
-        KeyboardButton(f"{AdminEmoji.TRASH} O'chirilganlar"),
-        KeyboardButton(f"{AdminEmoji.HOME} Bosh menyu")
-    )
-    return keyboard
+    return _reply_kb(_MAIN_MENU_SPEC)
 
 
+@lru_cache(maxsize=None)
 def admin_category_menu() -> ReplyKeyboardMarkup:
     """Kategoriyalar menyusi"""
-    keyboard = ReplyKeyboardMarkup(resize_keyboard=True, row_width=2)
-    keyboard.add(
-        KeyboardButton(f"{AdminEmoji.ADD} Kategoriya"),
-        KeyboardButton(f"{AdminEmoji.LIST} Ro'yxat")
-    )
-    keyboard.add(
-        KeyboardButton(f"{AdminEmoji.EDIT} Tahrirlash"),
-        KeyboardButton(f"{AdminEmoji.DELETE} O'chirish")
-    )
-    keyboard.add(KeyboardButton(f"{AdminEmoji.BACK} Admin menyu"))
-    return keyboard
+    return _reply_kb(_CATEGORY_MENU_SPEC)
 
 
+@lru_cache(maxsize=None)
 def admin_book_menu() -> ReplyKeyboardMarkup:
     """Kitoblar menyusi"""
-    keyboard = ReplyKeyboardMarkup(resize_keyboard=True, row_width=2)
-    keyboard.add(
-        KeyboardButton(f"{AdminEmoji.UPLOAD} Kitob yuklash"),
-        KeyboardButton(f"{AdminEmoji.BULK} Bulk yuklash")
-    )
-    keyboard.add(
-        KeyboardButton(f"{AdminEmoji.LIST} Kitoblar"),
-        KeyboardButton(f"{AdminEmoji.DELETE} O'chirish")
-    )
-    keyboard.add(KeyboardButton(f"{AdminEmoji.BACK} Admin menyu"))
-    return keyboard
+    return _reply_kb(_BOOK_MENU_SPEC)
 
 
+@lru_cache(maxsize=None)
 def admin_cancel_btn() -> ReplyKeyboardMarkup:
     """Bekor qilish"""
-    keyboard = ReplyKeyboardMarkup(resize_keyboard=True)
-    keyboard.add(KeyboardButton(f"{AdminEmoji.CANCEL} Bekor"))
-    return keyboard
+    return _reply_kb(_CANCEL_SPEC, row_width=3)
 
 
+@lru_cache(maxsize=None)
 def admin_skip_btn() -> ReplyKeyboardMarkup:
     """O'tkazib yuborish + Bekor"""
-    keyboard = ReplyKeyboardMarkup(resize_keyboard=True, row_width=2)
-    keyboard.add(
-        KeyboardButton(f"{AdminEmoji.SKIP} O'tkazish"),
-        KeyboardButton(f"{AdminEmoji.CANCEL} Bekor")
-    )
-    return keyboard
+    return _reply_kb(_SKIP_SPEC)
 
 
+@lru_cache(maxsize=None)
 def admin_done_btn() -> ReplyKeyboardMarkup:
     """Tugatish + Bekor"""
-    keyboard = ReplyKeyboardMarkup(resize_keyboard=True, row_width=2)
-    keyboard.add(
-        KeyboardButton(f"{AdminEmoji.DONE} Tugatish"),
-        KeyboardButton(f"{AdminEmoji.CANCEL} Bekor")
-    )
-    return keyboard
+    return _reply_kb(_DONE_SPEC)
 
 
+@lru_cache(maxsize=None)
 def admin_confirm_reply_btn() -> ReplyKeyboardMarkup:
     """Tasdiqlash reply keyboard"""
-    keyboard = ReplyKeyboardMarkup(resize_keyboard=True, row_width=2)
-    keyboard.add(
-        KeyboardButton(f"{AdminEmoji.YES} Ha"),
-        KeyboardButton(f"{AdminEmoji.NO} Yo'q")
-    )
-    return keyboard
+    return _reply_kb(_CONFIRM_REPLY_SPEC)
 
 
+@lru_cache(maxsize=16)
 def admin_back_btn(text: str = "Admin menyu") -> ReplyKeyboardMarkup:
     """Orqaga tugmasi"""
-    keyboard = ReplyKeyboardMarkup(resize_keyboard=True)
-    keyboard.add(KeyboardButton(f"{AdminEmoji.BACK} {text}"))
-    return keyboard
+    return _reply_kb(((f"{AdminEmoji.BACK} {text}",),), row_width=3)
+
+
+# Statik menyularning tayyor JSON ko'rinishi: reply_markup=str bo'lsa aiogram
+# uni qayta serializatsiya qilmaydi, shuning uchun har yuborishda json.dumps yo'q
+
+@lru_cache(maxsize=None)
+def admin_main_menu_json() -> str:
+    """admin_main_menu() JSON"""
+    return admin_main_menu().as_json()
+
+
+@lru_cache(maxsize=None)
+def admin_category_menu_json() -> str:
+    """admin_category_menu() JSON"""
+    return admin_category_menu().as_json()
+
+
+@lru_cache(maxsize=None)
+def admin_book_menu_json() -> str:
+    """admin_book_menu() JSON"""
+    return admin_book_menu().as_json()
+
+
+@lru_cache(maxsize=None)
+def admin_cancel_btn_json() -> str:
+    """admin_cancel_btn() JSON"""
+    return admin_cancel_btn().as_json()
+
+
+@lru_cache(maxsize=None)
+def admin_skip_btn_json() -> str:
+    """admin_skip_btn() JSON"""
+    return admin_skip_btn().as_json()
+
+
+@lru_cache(maxsize=None)
+def admin_done_btn_json() -> str:
+    """admin_done_btn() JSON"""
+    return admin_done_btn().as_json()
 
 
 # =================== INLINE KEYBOARDS ===================
@@ -234,41 +370,26 @@ def adm_categories_kb(
     """
     # Bo'sh holat
     if not categories:
-        keyboard = InlineKeyboardMarkup()
-        keyboard.add(
-            InlineKeyboardButton(
-                "📭 Kategoriyalar mavjud emas",
-                callback_data="adm_empty"
-            )
-        )
-        if back_callback:
-            keyboard.add(
-                InlineKeyboardButton(
-                    f"{AdminEmoji.BACK} Orqaga",
-                    callback_data=back_callback
-                )
-            )
-        return keyboard
+        return _empty_state_kb("📭 Kategoriyalar mavjud emas", _LBL_BACK, back_callback)
 
     buttons = []
+    cb_prefix = prefix + ":"
+    folder = AdminEmoji.FOLDER  # siklda lokal o'zgaruvchi tezroq o'qiladi
+    button = InlineKeyboardButton  # lokal nom: siklda global lug'atdan qidirilmaydi
     for cat in categories:
         # Dataclass dan olish
         cat_id = cat.id
         cat_name = cat.name
-        book_count = getattr(cat, 'book_count', 0)
+        book_count = cat.book_count
 
-        # Text
-        if show_book_count and book_count > 0:
-            text = f"{AdminEmoji.FOLDER} {cat_name} ({book_count})"
-        else:
-            text = f"{AdminEmoji.FOLDER} {cat_name}"
-
-        text = truncate_text(text, 28)
+        # Text (son faqat kerak bo'lsa qo'shiladi, bitta format bilan)
+        suffix = f" ({book_count})" if show_book_count and book_count > 0 else ""
+        text = truncate_text(f"{folder} {cat_name}{suffix}", 28)
 
         buttons.append(
-            InlineKeyboardButton(
+            button(
                 text,
-                callback_data=safe_callback(f"{prefix}:{cat_id}")
+                callback_data=safe_callback(cb_prefix + str(cat_id))
             )
         )
 
@@ -277,7 +398,7 @@ def adm_categories_kb(
     if back_callback:
         footer.append(
             InlineKeyboardButton(
-                f"{AdminEmoji.BACK} Orqaga",
+                _LBL_BACK,
                 callback_data=back_callback
             )
         )
@@ -300,50 +421,41 @@ def adm_subcategories_kb(
         prefix: Callback prefix
         allow_direct: Asosiy kategoriyaga qo'shish imkoniyati
     """
-    keyboard = InlineKeyboardMarkup(row_width=2)
-
     # Subkategoriyalar
     buttons = []
+    cb_prefix = prefix + ":"
+    folder_open = AdminEmoji.FOLDER_OPEN
+    button = InlineKeyboardButton
     for sub in subcategories:
         sub_id = sub.id
         sub_name = sub.name
-        book_count = getattr(sub, 'book_count', 0)
+        book_count = sub.book_count
 
-        text = f"{AdminEmoji.FOLDER_OPEN} {sub_name}"
-        if book_count > 0:
-            text += f" ({book_count})"
-        text = truncate_text(text, 28)
+        suffix = f" ({book_count})" if book_count > 0 else ""
+        text = truncate_text(f"{folder_open} {sub_name}{suffix}", 28)
 
         buttons.append(
-            InlineKeyboardButton(
+            button(
                 text,
-                callback_data=safe_callback(f"{prefix}:{sub_id}")
+                callback_data=safe_callback(cb_prefix + str(sub_id))
             )
         )
 
-    # Grid
-    for i in range(0, len(buttons), 2):
-        row = buttons[i:i + 2]
-        keyboard.row(*row)
+    footer = []
 
     # Asosiy kategoriyaga to'g'ridan-to'g'ri qo'shish
     if allow_direct:
-        keyboard.add(
+        footer.append(
             InlineKeyboardButton(
-                f"{AdminEmoji.FOLDER} Shu kategoriyaga",
+                _LBL_DIRECT,
                 callback_data=safe_callback(f"{prefix}_direct:{parent_id}")
             )
         )
 
     # Orqaga
-    keyboard.add(
-        InlineKeyboardButton(
-            f"{AdminEmoji.BACK} Kategoriyalar",
-            callback_data="adm_back:categories"
-        )
-    )
+    footer.append(_BTN_BACK_CATEGORIES)
 
-    return keyboard
+    return build_grid_keyboard(buttons, row_width=2, footer_buttons=footer)
 
 
 def adm_parent_select_kb(
@@ -359,53 +471,29 @@ def adm_parent_select_kb(
         allow_root: Asosiy (root) kategoriya bo'lishi mumkinmi
         current_parent_id: Hozirgi parent (exclude qilish uchun)
     """
-    keyboard = InlineKeyboardMarkup(row_width=2)
-
     if not categories:
-        keyboard.add(
-            InlineKeyboardButton(
-                "📭 Kategoriyalar yo'q",
-                callback_data="adm_empty"
-            )
-        )
-        if allow_root:
-            keyboard.add(
-                InlineKeyboardButton(
-                    f"{AdminEmoji.FOLDER} Asosiy kategoriya",
-                    callback_data="adm_parent:0"
-                )
-            )
-        return keyboard
+        return _empty_state_kb("📭 Kategoriyalar yo'q", _LBL_ROOT, _CB_PARENT_ROOT if allow_root else None)
+
+    # O'zini exclude qilish (faqat kerak bo'lganda, sikl ichida tekshiruvsiz)
+    if current_parent_id:
+        categories = [cat for cat in categories if cat.id != current_parent_id]
 
     buttons = []
+    folder = AdminEmoji.FOLDER
+    button = InlineKeyboardButton
     for cat in categories:
-        # O'zini exclude qilish
-        if current_parent_id and cat.id == current_parent_id:
-            continue
-
-        text = truncate_text(f"{AdminEmoji.FOLDER} {cat.name}", 28)
+        text = truncate_text(f"{folder} {cat.name}", 28)
         buttons.append(
-            InlineKeyboardButton(
+            button(
                 text,
-                callback_data=safe_callback(f"adm_parent:{cat.id}")
+                callback_data=safe_callback("adm_parent:" + str(cat.id))
             )
         )
 
-    # Grid
-    for i in range(0, len(buttons), 2):
-        row = buttons[i:i + 2]
-        keyboard.row(*row)
-
     # Asosiy kategoriya
-    if allow_root:
-        keyboard.add(
-            InlineKeyboardButton(
-                f"{AdminEmoji.FOLDER} Asosiy kategoriya (root)",
-                callback_data="adm_parent:0"
-            )
-        )
+    footer = [_BTN_ROOT] if allow_root else None
 
-    return keyboard
+    return build_grid_keyboard(buttons, row_width=2, footer_buttons=footer)
 
 
 def adm_books_kb(
@@ -413,7 +501,7 @@ def adm_books_kb(
         prefix: str = "adm_book",
         page: int = 1,
         total_pages: int = 1,
-        back_callback: str = "adm_back:books",
+        back_callback: str = _CB_BACK_BOOKS,
         category_id: Optional[int] = None,
         file_type: Optional[str] = None
 ) -> InlineKeyboardMarkup:
@@ -429,87 +517,79 @@ def adm_books_kb(
         category_id: Kategoriya ID (pagination uchun)
         file_type: Fayl turi (pagination uchun)
     """
-    keyboard = InlineKeyboardMarkup(row_width=1)
-
     # Bo'sh holat
     if not books:
-        keyboard.add(
-            InlineKeyboardButton(
-                "📭 Kitoblar topilmadi",
-                callback_data="adm_empty"
-            )
-        )
-        keyboard.add(
-            InlineKeyboardButton(
-                f"{AdminEmoji.BACK} Orqaga",
-                callback_data=back_callback
-            )
-        )
-        return keyboard
+        return _empty_state_kb("📭 Kitoblar topilmadi", _LBL_BACK, back_callback)
 
     # Kitoblar
+    rows = []
+    cb_prefix = prefix + ":"
+    button = InlineKeyboardButton
+    book_emoji, trunc, safe = get_book_emoji, truncate_text, safe_callback
     for book in books:
-        emoji = get_book_emoji(book.file_type)
-        display_title = truncate_text(book.title, 32)
+        emoji = book_emoji(book.file_type)
+        display_title = trunc(book.title, 32)
 
         # Download count ko'rsatish
         dl_count = book.download_count
-        if dl_count > 0:
-            text = f"{emoji} {display_title} ({dl_count})"
-        else:
-            text = f"{emoji} {display_title}"
+        suffix = f" ({dl_count})" if dl_count > 0 else ""
+        text = f"{emoji} {display_title}{suffix}"
 
-        keyboard.add(
-            InlineKeyboardButton(
+        rows.append([
+            button(
                 text,
-                callback_data=safe_callback(f"{prefix}:{book.id}")
+                callback_data=safe(cb_prefix + str(book.id))
             )
-        )
+        ])
 
     # Pagination
     if total_pages > 1:
         pagination_row = []
+        # Umumiy qism bir marta quriladi, oldingi/keyingi faqat sahifa raqami bilan farq qiladi
+        cb_tail = f":{category_id or 0}:{file_type or 'all'}"
+        page_label = f"· {page}/{total_pages} ·"
 
         if page > 1:
             pagination_row.append(
                 InlineKeyboardButton(
-                    f"{AdminEmoji.PREV}",
-                    callback_data=safe_callback(f"adm_pg:{page - 1}:{category_id or 0}:{file_type or 'all'}")
+                    _LBL_PREV,
+                    callback_data=safe_callback(f"adm_pg:{page - 1}" + cb_tail)
                 )
             )
 
         pagination_row.append(
             InlineKeyboardButton(
-                f"· {page}/{total_pages} ·",
-                callback_data="adm_page_info"
+                page_label,
+                callback_data=_CB_PAGE_INFO
             )
         )
 
         if page < total_pages:
             pagination_row.append(
                 InlineKeyboardButton(
-                    f"{AdminEmoji.NEXT}",
-                    callback_data=safe_callback(f"adm_pg:{page + 1}:{category_id or 0}:{file_type or 'all'}")
+                    _LBL_NEXT,
+                    callback_data=safe_callback(f"adm_pg:{page + 1}" + cb_tail)
                 )
             )
 
-        keyboard.row(*pagination_row)
+        rows.append(pagination_row)
 
     # Orqaga
-    keyboard.add(
+    rows.append([
         InlineKeyboardButton(
-            f"{AdminEmoji.BACK} Orqaga",
+            _LBL_BACK,
             callback_data=back_callback
         )
-    )
+    ])
 
-    return keyboard
+    # Barcha qatorlar markupga bir marta beriladi (add/row chaqiruvlarisiz)
+    return InlineKeyboardMarkup(row_width=1, inline_keyboard=rows)
 
 
 def adm_books_paginated_kb(
         paginated_result: "PaginatedResult",
         prefix: str = "adm_book",
-        back_callback: str = "adm_back:books",
+        back_callback: str = _CB_BACK_BOOKS,
         category_id: Optional[int] = None,
         file_type: Optional[str] = None
 ) -> InlineKeyboardMarkup:
@@ -536,50 +616,45 @@ def adm_book_actions_kb(
         book: Book dataclass
         show_restore: Qayta tiklash tugmasini ko'rsatish (soft deleted uchun)
     """
-    keyboard = InlineKeyboardMarkup(row_width=2)
-    book_id = book.id
+    rows = []
+    book_id = str(book.id)
 
     if show_restore or book.is_deleted:
         # O'chirilgan kitob uchun
-        keyboard.add(
+        rows.append([
             InlineKeyboardButton(
-                f"{AdminEmoji.RESTORE} Qayta tiklash",
-                callback_data=safe_callback(f"adm_restore_book:{book_id}")
+                _LBL_RESTORE,
+                callback_data=safe_callback("adm_restore_book:" + book_id)
             )
-        )
-        keyboard.add(
+        ])
+        rows.append([
             InlineKeyboardButton(
-                f"{AdminEmoji.DELETE} Butunlay o'chirish",
-                callback_data=safe_callback(f"adm_hard_del_book:{book_id}")
+                _LBL_HARD_DELETE,
+                callback_data=safe_callback("adm_hard_del_book:" + book_id)
             )
-        )
+        ])
     else:
         # Oddiy kitob uchun
-        keyboard.add(
+        rows.append([
             InlineKeyboardButton(
-                f"{AdminEmoji.EDIT} Tahrir",
-                callback_data=safe_callback(f"adm_edit_book:{book_id}")
+                _LBL_EDIT_SHORT,
+                callback_data=safe_callback("adm_edit_book:" + book_id)
             ),
             InlineKeyboardButton(
-                f"{AdminEmoji.DELETE} O'chirish",
-                callback_data=safe_callback(f"adm_del_book:{book_id}")
+                _LBL_DELETE,
+                callback_data=safe_callback("adm_del_book:" + book_id)
             )
-        )
-        keyboard.add(
+        ])
+        rows.append([
             InlineKeyboardButton(
-                f"{AdminEmoji.VIEW} Ko'rish",
-                callback_data=safe_callback(f"adm_view_book:{book_id}")
+                _LBL_VIEW,
+                callback_data=safe_callback("adm_view_book:" + book_id)
             )
-        )
+        ])
 
-    keyboard.add(
-        InlineKeyboardButton(
-            f"{AdminEmoji.BACK} Orqaga",
-            callback_data="adm_back:books"
-        )
-    )
+    rows.append([_BTN_BACK_BOOKS])
 
-    return keyboard
+    return InlineKeyboardMarkup(row_width=2, inline_keyboard=rows)
 
 
 def adm_book_edit_kb(book: "Book") -> InlineKeyboardMarkup:
@@ -589,67 +664,66 @@ def adm_book_edit_kb(book: "Book") -> InlineKeyboardMarkup:
     Args:
         book: Book dataclass
     """
-    keyboard = InlineKeyboardMarkup(row_width=2)
-    book_id = book.id
+    rows = []
+    book_id = str(book.id)
 
     # Asosiy maydonlar
-    keyboard.add(
+    rows.append([
         InlineKeyboardButton(
             "📝 Nom",
-            callback_data=safe_callback(f"adm_edit_title:{book_id}")
+            callback_data=safe_callback("adm_edit_title:" + book_id)
         ),
         InlineKeyboardButton(
             "✍️ Muallif",
-            callback_data=safe_callback(f"adm_edit_author:{book_id}")
+            callback_data=safe_callback("adm_edit_author:" + book_id)
         )
-    )
+    ])
 
     # Audio uchun narrator
-    file_type_str = book.file_type.value if hasattr(book.file_type, 'value') else str(book.file_type)
-    if file_type_str == "audio":
-        keyboard.add(
+    if book.file_type_str == "audio":
+        rows.append([
             InlineKeyboardButton(
                 "🎙 Hikoyachi",
-                callback_data=safe_callback(f"adm_edit_narrator:{book_id}")
+                callback_data=safe_callback("adm_edit_narrator:" + book_id)
             ),
             InlineKeyboardButton(
                 "📄 Tavsif",
-                callback_data=safe_callback(f"adm_edit_desc:{book_id}")
+                callback_data=safe_callback("adm_edit_desc:" + book_id)
             )
-        )
+        ])
     else:
-        keyboard.add(
+        rows.append([
             InlineKeyboardButton(
                 "📄 Tavsif",
-                callback_data=safe_callback(f"adm_edit_desc:{book_id}")
+                callback_data=safe_callback("adm_edit_desc:" + book_id)
             )
-        )
+        ])
 
     # Kategoriya
-    keyboard.add(
+    rows.append([
         InlineKeyboardButton(
-            f"{AdminEmoji.FOLDER} Kategoriya",
-            callback_data=safe_callback(f"adm_edit_bookcat:{book_id}")
+            _LBL_CATEGORY,
+            callback_data=safe_callback("adm_edit_bookcat:" + book_id)
         )
-    )
+    ])
 
     # Fayl almashtirish
-    keyboard.add(
+    rows.append([
         InlineKeyboardButton(
-            f"{AdminEmoji.UPLOAD} Faylni almashtirish",
-            callback_data=safe_callback(f"adm_edit_file:{book_id}")
+            _LBL_REPLACE_FILE,
+            callback_data=safe_callback("adm_edit_file:" + book_id)
         )
-    )
+    ])
 
     # Orqaga
-    keyboard.add(
+    rows.append([
         InlineKeyboardButton(
-            f"{AdminEmoji.BACK} Orqaga",
-            callback_data=safe_callback(f"adm_book:{book_id}")
+            _LBL_BACK,
+            callback_data=safe_callback("adm_book:" + book_id)
         )
-    )
+    ])
 
-    return keyboard
+    return InlineKeyboardMarkup(row_width=2, inline_keyboard=rows)
 
 
 def adm_category_edit_kb(category: "Category") -> InlineKeyboardMarkup:
@@ -659,36 +733,31 @@ def adm_category_edit_kb(category: "Category") -> InlineKeyboardMarkup:
     Args:
         category: Category dataclass
     """
-    keyboard = InlineKeyboardMarkup(row_width=2)
-    cat_id = category.id
+    rows = []
+    cat_id = str(category.id)
 
-    keyboard.add(
+    rows.append([
         InlineKeyboardButton(
             "📝 Nom",
-            callback_data=safe_callback(f"adm_cat_name:{cat_id}")
+            callback_data=safe_callback("adm_cat_name:" + cat_id)
         ),
         InlineKeyboardButton(
             "📄 Tavsif",
-            callback_data=safe_callback(f"adm_cat_desc:{cat_id}")
+            callback_data=safe_callback("adm_cat_desc:" + cat_id)
         )
-    )
+    ])
 
     # Parent o'zgartirish (agar subkategoriya bo'lsa)
-    keyboard.add(
+    rows.append([
         InlineKeyboardButton(
-            f"{AdminEmoji.FOLDER} Parent",
-            callback_data=safe_callback(f"adm_cat_parent:{cat_id}")
+            _LBL_PARENT,
+            callback_data=safe_callback("adm_cat_parent:" + cat_id)
         )
-    )
+    ])
 
-    keyboard.add(
-        InlineKeyboardButton(
-            f"{AdminEmoji.BACK} Orqaga",
-            callback_data="adm_back:cat_list"
-        )
-    )
+    rows.append([_BTN_BACK_CAT_LIST])
 
-    return keyboard
+    return InlineKeyboardMarkup(row_width=2, inline_keyboard=rows)
 
 
 def adm_category_actions_kb(
@@ -702,48 +771,43 @@ def adm_category_actions_kb(
         category: Category dataclass
         show_restore: Qayta tiklash ko'rsatish
     """
-    keyboard = InlineKeyboardMarkup(row_width=2)
-    cat_id = category.id
+    rows = []
+    cat_id = str(category.id)
 
     if show_restore or category.is_deleted:
-        keyboard.add(
+        rows.append([
             InlineKeyboardButton(
-                f"{AdminEmoji.RESTORE} Qayta tiklash",
-                callback_data=safe_callback(f"adm_restore_cat:{cat_id}")
+                _LBL_RESTORE,
+                callback_data=safe_callback("adm_restore_cat:" + cat_id)
             )
-        )
-        keyboard.add(
+        ])
+        rows.append([
             InlineKeyboardButton(
-                f"{AdminEmoji.DELETE} Butunlay o'chirish",
-                callback_data=safe_callback(f"adm_hard_del_cat:{cat_id}")
+                _LBL_HARD_DELETE,
+                callback_data=safe_callback("adm_hard_del_cat:" + cat_id)
             )
-        )
+        ])
     else:
-        keyboard.add(
+        rows.append([
             InlineKeyboardButton(
-                f"{AdminEmoji.EDIT} Tahrirlash",
-                callback_data=safe_callback(f"adm_edit_cat:{cat_id}")
+                _LBL_EDIT,
+                callback_data=safe_callback("adm_edit_cat:" + cat_id)
             ),
             InlineKeyboardButton(
-                f"{AdminEmoji.DELETE} O'chirish",
-                callback_data=safe_callback(f"adm_del_cat:{cat_id}")
+                _LBL_DELETE,
+                callback_data=safe_callback("adm_del_cat:" + cat_id)
             )
-        )
-        keyboard.add(
+        ])
+        rows.append([
             InlineKeyboardButton(
-                f"{AdminEmoji.BOOKS} Kitoblarni ko'rish",
-                callback_data=safe_callback(f"adm_cat_books:{cat_id}")
+                _LBL_VIEW_BOOKS,
+                callback_data=safe_callback("adm_cat_books:" + cat_id)
             )
-        )
+        ])
 
-    keyboard.add(
-        InlineKeyboardButton(
-            f"{AdminEmoji.BACK} Orqaga",
-            callback_data="adm_back:categories"
-        )
-    )
+    rows.append([_BTN_BACK_TO_CATEGORIES])
 
-    return keyboard
+    return InlineKeyboardMarkup(row_width=2, inline_keyboard=rows)
 
 
 def adm_confirm_kb(
@@ -761,7 +825,7 @@ def adm_confirm_kb(
         confirm_text: Tasdiqlash tugmasi matni
         cancel_text: Bekor qilish tugmasi matni
     """
-    keyboard = InlineKeyboardMarkup(row_width=2)
+    rows = []
 
     # Callback yasash
     if item_id is not None:
@@ -771,7 +835,7 @@ def adm_confirm_kb(
         confirm_cb = f"adm_yes:{action}"
         cancel_cb = f"adm_no:{action}"
 
-    keyboard.add(
+    rows.append([
         InlineKeyboardButton(
             f"{AdminEmoji.YES} {confirm_text}",
             callback_data=safe_callback(confirm_cb)
@@ -780,9 +844,9 @@ def adm_confirm_kb(
             f"{AdminEmoji.NO} {cancel_text}",
             callback_data=safe_callback(cancel_cb)
         )
-    )
+    ])
 
-    return keyboard
+    return InlineKeyboardMarkup(row_width=2, inline_keyboard=rows)
 
 
 def adm_file_type_kb(
@@ -800,60 +864,43 @@ def adm_file_type_kb(
         audio_count: Audio kitoblar soni
         show_all: "Hammasi" tugmasini ko'rsatish
     """
-    keyboard = InlineKeyboardMarkup(row_width=2)
-
     # Hech narsa yo'q
     if pdf_count == 0 and audio_count == 0:
-        keyboard.add(
-            InlineKeyboardButton(
-                "📭 Bu kategoriyada kitoblar yo'q",
-                callback_data="adm_empty"
-            )
-        )
-        keyboard.add(
-            InlineKeyboardButton(
-                f"{AdminEmoji.BACK} Orqaga",
-                callback_data="adm_back:categories"
-            )
-        )
-        return keyboard
+        return _empty_state_kb("📭 Bu kategoriyada kitoblar yo'q", _LBL_BACK, _CB_BACK_CATEGORIES)
+
+    rows = []
 
     # PDF
     if pdf_count > 0:
-        keyboard.add(
+        rows.append([
             InlineKeyboardButton(
                 f"{AdminEmoji.BOOK_PDF} PDF ({pdf_count})",
                 callback_data=safe_callback(f"adm_type:pdf:{category_id}")
             )
-        )
+        ])
 
     # Audio
     if audio_count > 0:
-        keyboard.add(
+        rows.append([
             InlineKeyboardButton(
                 f"{AdminEmoji.BOOK_AUDIO} Audio ({audio_count})",
                 callback_data=safe_callback(f"adm_type:audio:{category_id}")
             )
-        )
+        ])
 
     # Hammasi
     if show_all and (pdf_count > 0 or audio_count > 0):
         total = pdf_count + audio_count
-        keyboard.add(
+        rows.append([
             InlineKeyboardButton(
                 f"{AdminEmoji.BOOKS} Hammasi ({total})",
                 callback_data=safe_callback(f"adm_type:all:{category_id}")
             )
-        )
+        ])
 
-    keyboard.add(
-        InlineKeyboardButton(
-            f"{AdminEmoji.BACK} Orqaga",
-            callback_data="adm_back:categories"
-        )
-    )
+    rows.append([_BTN_BACK_TO_CATEGORIES])
 
-    return keyboard
+    return InlineKeyboardMarkup(row_width=2, inline_keyboard=rows)
 
 
 def adm_deleted_items_kb(
@@ -867,55 +914,33 @@ def adm_deleted_items_kb(
         books_count: O'chirilgan kitoblar soni
         categories_count: O'chirilgan kategoriyalar soni
     """
-    keyboard = InlineKeyboardMarkup(row_width=1)
-
     if books_count == 0 and categories_count == 0:
-        keyboard.add(
-            InlineKeyboardButton(
-                "✨ O'chirilgan elementlar yo'q",
-                callback_data="adm_empty"
-            )
-        )
-        keyboard.add(
-            InlineKeyboardButton(
-                f"{AdminEmoji.BACK} Admin menyu",
-                callback_data="adm_back:main"
-            )
-        )
-        return keyboard
+        return _empty_state_kb("✨ O'chirilgan elementlar yo'q", _LBL_BACK_ADMIN, _CB_BACK_MAIN)
+
+    rows = []
 
     if books_count > 0:
-        keyboard.add(
+        rows.append([
             InlineKeyboardButton(
                 f"{AdminEmoji.BOOK} O'chirilgan kitoblar ({books_count})",
-                callback_data="adm_deleted:books"
+                callback_data=_CB_DELETED_BOOKS
             )
-        )
+        ])
 
     if categories_count > 0:
-        keyboard.add(
+        rows.append([
             InlineKeyboardButton(
                 f"{AdminEmoji.FOLDER} O'chirilgan kategoriyalar ({categories_count})",
-                callback_data="adm_deleted:categories"
+                callback_data=_CB_DELETED_CATEGORIES
             )
-        )
+        ])
 
     # Hammasini tozalash
-    keyboard.add(
-        InlineKeyboardButton(
-            f"{AdminEmoji.WARNING} Hammasini tozalash",
-            callback_data="adm_purge_all"
-        )
-    )
+    rows.append([_BTN_PURGE_ALL])
 
-    keyboard.add(
-        InlineKeyboardButton(
-            f"{AdminEmoji.BACK} Admin menyu",
-            callback_data="adm_back:main"
-        )
-    )
+    rows.append([_BTN_BACK_MAIN])
 
-    return keyboard
+    return InlineKeyboardMarkup(row_width=1, inline_keyboard=rows)
 
 
 def adm_bulk_upload_kb(
@@ -931,107 +956,101 @@ def adm_bulk_upload_kb(
         uploaded_count: Yuklangan kitoblar soni
         failed_count: Xato bo'lganlar soni
     """
-    keyboard = InlineKeyboardMarkup(row_width=1)
+    rows = []
 
     # Status
     if uploaded_count > 0:
-        keyboard.add(
+        rows.append([
             InlineKeyboardButton(
                 f"{AdminEmoji.DONE} {uploaded_count} ta yuklandi" +
                 (f", {failed_count} ta xato" if failed_count else ""),
-                callback_data="adm_bulk_status"
+                callback_data=_CB_BULK_STATUS
             )
-        )
+        ])
 
     # Davom ettirish
-    keyboard.add(
+    rows.append([
         InlineKeyboardButton(
-            f"{AdminEmoji.UPLOAD} Yana yuklash",
+            _LBL_UPLOAD_MORE,
             callback_data=safe_callback(f"adm_bulk_more:{category_id}")
         )
-    )
+    ])
 
     # Tugatish
-    keyboard.add(
+    rows.append([
         InlineKeyboardButton(
-            f"{AdminEmoji.DONE} Tugatish",
+            _LBL_DONE,
             callback_data=safe_callback(f"adm_bulk_done:{category_id}")
         )
-    )
+    ])
+
+    return InlineKeyboardMarkup(row_width=1, inline_keyboard=rows)
 
-    return keyboard
+
+# Statistika keyboard to'liq statik: import paytida bir marta quriladi
+_STATS_KB = InlineKeyboardMarkup(row_width=2, inline_keyboard=[
+    [_BTN_STATS_BOOKS, _BTN_STATS_CATEGORIES],
+    [_BTN_STATS_DOWNLOADS],
+    [_BTN_STATS_REFRESH],
+    [_BTN_BACK_MAIN],
+])
 
 
 def adm_stats_kb() -> InlineKeyboardMarkup:
     """Statistika keyboard"""
-    keyboard = InlineKeyboardMarkup(row_width=2)
+    return _STATS_KB
 
-    keyboard.add(
-        InlineKeyboardButton(
-            f"{AdminEmoji.BOOK} Kitoblar",
-            callback_data="adm_stats:books"
-        ),
-        InlineKeyboardButton(
-            f"{AdminEmoji.FOLDER} Kategoriyalar",
-            callback_data="adm_stats:categories"
-        )
-    )
 
-    keyboard.add(
-        InlineKeyboardButton(
-            f"{AdminEmoji.DOWNLOAD} Yuklab olishlar",
-            callback_data="adm_stats:downloads"
-        )
-    )
+# =================== CALLBACK PARSER ===================
 
-    keyboard.add(
-        InlineKeyboardButton(
-            "🔄 Yangilash",
-            callback_data="adm_stats:refresh"
-        )
-    )
+_ADM_PREFIX = sys.intern("adm_")
 
-    keyboard.add(
-        InlineKeyboardButton(
-            f"{AdminEmoji.BACK} Admin menyu",
-            callback_data="adm_back:main"
-        )
-    )
+# "adm_action:param1:param2..." — action va parametrlar bitta match bilan ajratiladi
+_ADM_CALLBACK_RE = re.compile(r"(?P<raw>(?:adm_)?(?P<action>[^:]*))(?::(?P<params>.*))?", re.DOTALL)
 
-    return keyboard
 
+@dataclass(slots=True, frozen=True)
+class ParsedCallback:
+    """Parse qilingan admin callback"""
+    action: str
+    params: Tuple[str, ...]
+    raw_action: str
 
-# =================== CALLBACK PARSER ===================
 
 class AdminCallbackParser:
     """Admin callback datani parse qilish"""
 
     @staticmethod
-    def parse(callback_data: str) -> dict:
+    def parse(callback_data: str) -> ParsedCallback:
         """
         Callback datani parse qilish
 
         Format: "adm_action:param1:param2"
-        Returns: {"action": str, "params": list}
+        Returns: ParsedCallback(action, params, raw_action)
         """
-        parts = callback_data.split(":")
-        action = parts[0].replace("adm_", "") if parts[0].startswith("adm_") else parts[0]
-        return {
-            "action": action,
-            "params": parts[1:] if len(parts) > 1 else [],
-            "raw_action": parts[0]
-        }
+        match = _ADM_CALLBACK_RE.fullmatch(callback_data)
+        params = match["params"]
+        return ParsedCallback(
+            action=match["action"],
+            params=tuple(params.split(":")) if params is not None else (),
+            raw_action=match["raw"]
+        )
 
     @staticmethod
     def get_action(callback_data: str) -> str:
         """Faqat action olish (adm_ prefix olib tashlanadi)"""
-        parts = callback_data.split(":")
-        action = parts[0] if parts else ""
-        return action.replace("adm_", "") if action.startswith("adm_") else action
+        action = callback_data.partition(":")[0]
+        return action[4:] if action.startswith(_ADM_PREFIX) else action
 
     @staticmethod
     def get_param(callback_data: str, index: int = 0, default: any = None) -> any:
         """Parametr olish"""
+        if index == 0:
+            # Eng ko'p uchraydigan holat: "adm_action:id" — ro'yxat yaratmasdan
+            _, sep, rest = callback_data.partition(":")
+            if not sep:
+                return default
+            return rest.partition(":")[0]
         parts = callback_data.split(":")
         try:
             return parts[index + 1]
@@ -1049,4 +1068,4 @@ class AdminCallbackParser:
     @staticmethod
     def is_admin_callback(callback_data: str) -> bool:
         """Admin callback ekanligini tekshirish"""
-        return callback_data.startswith("adm_")
\ No newline at end of file
+        return callback_data.startswith(_ADM_PREFIX)
\ No newline at end of file
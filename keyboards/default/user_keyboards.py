@@ -14,8 +14,13 @@ from aiogram.types import (
     ReplyKeyboardMarkup, KeyboardButton,
     InlineKeyboardMarkup, InlineKeyboardButton
 )
-from typing import List, Optional, Callable
+from typing import Dict, List, Optional, Callable
 from enum import Enum
+from functools import lru_cache
+import sys
+
+# Umumiy helperlar bitta joyda (admin_keyboards): ikki nusxa bir-biridan ajralib ketmasin
+from keyboards.default.admin_keyboards import safe_callback, build_grid_keyboard
 
 # Type imports (circular import oldini olish uchun TYPE_CHECKING)
 from typing import TYPE_CHECKING
@@ -47,105 +52,185 @@ class Emoji:
     FIRE = "🔥"
 
 
+class MenuText:
+    """Reply tugmalar matnlari (handler filtrlari bilan bir xil, intern qilingan)"""
+    CATEGORIES = sys.intern(f"{Emoji.FOLDER} Kategoriyalar")
+    SEARCH = sys.intern(f"{Emoji.SEARCH} Qidirish")
+    POPULAR = sys.intern(f"{Emoji.FIRE} Mashhurlar")
+    RECENT = sys.intern(f"{Emoji.NEW} Yangilar")
+    STATS = sys.intern(f"{Emoji.STATS} Statistika")
+    HELP = sys.intern(f"{Emoji.HELP} Yordam")
+    BACK = sys.intern(f"{Emoji.BACK} Orqaga")
+    HOME = sys.intern(f"{Emoji.HOME} Bosh menyu")
+    CANCEL = sys.intern(f"{Emoji.CANCEL} Bekor qilish")
+
+
 # Callback data max length (Telegram limit: 64 bytes)
 MAX_CALLBACK_LENGTH = 64
 
+# Tugma matni prefikslari (siklda formatlash o'rniga bitta qo'shish)
+_FOLDER_PREFIX = f"{Emoji.FOLDER} "
+_FOLDER_OPEN_PREFIX = f"{Emoji.FOLDER_OPEN} "
+_NEW_PREFIX = f"{Emoji.NEW} "
+_LBL_SEARCH_TYPE = f"{Emoji.SEARCH} Tur tanlash"
 
-# =================== HELPER FUNCTIONS ===================
+# Mashhur kitoblar reytingidagi medallar (1-3 o'rinlar)
+MEDALS = ("🥇", "🥈", "🥉")
 
-def truncate_text(text: str, max_length: int = 35, suffix: str = "...") -> str:
-    """Matnni qisqartirish"""
-    if len(text) <= max_length:
-        return text
-    return text[:max_length - len(suffix)] + suffix
 
+# =================== CALLBACK CONSTANTS ===================
+# Har bir qatorda takrorlanadigan callbacklar va prefikslar bir marta intern qilinadi
 
-def safe_callback(callback: str) -> str:
-    """Callback data xavfsizligini tekshirish"""
-    if len(callback.encode('utf-8')) > MAX_CALLBACK_LENGTH:
-        raise ValueError(f"Callback data too long: {len(callback.encode('utf-8'))} bytes")
-    return callback
+_CB_EMPTY = sys.intern("u_empty")
+_CB_PAGE_INFO = sys.intern("u_page_info")
+_CB_BACK_CATEGORIES = sys.intern("u_back:categories")
+_CB_BACK_POPULAR = sys.intern("u_back:popular")
+_CB_BACK_MAIN = sys.intern("u_back:main")
+_CB_DL = sys.intern("u_dl:")
+_CB_SUBCAT = sys.intern("u_subcat:")
 
 
-def build_grid_keyboard(
-        buttons: List[InlineKeyboardButton],
-        row_width: int = 2,
-        footer_buttons: List[InlineKeyboardButton] = None
-) -> InlineKeyboardMarkup:
-    """Grid shaklidagi keyboard yaratish (DRY)"""
-    keyboard = InlineKeyboardMarkup(row_width=row_width)
+# =================== STATIC BUTTONS ===================
+# O'zgarmas tugmalar bir marta yaratiladi va barcha klaviaturalarda qayta ishlatiladi
 
-    # Asosiy buttonlarni grid qilib qo'shish
-    for i in range(0, len(buttons), row_width):
-        row = buttons[i:i + row_width]
-        keyboard.row(*row)
+_BACK_TEXT = f"{Emoji.BACK} Orqaga"
 
-    # Footer buttonlar (orqaga, bekor qilish, etc.)
-    if footer_buttons:
-        for btn in footer_buttons:
-            keyboard.row(btn)
+_BTN_BACK_CATEGORIES = InlineKeyboardButton(f"{Emoji.BACK} Kategoriyalar", callback_data=_CB_BACK_CATEGORIES)
+_BTN_BACK_TO_CATEGORIES = InlineKeyboardButton(_BACK_TEXT, callback_data=_CB_BACK_CATEGORIES)
+_BTN_BACK_POPULAR = InlineKeyboardButton(_BACK_TEXT, callback_data=_CB_BACK_POPULAR)
+_BTN_HOME = InlineKeyboardButton(f"{Emoji.HOME} Bosh menyu", callback_data=_CB_BACK_MAIN)
 
-    return keyboard
+# Bo'sh holat tugmalari
+_BTN_NO_CATEGORIES = InlineKeyboardButton("📭 Kategoriyalar mavjud emas", callback_data=_CB_EMPTY)
+_BTN_NO_SUBCATEGORIES = InlineKeyboardButton("📭 Subkategoriyalar mavjud emas", callback_data=_CB_EMPTY)
+_BTN_NO_BOOKS_IN_CATEGORY = InlineKeyboardButton("📭 Bu kategoriyada kitoblar yo'q", callback_data=_CB_EMPTY)
+_BTN_BOOKS_NOT_FOUND = InlineKeyboardButton("📭 Kitoblar topilmadi", callback_data=_CB_EMPTY)
+_BTN_NOTHING_FOUND = InlineKeyboardButton("😔 Hech narsa topilmadi", callback_data=_CB_EMPTY)
+_BTN_NO_POPULAR = InlineKeyboardButton("📭 Mashhur kitoblar yo'q", callback_data=_CB_EMPTY)
+_BTN_NO_BOOKS = InlineKeyboardButton("📭 Kitoblar yo'q", callback_data=_CB_EMPTY)
+_BTN_NO_RECENT = InlineKeyboardButton("📭 Yangi kitoblar yo'q", callback_data=_CB_EMPTY)
+
+
+@lru_cache(maxsize=256)
+def _back_btn(back_callback: str) -> InlineKeyboardButton:
+    """Orqaga tugmasi (har bir callback uchun bitta obyekt)"""
+    return InlineKeyboardButton(_BACK_TEXT, callback_data=back_callback)
+
+
+# Bo'sh holat keyboardlari: tarkibi o'zgarmas, shuning uchun har chaqiruvda
+# yangi markup yaratilmaydi (mutatsiya qilmang)
+_KB_NO_CATEGORIES = InlineKeyboardMarkup(inline_keyboard=[[_BTN_NO_CATEGORIES]])
+_KB_NO_SUBCATEGORIES = InlineKeyboardMarkup(
+    inline_keyboard=[[_BTN_NO_SUBCATEGORIES], [_BTN_BACK_TO_CATEGORIES]]
+)
+_KB_NOTHING_FOUND = InlineKeyboardMarkup(row_width=1, inline_keyboard=[[_BTN_NOTHING_FOUND]])
+_KB_NO_POPULAR = InlineKeyboardMarkup(row_width=1, inline_keyboard=[[_BTN_NO_POPULAR]])
+_KB_NO_POPULAR_BOOKS = InlineKeyboardMarkup(
+    row_width=1, inline_keyboard=[[_BTN_NO_BOOKS], [_BTN_BACK_POPULAR]]
+)
+_KB_NO_RECENT = InlineKeyboardMarkup(row_width=1, inline_keyboard=[[_BTN_NO_RECENT]])
+
+
+# =================== HELPER FUNCTIONS ===================
+
+@lru_cache(maxsize=4096)
+def truncate_text(text: str, max_length: int = 35, suffix: str = "...") -> str:
+    """Matnni qisqartirish (bir xil nomlar sahifalashda qayta-qayta keladi, shuning uchun keshlanadi)"""
+    # Qisqa nomlar (eng ko'p holat) uchun bo'sh kesma tekshiruvi yetarli
+    if not text[max_length:]:
+        return text
+    return text[:max_length - len(suffix)] + suffix
+
+
+# String yoki FileType enum bo'lishi mumkin: FileType str enum bo'lgani uchun
+# ikkalasi ham bir xil kalit bilan topiladi
+_BOOK_EMOJI_BY_TYPE = {"pdf": Emoji.BOOK_PDF, "audio": Emoji.BOOK_AUDIO}
 
 
 def get_book_emoji(file_type) -> str:
     """Kitob turi uchun emoji"""
-    # String yoki FileType enum bo'lishi mumkin
-    file_type_str = file_type.value if hasattr(file_type, 'value') else str(file_type)
-    return Emoji.BOOK_PDF if file_type_str == "pdf" else Emoji.BOOK_AUDIO
+    return _BOOK_EMOJI_BY_TYPE.get(file_type, Emoji.BOOK_AUDIO)
+
+
+def rank_label(position: int) -> str:
+    """Reytingdagi o'rin belgisi: 1-3 uchun medal, qolganlari uchun raqam"""
+    return MEDALS[position - 1] if position <= 3 else f"{position}."
 
 
 # =================== REPLY KEYBOARDS ===================
+# Reply keyboardlar o'zgarmas: bir marta quriladi va qayta ishlatiladi (mutatsiya qilmang)
 
+@lru_cache(maxsize=None)
 def user_main_menu() -> ReplyKeyboardMarkup:
     """User asosiy menyu"""
     keyboard = ReplyKeyboardMarkup(resize_keyboard=True, row_width=2)
     keyboard.add(
-        KeyboardButton(f"{Emoji.FOLDER} Kategoriyalar"),
-        KeyboardButton(f"{Emoji.SEARCH} Qidirish")
+        KeyboardButton(MenuText.CATEGORIES),
+        KeyboardButton(MenuText.SEARCH)
     )
     keyboard.add(
-        KeyboardButton(f"{Emoji.FIRE} Mashhurlar"),
-        KeyboardButton(f"{Emoji.NEW} Yangilar")
+        KeyboardButton(MenuText.POPULAR),
+        KeyboardButton(MenuText.RECENT)
     )
     keyboard.add(
-        KeyboardButton(f"{Emoji.STATS} Statistika"),
-        KeyboardButton(f"{Emoji.HELP} Yordam")
+        KeyboardButton(MenuText.STATS),
+        KeyboardButton(MenuText.HELP)
     )
     return keyboard
 
 
+@lru_cache(maxsize=16)
 def back_button(text: str = "Orqaga") -> ReplyKeyboardMarkup:
     """Orqaga tugmasi"""
     keyboard = ReplyKeyboardMarkup(resize_keyboard=True)
-    keyboard.add(KeyboardButton(f"{Emoji.BACK} {text}"))
+    # Standart matn MenuText bilan bir xil: qayta formatlanmaydi
+    label = MenuText.BACK if text == "Orqaga" else f"{Emoji.BACK} {text}"
+    keyboard.add(KeyboardButton(label))
     return keyboard
 
 
+@lru_cache(maxsize=16)
 def cancel_button(text: str = "Bekor qilish") -> ReplyKeyboardMarkup:
     """Bekor qilish tugmasi"""
     keyboard = ReplyKeyboardMarkup(resize_keyboard=True)
-    keyboard.add(KeyboardButton(f"{Emoji.CANCEL} {text}"))
+    label = MenuText.CANCEL if text == "Bekor qilish" else f"{Emoji.CANCEL} {text}"
+    keyboard.add(KeyboardButton(label))
     return keyboard
 
 
+@lru_cache(maxsize=None)
 def back_and_home() -> ReplyKeyboardMarkup:
     """Orqaga va Bosh menyu"""
     keyboard = ReplyKeyboardMarkup(resize_keyboard=True, row_width=2)
     keyboard.add(
-        KeyboardButton(f"{Emoji.BACK} Orqaga"),
-        KeyboardButton(f"{Emoji.HOME} Bosh menyu")
+        KeyboardButton(MenuText.BACK),
+        KeyboardButton(MenuText.HOME)
     )
     return keyboard
 
 
+# Statik menyularning tayyor JSON ko'rinishi (reply_markup=str qayta serializatsiya qilinmaydi)
+
+@lru_cache(maxsize=None)
+def user_main_menu_json() -> str:
+    """user_main_menu() JSON"""
+    return user_main_menu().as_json()
+
+
+@lru_cache(maxsize=None)
+def cancel_button_json() -> str:
+    """cancel_button() JSON"""
+    return cancel_button().as_json()
+
+
 # =================== INLINE KEYBOARDS ===================
 
 def categories_keyboard(
         categories: List["Category"],
         prefix: str = "u_cat",
         show_book_count: bool = False,
-        back_callback: Optional[str] = None
+        back_callback: Optional[str] = None,
+        book_counts: Optional[Dict[int, int]] = None
 ) -> InlineKeyboardMarkup:
     """
     Kategoriyalar inline keyboard
@@ -155,50 +240,56 @@ def categories_keyboard(
         prefix: Callback prefix (u_cat, u_subcat, etc.)
         show_book_count: Kitoblar sonini ko'rsatish
         back_callback: Orqaga tugmasi callback
+        book_counts: {category_id: soni} (masalan, subkategoriyalar bilan jami);
+            berilmasa cat.book_count ishlatiladi
     """
     # Bo'sh holat
     if not categories:
-        keyboard = InlineKeyboardMarkup()
-        keyboard.add(
-            InlineKeyboardButton(
-                "📭 Kategoriyalar mavjud emas",
-                callback_data="u_empty"
-            )
+        if not back_callback:
+            return _KB_NO_CATEGORIES
+        return InlineKeyboardMarkup(
+            inline_keyboard=[[_BTN_NO_CATEGORIES], [_back_btn(back_callback)]]
         )
-        if back_callback:
-            keyboard.add(
-                InlineKeyboardButton(f"{Emoji.BACK} Orqaga", callback_data=back_callback)
-            )
-        return keyboard
 
-    buttons = []
-    for cat in categories:
-        # Dataclass dan ma'lumotlarni olish
-        cat_id = cat.id
-        cat_name = cat.name
-        book_count = getattr(cat, 'book_count', 0)
+    # Tarkib bir xil bo'lsa (id, nom, son) tayyor keyboard qayta ishlatiladi
+    if book_counts is None:
+        items = tuple((cat.id, cat.name, getattr(cat, 'book_count', 0)) for cat in categories)
+    else:
+        items = tuple((cat.id, cat.name, book_counts.get(cat.id, 0)) for cat in categories)
+    return _categories_markup(items, prefix, show_book_count, back_callback)
+
 
+@lru_cache(maxsize=256)
+def _categories_markup(
+        items: tuple,
+        prefix: str,
+        show_book_count: bool,
+        back_callback: Optional[str]
+) -> InlineKeyboardMarkup:
+    """Kategoriyalar markup: (id, nom, kitoblar soni) kortejlaridan"""
+    buttons = []
+    cb_prefix = sys.intern(prefix + ":")
+    button = InlineKeyboardButton  # lokal nom: siklda global lug'atdan qidirilmaydi
+    for cat_id, cat_name, book_count in items:
         # Button text
         if show_book_count and book_count > 0:
-            text = f"{Emoji.FOLDER} {cat_name} ({book_count})"
+            text = f"{_FOLDER_PREFIX}{cat_name} ({book_count})"
         else:
-            text = f"{Emoji.FOLDER} {cat_name}"
+            text = _FOLDER_PREFIX + cat_name
 
         text = truncate_text(text, 30)
 
         buttons.append(
-            InlineKeyboardButton(
+            button(
                 text,
-                callback_data=safe_callback(f"{prefix}:{cat_id}")
+                callback_data=safe_callback(cb_prefix + str(cat_id))
             )
         )
 
     # Footer
     footer = []
     if back_callback:
-        footer.append(
-            InlineKeyboardButton(f"{Emoji.BACK} Orqaga", callback_data=back_callback)
-        )
+        footer.append(_back_btn(back_callback))
 
     return build_grid_keyboard(buttons, row_width=2, footer_buttons=footer)
 
@@ -218,47 +309,33 @@ def subcategories_keyboard(
     """
     # Bo'sh holat
     if not subcategories:
-        keyboard = InlineKeyboardMarkup()
-        keyboard.add(
-            InlineKeyboardButton(
-                "📭 Subkategoriyalar mavjud emas",
-                callback_data="u_empty"
-            )
-        )
-        keyboard.add(
-            InlineKeyboardButton(
-                f"{Emoji.BACK} Orqaga",
-                callback_data="u_back:categories"
-            )
-        )
-        return keyboard
+        return _KB_NO_SUBCATEGORIES
+
+    items = tuple((sub.id, sub.name, getattr(sub, 'book_count', 0)) for sub in subcategories)
+    return _subcategories_markup(items, show_book_count)
 
-    buttons = []
-    for sub in subcategories:
-        sub_id = sub.id
-        sub_name = sub.name
-        book_count = getattr(sub, 'book_count', 0)
 
+@lru_cache(maxsize=256)
+def _subcategories_markup(items: tuple, show_book_count: bool) -> InlineKeyboardMarkup:
+    """Subkategoriyalar markup: (id, nom, kitoblar soni) kortejlaridan"""
+    buttons = []
+    button = InlineKeyboardButton
+    for sub_id, sub_name, book_count in items:
         if show_book_count and book_count > 0:
-            text = f"{Emoji.FOLDER_OPEN} {sub_name} ({book_count})"
+            text = f"{_FOLDER_OPEN_PREFIX}{sub_name} ({book_count})"
         else:
-            text = f"{Emoji.FOLDER_OPEN} {sub_name}"
+            text = _FOLDER_OPEN_PREFIX + sub_name
 
         text = truncate_text(text, 30)
 
         buttons.append(
-            InlineKeyboardButton(
+            button(
                 text,
-                callback_data=safe_callback(f"u_subcat:{sub_id}")
+                callback_data=safe_callback(_CB_SUBCAT + str(sub_id))
             )
         )
 
-    footer = [
-        InlineKeyboardButton(
-            f"{Emoji.BACK} Kategoriyalar",
-            callback_data="u_back:categories"
-        )
-    ]
+    footer = [_BTN_BACK_CATEGORIES]
 
     return build_grid_keyboard(buttons, row_width=2, footer_buttons=footer)
 
@@ -267,7 +344,7 @@ def book_type_keyboard(
         category_id: int,
         pdf_count: int = 0,
         audio_count: int = 0,
-        back_callback: str = "back:categories"
+        back_callback: str = _CB_BACK_CATEGORIES
 ) -> InlineKeyboardMarkup:
     """
     PDF/Audio tanlash keyboard
@@ -278,42 +355,67 @@ def book_type_keyboard(
         audio_count: Audio kitoblar soni
         back_callback: Orqaga tugmasi callback
     """
-    keyboard = InlineKeyboardMarkup(row_width=1)
-
     # Hech narsa yo'q
     if pdf_count == 0 and audio_count == 0:
-        keyboard.add(
-            InlineKeyboardButton(
-                "📭 Bu kategoriyada kitoblar yo'q",
-                callback_data="u_empty"
-            )
+        return InlineKeyboardMarkup(
+            row_width=1,
+            inline_keyboard=[[_BTN_NO_BOOKS_IN_CATEGORY], [_back_btn(back_callback)]]
         )
-        keyboard.add(
-            InlineKeyboardButton(f"{Emoji.BACK} Orqaga", callback_data=back_callback)
-        )
-        return keyboard
 
+    # Qatorlar ro'yxatda yig'iladi: markup bir marta quriladi, .add() bilan qayta bo'linmaydi
+    rows = []
     if pdf_count > 0:
-        keyboard.add(
+        rows.append([
             InlineKeyboardButton(
                 f"{Emoji.BOOK_PDF} PDF kitoblar ({pdf_count})",
                 callback_data=safe_callback(f"u_type:pdf:{category_id}")
             )
-        )
+        ])
 
     if audio_count > 0:
-        keyboard.add(
+        rows.append([
             InlineKeyboardButton(
                 f"{Emoji.BOOK_AUDIO} Audio kitoblar ({audio_count})",
                 callback_data=safe_callback(f"u_type:audio:{category_id}")
             )
-        )
+        ])
 
-    keyboard.add(
-        InlineKeyboardButton(f"{Emoji.BACK} Orqaga", callback_data=back_callback)
-    )
+    rows.append([_back_btn(back_callback)])
 
-    return keyboard
+    return InlineKeyboardMarkup(row_width=1, inline_keyboard=rows)
+
+
+@lru_cache(maxsize=2048)
+def _books_pagination_row(
+        page: int,
+        total_pages: int,
+        category_id: Optional[int],
+        file_type: Optional[str]
+) -> tuple:
+    """Kitoblar sahifalash qatori (bir xil sahifa holati uchun bir marta quriladi)"""
+    cb_tail = f":{category_id or 0}:{file_type or 'all'}"
+    row = []
+
+    # Oldingi sahifa (raqam satri matn va callbackda bir marta hisoblanadi)
+    if page > 1:
+        prev_page = str(page - 1)
+        row.append(InlineKeyboardButton(
+            f"{Emoji.PREV} {prev_page}",
+            callback_data=safe_callback("u_pg:" + prev_page + cb_tail)
+        ))
+
+    # Hozirgi sahifa
+    row.append(InlineKeyboardButton(f"· {page}/{total_pages} ·", callback_data=_CB_PAGE_INFO))
+
+    # Keyingi sahifa
+    if page < total_pages:
+        next_page = str(page + 1)
+        row.append(InlineKeyboardButton(
+            f"{next_page} {Emoji.NEXT}",
+            callback_data=safe_callback("u_pg:" + next_page + cb_tail)
+        ))
+
+    return tuple(row)
 
 
 def books_list_keyboard(
@@ -335,71 +437,35 @@ def books_list_keyboard(
         category_id: Kategoriya ID (pagination uchun)
         file_type: Fayl turi (pagination uchun)
     """
-    keyboard = InlineKeyboardMarkup(row_width=1)
-
     # Bo'sh holat
     if not books:
-        keyboard.add(
-            InlineKeyboardButton(
-                "📭 Kitoblar topilmadi",
-                callback_data="u_empty"
-            )
+        return InlineKeyboardMarkup(
+            row_width=1, inline_keyboard=[[_BTN_BOOKS_NOT_FOUND], [_back_btn(back_callback)]]
         )
-        keyboard.add(
-            InlineKeyboardButton(f"{Emoji.BACK} Orqaga", callback_data=back_callback)
-        )
-        return keyboard
 
-    # Kitoblar
+    # Kitoblar (qatorlar ro'yxatda yig'iladi, markup oxirida bir marta quriladi)
+    rows = []
+    button = InlineKeyboardButton
+    book_emoji, trunc, safe = get_book_emoji, truncate_text, safe_callback
     for book in books:
-        emoji = get_book_emoji(book.file_type)
-        display_title = truncate_text(book.title, 35)
+        emoji = book_emoji(book.file_type)
+        display_title = trunc(book.title, 35)
 
-        keyboard.add(
-            InlineKeyboardButton(
+        rows.append([
+            button(
                 f"{emoji} {display_title}",
-                callback_data=safe_callback(f"u_dl:{book.id}")
+                callback_data=safe(_CB_DL + str(book.id))
             )
-        )
+        ])
 
     # Pagination buttons
     if total_pages > 1:
-        pagination_row = []
-
-        # Oldingi sahifa
-        if page > 1:
-            pagination_row.append(
-                InlineKeyboardButton(
-                    f"{Emoji.PREV} {page - 1}",
-                    callback_data=safe_callback(f"u_pg:{page - 1}:{category_id or 0}:{file_type or 'all'}")
-                )
-            )
-
-        # Hozirgi sahifa
-        pagination_row.append(
-            InlineKeyboardButton(
-                f"· {page}/{total_pages} ·",
-                callback_data="u_page_info"
-            )
-        )
-
-        # Keyingi sahifa
-        if page < total_pages:
-            pagination_row.append(
-                InlineKeyboardButton(
-                    f"{page + 1} {Emoji.NEXT}",
-                    callback_data=safe_callback(f"u_pg:{page + 1}:{category_id or 0}:{file_type or 'all'}")
-                )
-            )
-
-        keyboard.row(*pagination_row)
+        rows.append(list(_books_pagination_row(page, total_pages, category_id, file_type)))
 
     # Orqaga
-    keyboard.add(
-        InlineKeyboardButton(f"{Emoji.BACK} Orqaga", callback_data=back_callback)
-    )
+    rows.append([_back_btn(back_callback)])
 
-    return keyboard
+    return InlineKeyboardMarkup(row_width=1, inline_keyboard=rows)
 
 
 def books_paginated_keyboard(
@@ -427,6 +493,13 @@ def books_paginated_keyboard(
     )
 
 
+# Fayl turi bo'yicha asosiy tugma shabloni: (matn, callback formati)
+_BOOK_DETAIL_TEMPLATES = {
+    "pdf": (f"{Emoji.DOWNLOAD} Yuklab olish", "u_dl:{id}"),
+    "audio": (f"{Emoji.PLAY} Tinglash", "u_dl:{id}"),
+}
+
+
 def book_detail_keyboard(
         book: "Book",
         back_callback: Optional[str] = None
@@ -438,35 +511,26 @@ def book_detail_keyboard(
         book: Book dataclass
         back_callback: Orqaga tugmasi callback (None bo'lsa, avtomatik)
     """
-    keyboard = InlineKeyboardMarkup(row_width=1)
-
-    # Fayl turiga qarab button
-    file_type_str = book.file_type.value if hasattr(book.file_type, 'value') else str(book.file_type)
-
-    if file_type_str == "pdf":
-        keyboard.add(
-            InlineKeyboardButton(
-                f"{Emoji.DOWNLOAD} Yuklab olish",
-                callback_data=safe_callback(f"download:{book.id}")
-            )
-        )
-    else:
-        keyboard.add(
-            InlineKeyboardButton(
-                f"{Emoji.PLAY} Tinglash",
-                callback_data=safe_callback(f"download:{book.id}")
-            )
-        )
+    file_type_str = book.file_type_str
 
     # Orqaga
     if back_callback is None:
-        back_callback = f"books:{file_type_str}:{book.category_id}"
+        back_callback = f"u_type:{file_type_str}:{book.category_id}"
 
-    keyboard.add(
-        InlineKeyboardButton(f"{Emoji.BACK} Orqaga", callback_data=back_callback)
-    )
+    # Book hashlanmaydi, shuning uchun kesh kaliti — oddiy qiymatlar
+    return _book_detail_markup(book.id, file_type_str, back_callback)
 
-    return keyboard
+
+@lru_cache(maxsize=2048)
+def _book_detail_markup(book_id: int, file_type_str: str, back_callback: str) -> InlineKeyboardMarkup:
+    """Kitob tafsilotlari markup (har bir kitob uchun bir marta quriladi)"""
+    # Fayl turiga qarab button (shablonda faqat book.id almashtiriladi)
+    text, callback_format = _BOOK_DETAIL_TEMPLATES.get(file_type_str, _BOOK_DETAIL_TEMPLATES["audio"])
+
+    return InlineKeyboardMarkup(row_width=1, inline_keyboard=[
+        [InlineKeyboardButton(text, callback_data=callback_format.format(id=book_id))],
+        [InlineKeyboardButton(_BACK_TEXT, callback_data=back_callback)],
+    ])
 
 
 def search_type_keyboard(
@@ -482,35 +546,50 @@ def search_type_keyboard(
         audio_count: Audio natijalar soni
         search_id: Qidiruv ID (cache uchun, query o'rniga)
     """
-    keyboard = InlineKeyboardMarkup(row_width=1)
-
     # Hech narsa topilmadi
     if pdf_count == 0 and audio_count == 0:
-        keyboard.add(
-            InlineKeyboardButton(
-                "😔 Hech narsa topilmadi",
-                callback_data="u_empty"
-            )
-        )
-        return keyboard
+        return _KB_NOTHING_FOUND
 
+    rows = []
     if pdf_count > 0:
-        keyboard.add(
+        rows.append([
             InlineKeyboardButton(
                 f"{Emoji.BOOK_PDF} PDF natijalar ({pdf_count})",
                 callback_data=safe_callback(f"u_stype:pdf:{search_id or 0}")
             )
-        )
+        ])
 
     if audio_count > 0:
-        keyboard.add(
+        rows.append([
             InlineKeyboardButton(
                 f"{Emoji.BOOK_AUDIO} Audio natijalar ({audio_count})",
                 callback_data=safe_callback(f"u_stype:audio:{search_id or 0}")
             )
-        )
-
-    return keyboard
+        ])
+
+    return InlineKeyboardMarkup(row_width=1, inline_keyboard=rows)
+
+
+@lru_cache(maxsize=2048)
+def _search_pagination_row(
+        page: int,
+        total_pages: int,
+        search_id: Optional[int],
+        file_type: Optional[str]
+) -> tuple:
+    """Qidiruv sahifalash qatori (keshlangan)"""
+    cb_tail = f":{search_id}:{file_type}"
+    row = []
+    if page > 1:
+        row.append(InlineKeyboardButton(
+            Emoji.PREV, callback_data=safe_callback(f"u_sp:{page - 1}" + cb_tail)
+        ))
+    row.append(InlineKeyboardButton(f"· {page}/{total_pages} ·", callback_data="current_page"))
+    if page < total_pages:
+        row.append(InlineKeyboardButton(
+            Emoji.NEXT, callback_data=safe_callback(f"u_sp:{page + 1}" + cb_tail)
+        ))
+    return tuple(row)
 
 
 def search_results_keyboard(
@@ -530,66 +609,39 @@ def search_results_keyboard(
         search_id: Qidiruv ID
         file_type: Fayl turi filtri
     """
-    keyboard = InlineKeyboardMarkup(row_width=1)
-
     if not books:
-        keyboard.add(
-            InlineKeyboardButton(
-                "😔 Hech narsa topilmadi",
-                callback_data="u_empty"
-            )
-        )
-        return keyboard
+        return _KB_NOTHING_FOUND
 
     # Kitoblar - bosilganda yuklanadi
+    rows = []
+    button = InlineKeyboardButton
+    book_emoji, trunc, safe = get_book_emoji, truncate_text, safe_callback
     for book in books:
-        emoji = get_book_emoji(book.file_type)
-        display_title = truncate_text(book.title, 32)
+        emoji = book_emoji(book.file_type)
+        display_title = trunc(book.title, 32)
 
         # dl = direct download
-        keyboard.add(
-            InlineKeyboardButton(
+        rows.append([
+            button(
                 f"{emoji} {display_title}",
-                callback_data=safe_callback(f"u_dl:{book.id}")
+                callback_data=safe(_CB_DL + str(book.id))
             )
-        )
+        ])
 
     # Pagination
     if total_pages > 1:
-        pagination_row = []
-
-        if page > 1:
-            pagination_row.append(
-                InlineKeyboardButton(
-                    f"{Emoji.PREV}",
-                    callback_data=safe_callback(f"u_sp:{page - 1}:{search_id}:{file_type}")
-                )
-            )
-
-        pagination_row.append(
-            InlineKeyboardButton(f"· {page}/{total_pages} ·", callback_data="current_page")
-        )
-
-        if page < total_pages:
-            pagination_row.append(
-                InlineKeyboardButton(
-                    f"{Emoji.NEXT}",
-                    callback_data=safe_callback(f"u_sp:{page + 1}:{search_id}:{file_type}")
-                )
-            )
-
-        keyboard.row(*pagination_row)
+        rows.append(list(_search_pagination_row(page, total_pages, search_id, file_type)))
 
     # Tur almashtirgich (agar search_id bo'lsa)
     if search_id:
-        keyboard.add(
+        rows.append([
             InlineKeyboardButton(
-                f"{Emoji.SEARCH} Tur tanlash",
+                _LBL_SEARCH_TYPE,
                 callback_data=safe_callback(f"u_sback:{search_id}")
             )
-        )
+        ])
 
-    return keyboard
+    return InlineKeyboardMarkup(row_width=1, inline_keyboard=rows)
 
 
 def popular_keyboard(
@@ -597,34 +649,27 @@ def popular_keyboard(
         audio_count: int = 0
 ) -> InlineKeyboardMarkup:
     """Mashhur kitoblar tur tanlash"""
-    keyboard = InlineKeyboardMarkup(row_width=1)
-
     if pdf_count == 0 and audio_count == 0:
-        keyboard.add(
-            InlineKeyboardButton(
-                "📭 Mashhur kitoblar yo'q",
-                callback_data="u_empty"
-            )
-        )
-        return keyboard
+        return _KB_NO_POPULAR
 
+    rows = []
     if pdf_count > 0:
-        keyboard.add(
+        rows.append([
             InlineKeyboardButton(
                 f"{Emoji.FIRE} Mashhur PDF ({pdf_count})",
                 callback_data="u_popular:pdf"
             )
-        )
+        ])
 
     if audio_count > 0:
-        keyboard.add(
+        rows.append([
             InlineKeyboardButton(
                 f"{Emoji.FIRE} Mashhur Audio ({audio_count})",
                 callback_data="u_popular:audio"
             )
-        )
+        ])
 
-    return keyboard
+    return InlineKeyboardMarkup(row_width=1, inline_keyboard=rows)
 
 
 def popular_books_keyboard(
@@ -632,37 +677,21 @@ def popular_books_keyboard(
         file_type: str
 ) -> InlineKeyboardMarkup:
     """Mashhur kitoblar ro'yxati"""
-    keyboard = InlineKeyboardMarkup(row_width=1)
-
     if not books:
-        keyboard.add(
-            InlineKeyboardButton("📭 Kitoblar yo'q", callback_data="u_empty")
-        )
-        keyboard.add(
-            InlineKeyboardButton(f"{Emoji.BACK} Orqaga", callback_data="u_back:popular")
-        )
-        return keyboard
-
-    for i, book in enumerate(books, 1):
-        emoji = get_book_emoji(book.file_type)
-
-        # Reyting ko'rsatish
-        medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}."
-        display_title = truncate_text(book.title, 28)
-        downloads = book.download_count
-
-        keyboard.add(
-            InlineKeyboardButton(
-                f"{medal} {display_title} ({downloads})",
-                callback_data=safe_callback(f"u_dl:{book.id}")
-            )
-        )
-
-    keyboard.add(
-        InlineKeyboardButton(f"{Emoji.BACK} Orqaga", callback_data="u_back:popular")
-    )
+        return _KB_NO_POPULAR_BOOKS
+
+    # Reyting bilan qatorlar bitta comprehension'da quriladi (har kitobga .add() yo'q)
+    button, trunc, safe = InlineKeyboardButton, truncate_text, safe_callback
+    rows = [
+        [button(
+            f"{rank_label(i)} {trunc(book.title, 28)} ({book.download_count})",
+            callback_data=safe(_CB_DL + str(book.id))
+        )]
+        for i, book in enumerate(books, 1)
+    ]
+    rows.append([_BTN_BACK_POPULAR])
 
-    return keyboard
+    return InlineKeyboardMarkup(row_width=1, inline_keyboard=rows)
 
 
 def recent_books_keyboard(
@@ -670,32 +699,24 @@ def recent_books_keyboard(
         file_type: Optional[str] = None
 ) -> InlineKeyboardMarkup:
     """Yangi kitoblar ro'yxati"""
-    keyboard = InlineKeyboardMarkup(row_width=1)
-
     if not books:
-        keyboard.add(
-            InlineKeyboardButton("📭 Yangi kitoblar yo'q", callback_data="u_empty")
-        )
-        return keyboard
-
-    for book in books:
-        emoji = get_book_emoji(book.file_type)
-        display_title = truncate_text(book.title, 32)
-
-        keyboard.add(
-            InlineKeyboardButton(
-                f"{Emoji.NEW} {emoji} {display_title}",
-                callback_data=safe_callback(f"u_dl:{book.id}")
-            )
-        )
-
-    keyboard.add(
-        InlineKeyboardButton(f"{Emoji.HOME} Bosh menyu", callback_data="u_back:main")
-    )
+        return _KB_NO_RECENT
+
+    button, book_emoji = InlineKeyboardButton, get_book_emoji
+    trunc, safe = truncate_text, safe_callback
+    rows = [
+        [button(
+            f"{_NEW_PREFIX}{book_emoji(book.file_type)} {trunc(book.title, 32)}",
+            callback_data=safe(_CB_DL + str(book.id))
+        )]
+        for book in books
+    ]
+    rows.append([_BTN_HOME])
 
-    return keyboard
+    return InlineKeyboardMarkup(row_width=1, inline_keyboard=rows)
 
 
+@lru_cache(maxsize=2048)
 def confirm_keyboard(
         confirm_callback: str,
         cancel_callback: str,
@@ -703,14 +724,13 @@ def confirm_keyboard(
         cancel_text: str = "❌ Yo'q"
 ) -> InlineKeyboardMarkup:
     """Tasdiqlash keyboard"""
-    keyboard = InlineKeyboardMarkup(row_width=2)
-    keyboard.add(
+    return InlineKeyboardMarkup(row_width=2, inline_keyboard=[[
         InlineKeyboardButton(confirm_text, callback_data=confirm_callback),
         InlineKeyboardButton(cancel_text, callback_data=cancel_callback)
-    )
-    return keyboard
+    ]])
 
 
+@lru_cache(maxsize=None)
 def close_keyboard() -> InlineKeyboardMarkup:
     """Yopish tugmasi"""
     keyboard = InlineKeyboardMarkup()
@@ -720,6 +740,12 @@ def close_keyboard() -> InlineKeyboardMarkup:
     return keyboard
 
 
+@lru_cache(maxsize=None)
+def close_keyboard_json() -> str:
+    """close_keyboard() JSON"""
+    return close_keyboard().as_json()
+
+
 # =================== CALLBACK PARSER ===================
 
 class CallbackParser:
@@ -742,11 +768,17 @@ class CallbackParser:
     @staticmethod
     def get_action(callback_data: str) -> str:
         """Faqat action olish"""
-        return callback_data.split(":")[0] if callback_data else ""
+        return callback_data.partition(":")[0] if callback_data else ""
 
     @staticmethod
     def get_param(callback_data: str, index: int = 0, default: any = None) -> any:
         """Parametr olish"""
+        if index == 0:
+            # Eng ko'p uchraydigan holat: "action:param" — ro'yxat yaratmasdan
+            _, sep, rest = callback_data.partition(":")
+            if not sep:
+                return default
+            return rest.partition(":")[0]
         parts = callback_data.split(":")
         try:
             return parts[index + 1]  # +1 chunki 0 = action
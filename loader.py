@@ -9,7 +9,9 @@ from utils.db_api.book_database import BookDatabase
 
 from data import config
 
-bot = Bot(token=config.BOT_TOKEN, parse_mode=types.ParseMode.HTML)
+# Bot bitta aiohttp sessiyani (connection pool) hamma so'rovlar uchun qayta ishlatadi.
+# Handlerlarda alohida ClientSession ochmang — shu `bot` orqali yuboring
+bot = Bot(token=config.BOT_TOKEN, parse_mode=types.ParseMode.HTML, connections_limit=100)
 storage = MemoryStorage()
 dp = Dispatcher(bot, storage=storage)
 #database obyektlarini  yaratamiz
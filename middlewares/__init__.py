@@ -3,8 +3,10 @@ from aiogram import Dispatcher
 from loader import dp
 from .throttling import ThrottlingMiddleware
 from .checksub import SubscriptionMiddleware
+from .activity import ActivityMiddleware
 
 
 if __name__ == "middlewares":
     dp.middleware.setup(ThrottlingMiddleware())
-    dp.middleware.setup(SubscriptionMiddleware())
\ No newline at end of file
+    dp.middleware.setup(SubscriptionMiddleware())
+    dp.middleware.setup(ActivityMiddleware())
\ No newline at end of file
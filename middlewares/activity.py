@@ -0,0 +1,21 @@
+from aiogram import types
+from aiogram.dispatcher.middlewares import BaseMiddleware
+
+from loader import user_db
+
+
+class ActivityMiddleware(BaseMiddleware):
+    """
+    Foydalanuvchi faolligini belgilaydi (bazaga davriy flush orqali yoziladi)
+    """
+
+    async def on_pre_process_message(self, message: types.Message, data: dict):
+        self.mark(message.from_user)
+
+    async def on_pre_process_callback_query(self, callback: types.CallbackQuery, data: dict):
+        self.mark(callback.from_user)
+
+    @staticmethod
+    def mark(user: types.User):
+        if user and user_db.is_known_user(user.id):
+            user_db.mark_active(user.id)
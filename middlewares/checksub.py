@@ -27,9 +27,9 @@ class SubscriptionMiddleware(BaseMiddleware):
         channels = channel_db.get_all_channels()
 
         for channel in channels:
-            channel_id = channel[1]  # channel_id ni olish
-            title = channel[2]       # title ni olish
-            invite_link = channel[3] # invite_link ni olish
+            channel_id = channel["channel_id"]
+            title = channel["title"]
+            invite_link = channel["invite_link"]
 
             # Foydalanuvchi kanalga obuna bo'lganligini tekshirish
             status = await subscription.check(user_id=user, channel=channel_id)
@@ -75,9 +75,9 @@ async def check_subscriptions(call: types.CallbackQuery):
     channels = channel_db.get_all_channels()
 
     for channel in channels:
-        channel_id = channel[1]
-        title = channel[2]
-        invite_link = channel[3]
+        channel_id = channel["channel_id"]
+        title = channel["title"]
+        invite_link = channel["invite_link"]
 
         status = await subscription.check(user_id=user, channel=channel_id)
         final_status = final_status and status
@@ -9,17 +9,32 @@ Xususiyatlar:
 - Pagination
 - FTS (Full-Text Search) ready
 - Backward compatible (eski metodlar ham ishlaydi)
+- Tez-tez o'qiladigan ro'yxatlar uchun TTL kesh
 """
 
 from .database import Database
+from utils.misc.ttl_cache import TTLCache
+from collections import Counter
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional, List, Tuple, Dict, Any, Union
 from enum import Enum
+from functools import lru_cache
 import logging
+import sqlite3
 
 logger = logging.getLogger(__name__)
 
+# Kesh muddati (soniya). Admin o'zgartirishlari keshni darhol tozalaydi
+CACHE_TTL = 60
+# Mashhur kitoblar yuklab olishlar bilan o'zgaradi, shuning uchun qisqaroq
+POPULAR_CACHE_TTL = 30
+# Statistikadagi jami yuklab olishlar ham shunday
+STATS_CACHE_TTL = 30
+# Kitob yozuvlari deyarli o'zgarmaydi (download_count navbat orqali yoziladi)
+BOOK_CACHE_TTL = 300
+BOOK_CACHE_SIZE = 10_000
+
 
 # =================== ENUMS ===================
 
@@ -55,9 +70,86 @@ class BookSortBy(str, Enum):
     AUTHOR = "author"
 
 
+# =================== SQL ===================
+# Tez-tez ishlatiladigan so'rovlar o'zgarmas matn bo'lib turadi, shunda
+# sqlite3 ularni ulanishning statement keshidan qayta ishlatadi
+
+# category_name Books jadvalida saqlanadi (triggerlar bilan), JOIN kerak emas
+SQL_BOOK_BY_ID = """
+    SELECT * FROM Books WHERE id = ?
+"""
+
+# Kategoriya va uning barcha avlodlari id lari (bitta rekursiv so'rov)
+SQL_SUBTREE_IDS = """
+    WITH RECURSIVE subtree(id) AS (
+        SELECT ?
+        UNION
+        SELECT c.id FROM Categories c
+        JOIN subtree ON c.parent_id = subtree.id
+        WHERE c.is_deleted = 0 OR c.is_deleted IS NULL
+    )
+    SELECT id FROM subtree
+"""
+
+# Kategoriyadan ildizgacha bo'lgan nomlar (visited ustuni sikldan himoya qiladi)
+SQL_CATEGORY_PATH = """
+    WITH RECURSIVE path(id, name, parent_id, depth, visited) AS (
+        SELECT id, name, parent_id, 0, ',' || id || ','
+        FROM Categories WHERE id = ?
+        UNION ALL
+        SELECT c.id, c.name, c.parent_id, path.depth + 1, path.visited || c.id || ','
+        FROM Categories c
+        JOIN path ON c.id = path.parent_id
+        WHERE instr(path.visited, ',' || c.id || ',') = 0
+    )
+    SELECT name FROM path ORDER BY depth DESC
+"""
+
+SQL_ADD_DOWNLOADS = "UPDATE Books SET download_count = download_count + ? WHERE id = ?"
+
+
+# =================== HELPERS ===================
+
+_SIZE_UNITS = ("B", "KB", "MB", "GB")
+
+
+@lru_cache(maxsize=4096)
+def _format_size(size_bytes: int) -> str:
+    size = size_bytes
+    for unit in _SIZE_UNITS:
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+def format_file_size(size_bytes: Optional[int]) -> str:
+    """Fayl hajmini formatlash (natijalar keshlanadi)"""
+    if not size_bytes:
+        return ""
+    return _format_size(size_bytes)
+
+
+# FileType str enum: a'zo va uning satr qiymati bir xil hash/teng, shuning uchun
+# bitta lug'at ham FileType.PDF, ham "pdf" ni qiymatiga o'giradi (isinstance yo'q)
+_FILE_TYPE_VALUES = {ft: ft.value for ft in FileType}
+
+
+def _file_type_value(file_type: Union[FileType, str, None]) -> Optional[str]:
+    """FileType yoki satrni DB dagi satr qiymatiga keltirish"""
+    return _FILE_TYPE_VALUES.get(file_type, file_type)
+
+
 # =================== DATA CLASSES ===================
 
-@dataclass
+def _parse_datetime(value: Any, default: Optional[datetime] = None) -> Optional[datetime]:
+    """SQLite dagi sana qiymatini datetime ga o'tkazish"""
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value or default
+
+
+@dataclass(slots=True)
 class Category:
     """Kategoriya modeli"""
     id: int
@@ -71,24 +163,25 @@ class Category:
     book_count: int = 0
 
     @classmethod
-    def from_row(cls, row: Union[tuple, None]) -> Optional["Category"]:
-        """Tuple dan Category yaratish"""
+    def from_row(cls, row: Optional[sqlite3.Row]) -> Optional["Category"]:
+        """Qatordan Category yaratish (ustun nomlari bo'yicha)"""
         if not row:
             return None
+        keys = row.keys()
         return cls(
-            id=row[0],
-            name=row[1],
-            description=row[2],
-            parent_id=row[3],
-            created_at=datetime.fromisoformat(row[4]) if isinstance(row[4], str) else (row[4] or datetime.now()),
-            created_by=row[5],
-            is_deleted=bool(row[6]) if len(row) > 6 else False,
-            deleted_at=datetime.fromisoformat(row[7]) if len(row) > 7 and row[7] else None,
-            book_count=row[8] if len(row) > 8 else 0
+            id=row["id"],
+            name=row["name"],
+            description=row["description"],
+            parent_id=row["parent_id"],
+            created_at=_parse_datetime(row["created_at"], datetime.now()),
+            created_by=row["created_by"],
+            is_deleted=bool(row["is_deleted"]) if "is_deleted" in keys else False,
+            deleted_at=_parse_datetime(row["deleted_at"]) if "deleted_at" in keys else None,
+            book_count=row["book_count"] if "book_count" in keys else 0
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Book:
     """Kitob modeli"""
     id: int
@@ -110,33 +203,29 @@ class Book:
     category_name: Optional[str] = None
 
     @classmethod
-    def from_row(cls, row: Union[tuple, None]) -> Optional["Book"]:
-        """Tuple dan Book yaratish"""
+    def from_row(cls, row: Optional[sqlite3.Row]) -> Optional["Book"]:
+        """Qatordan Book yaratish (ustun nomlari bo'yicha)"""
         if not row:
             return None
-
-        # Row uzunligiga qarab parsing
-        # Eski format: id, title, file_id, file_type, category_id, author, narrator,
-        #              description, duration, file_size, uploaded_by, download_count, created_at, [category_name]
-
+        keys = row.keys()
         return cls(
-            id=row[0],
-            title=row[1],
-            file_id=row[2],
-            file_type=FileType.from_string(row[3]),
-            category_id=row[4],
-            author=row[5],
-            narrator=row[6],
-            description=row[7],
-            duration=row[8],
-            file_size=row[9],
-            uploaded_by=row[10],
-            download_count=row[11] or 0,
-            created_at=datetime.fromisoformat(row[12]) if isinstance(row[12], str) else (row[12] or datetime.now()),
+            id=row["id"],
+            title=row["title"],
+            file_id=row["file_id"],
+            file_type=FileType.from_string(row["file_type"]),
+            category_id=row["category_id"],
+            author=row["author"],
+            narrator=row["narrator"],
+            description=row["description"],
+            duration=row["duration"],
+            file_size=row["file_size"],
+            uploaded_by=row["uploaded_by"],
+            download_count=row["download_count"] or 0,
+            created_at=_parse_datetime(row["created_at"], datetime.now()),
             updated_at=None,
-            is_deleted=False,
-            deleted_at=None,
-            category_name=row[13] if len(row) > 13 else None
+            is_deleted=bool(row["is_deleted"]) if "is_deleted" in keys else False,
+            deleted_at=_parse_datetime(row["deleted_at"]) if "deleted_at" in keys else None,
+            category_name=row["category_name"] if "category_name" in keys else None
         )
 
     @property
@@ -153,14 +242,12 @@ class Book:
     @property
     def file_size_formatted(self) -> str:
         """Fayl hajmini formatlash"""
-        if not self.file_size:
-            return ""
-        size = self.file_size
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size < 1024:
-                return f"{size:.1f} {unit}"
-            size /= 1024
-        return f"{size:.1f} TB"
+        return format_file_size(self.file_size)
+
+    @property
+    def file_type_str(self) -> str:
+        """Fayl turi satr ko'rinishida ("pdf", "audio", ...)"""
+        return _file_type_value(self.file_type)
 
 
 @dataclass
@@ -197,6 +284,14 @@ class BookDatabase(Database):
     Eski metodlar saqlanib qolgan + yangi dataclass metodlar qo'shilgan
     """
 
+    def __init__(self, path_to_db="main.db"):
+        super().__init__(path_to_db)
+        self._cache = TTLCache(ttl=CACHE_TTL)
+        # Kitoblar alohida keshda, ro'yxat keshlarini siqib chiqarmasligi uchun
+        self._book_cache = TTLCache(ttl=BOOK_CACHE_TTL, maxsize=BOOK_CACHE_SIZE)
+        # Hali bazaga yozilmagan yuklab olishlar: {book_id: soni}
+        self._pending_downloads: Counter = Counter()
+
     def create_tables(self):
         """Jadvallarni yaratish"""
 
@@ -235,6 +330,7 @@ class BookDatabase(Database):
             created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
             is_deleted BOOLEAN NOT NULL DEFAULT 0,
             deleted_at DATETIME NULL,
+            category_name VARCHAR(255) NULL,
             FOREIGN KEY (category_id) REFERENCES Categories(id) ON DELETE CASCADE,
             FOREIGN KEY (uploaded_by) REFERENCES Users(id) ON DELETE CASCADE
         );
@@ -243,6 +339,9 @@ class BookDatabase(Database):
 
         # Yangi ustunlarni qo'shish (agar jadval mavjud bo'lsa)
         self._add_soft_delete_columns()
+        self._add_category_name_column()
+        self._create_category_name_triggers()
+        self._create_indexes()
 
     def _add_soft_delete_columns(self):
         """Soft delete ustunlarini qo'shish (migration)"""
@@ -263,6 +362,61 @@ class BookDatabase(Database):
         except:
             pass
 
+    def _create_indexes(self):
+        """Eng ko'p ishlatiladigan so'rovlar uchun indekslar"""
+        indexes = (
+            # Kategoriya bo'yicha kitoblar va PDF/audio sonlari
+            "CREATE INDEX IF NOT EXISTS idx_books_category_type ON Books(category_id, file_type)",
+            # Mashhur kitoblar (tur bo'yicha, yuklab olishlar kamayish tartibida)
+            "CREATE INDEX IF NOT EXISTS idx_books_type_downloads ON Books(file_type, download_count DESC)",
+            # Subkategoriyalar va rekursiv CTE lar
+            "CREATE INDEX IF NOT EXISTS idx_categories_parent ON Categories(parent_id)",
+        )
+        for sql in indexes:
+            self.execute(sql, commit=True)
+
+    def _add_category_name_column(self):
+        """Books.category_name denormalizatsiya ustuni (migration + to'ldirish)"""
+        columns = self.execute("PRAGMA table_info(Books)", fetchall=True) or []
+        if any(col["name"] == "category_name" for col in columns):
+            return
+        self.execute("ALTER TABLE Books ADD COLUMN category_name VARCHAR(255) NULL", commit=True)
+        self.execute("""
+            UPDATE Books SET category_name = (
+                SELECT name FROM Categories WHERE Categories.id = Books.category_id
+            )
+        """, commit=True)
+
+    def _create_category_name_triggers(self):
+        """Books.category_name ni Categories bilan sinxron ushlab turuvchi triggerlar"""
+        triggers = (
+            """
+            CREATE TRIGGER IF NOT EXISTS books_category_name_insert
+            AFTER INSERT ON Books
+            BEGIN
+                UPDATE Books SET category_name = (SELECT name FROM Categories WHERE id = NEW.category_id)
+                WHERE id = NEW.id;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS books_category_name_move
+            AFTER UPDATE OF category_id ON Books
+            BEGIN
+                UPDATE Books SET category_name = (SELECT name FROM Categories WHERE id = NEW.category_id)
+                WHERE id = NEW.id;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS categories_name_update
+            AFTER UPDATE OF name ON Categories
+            BEGIN
+                UPDATE Books SET category_name = NEW.name WHERE category_id = NEW.id;
+            END
+            """,
+        )
+        for sql in triggers:
+            self.execute(sql, commit=True)
+
     # =================== KATEGORIYALAR (YANGILANGAN) ===================
 
     def add_category(self, name: str, created_by: int, description: str = None, parent_id: int = None) -> int:
@@ -272,6 +426,7 @@ class BookDatabase(Database):
         VALUES (?, ?, ?, ?)
         """
         cursor = self.execute(sql, parameters=(name, description, parent_id, created_by), commit=True)
+        self.clear_cache()
         return cursor.lastrowid if hasattr(cursor, 'lastrowid') else None
 
     def get_all_categories(self, include_deleted: bool = False) -> List[Category]:
@@ -308,7 +463,14 @@ class BookDatabase(Database):
         return result[0] > 0 if result else False
 
     def get_category_by_id(self, category_id: int) -> Optional[Category]:
-        """ID bo'yicha kategoriya (dataclass)"""
+        """ID bo'yicha kategoriya (dataclass, keshlangan)"""
+        return self._cache.get_or_set(
+            ("category", category_id),
+            lambda: self._fetch_category_by_id(category_id)
+        )
+
+    def _fetch_category_by_id(self, category_id: int) -> Optional[Category]:
+        """ID bo'yicha kategoriya (bazadan)"""
         sql = "SELECT * FROM Categories WHERE id = ?"
         row = self.execute(sql, parameters=(category_id,), fetchone=True)
         return Category.from_row(row)
@@ -330,11 +492,13 @@ class BookDatabase(Database):
         else:
             sql = "UPDATE Categories SET is_deleted = 1, deleted_at = CURRENT_TIMESTAMP WHERE id = ?"
         self.execute(sql, parameters=(category_id,), commit=True)
+        self.clear_cache()
 
     def restore_category(self, category_id: int):
         """O'chirilgan kategoriyani qaytarish"""
         sql = "UPDATE Categories SET is_deleted = 0, deleted_at = NULL WHERE id = ?"
         self.execute(sql, parameters=(category_id,), commit=True)
+        self.clear_cache()
 
     def update_category(self, category_id: int, name: str = None, description: str = None,
                         parent_id: int = None) -> bool:
@@ -358,6 +522,7 @@ class BookDatabase(Database):
         params.append(category_id)
         sql = f"UPDATE Categories SET {', '.join(updates)} WHERE id = ?"
         self.execute(sql, parameters=tuple(params), commit=True)
+        self.clear_cache()
         return True
 
     def update_category_name(self, category_id: int, new_name: str):
@@ -378,45 +543,96 @@ class BookDatabase(Database):
         return result[0] if result else 0
 
     def get_category_path(self, category_id: int) -> str:
-        """Kategoriya yo'li (Asosiy → Sub)"""
-        path = []
-        current_id = category_id
-        visited = set()
-
-        while current_id and current_id not in visited:
-            visited.add(current_id)
-            category = self.get_category_by_id(current_id)
-            if category:
-                path.insert(0, category.name)
-                current_id = category.parent_id
-            else:
-                break
-        return " → ".join(path) if path else ""
+        """Kategoriya yo'li (Asosiy → Sub, keshlangan)"""
+        return self._cache.get_or_set(
+            ("category_path", category_id),
+            lambda: self._fetch_category_path(category_id)
+        )
+
+    def _fetch_category_path(self, category_id: int) -> str:
+        """Kategoriya yo'li (bazadan)"""
+        rows = self.execute(SQL_CATEGORY_PATH, parameters=(category_id,), fetchall=True)
+        return " → ".join(row[0] for row in (rows or []))
 
     def get_categories_with_book_count(self, file_type: FileType = None) -> List[Category]:
-        """Kategoriyalar kitoblar soni bilan"""
-        if file_type:
-            sql = """
-                SELECT c.*, 
-                    (SELECT COUNT(*) FROM Books b 
-                     WHERE b.category_id = c.id AND (b.is_deleted = 0 OR b.is_deleted IS NULL) AND b.file_type = ?) as book_count
-                FROM Categories c
-                WHERE c.is_deleted = 0 OR c.is_deleted IS NULL
-                ORDER BY c.parent_id NULLS FIRST, c.name
+        """Kategoriyalar kitoblar soni bilan (keshlangan)"""
+        file_type_value = _file_type_value(file_type)
+        return self._cache.get_or_set(
+            ("categories_with_count", file_type_value),
+            lambda: self._fetch_categories_with_book_count(file_type_value)
+        )
+
+    def _fetch_categories_with_book_count(self, file_type: str = None) -> List[Category]:
+        """Kategoriyalar kitoblar soni bilan (bazadan, bitta GROUP BY bilan)"""
+        type_filter = "AND file_type = ?" if file_type else ""
+        sql = f"""
+            SELECT c.*, COALESCE(bc.cnt, 0) as book_count
+            FROM Categories c
+            LEFT JOIN (
+                SELECT category_id, COUNT(*) as cnt
+                FROM Books
+                WHERE (is_deleted = 0 OR is_deleted IS NULL) {type_filter}
+                GROUP BY category_id
+            ) bc ON bc.category_id = c.id
+            WHERE c.is_deleted = 0 OR c.is_deleted IS NULL
+            ORDER BY c.parent_id NULLS FIRST, c.name
+        """
+        rows = self.execute(sql, parameters=(file_type,) if file_type else (), fetchall=True)
+        return [Category.from_row(row) for row in (rows or [])]
+
+    def count_books_grouped_by_category(self, file_type: Union[str, FileType] = None,
+                                        include_subcategories: bool = False) -> Dict[int, int]:
+        """
+        Barcha kategoriyalar uchun kitoblar soni bitta so'rovda: {category_id: soni}
+
+        include_subcategories=True bo'lsa, subkategoriyalar soni ota kategoriyalarga
+        rekursiv CTE orqali qo'shiladi. UNION (ALL emas): (root_id, id) juftlari chekli,
+        shuning uchun parent_id sikli bo'lsa ham so'rov tugaydi.
+        """
+        file_type_value = _file_type_value(file_type)
+        column = "b.file_type" if include_subcategories else "file_type"
+        type_filter = f"AND {column} = ?" if file_type_value else ""
+        params = (file_type_value,) if file_type_value else ()
+
+        if include_subcategories:
+            sql = f"""
+                WITH RECURSIVE tree(root_id, id) AS (
+                    SELECT id, id FROM Categories
+                    WHERE is_deleted = 0 OR is_deleted IS NULL
+                    UNION
+                    SELECT tree.root_id, c.id
+                    FROM Categories c
+                    JOIN tree ON c.parent_id = tree.id
+                    WHERE c.is_deleted = 0 OR c.is_deleted IS NULL
+                )
+                SELECT tree.root_id, COUNT(b.id)
+                FROM tree
+                JOIN Books b ON b.category_id = tree.id
+                    AND (b.is_deleted = 0 OR b.is_deleted IS NULL) {type_filter}
+                GROUP BY tree.root_id
             """
-            rows = self.execute(sql, parameters=(file_type.value if isinstance(file_type, FileType) else file_type,),
-                                fetchall=True)
         else:
-            sql = """
-                SELECT c.*, 
-                    (SELECT COUNT(*) FROM Books b 
-                     WHERE b.category_id = c.id AND (b.is_deleted = 0 OR b.is_deleted IS NULL)) as book_count
-                FROM Categories c
-                WHERE c.is_deleted = 0 OR c.is_deleted IS NULL
-                ORDER BY c.parent_id NULLS FIRST, c.name
+            sql = f"""
+                SELECT category_id, COUNT(*)
+                FROM Books
+                WHERE (is_deleted = 0 OR is_deleted IS NULL) {type_filter}
+                GROUP BY category_id
             """
-            rows = self.execute(sql, fetchall=True)
+        rows = self.execute(sql, parameters=params, fetchall=True)
+        return {row[0]: row[1] for row in (rows or [])}
 
+    def get_top_categories(self, limit: int = 20) -> List[Category]:
+        """Kitoblari eng ko'p kategoriyalar (bo'shlari chiqarilmaydi)"""
+        sql = """
+            SELECT c.*, COUNT(b.id) as book_count
+            FROM Categories c
+            JOIN Books b ON b.category_id = c.id AND (b.is_deleted = 0 OR b.is_deleted IS NULL)
+            WHERE c.is_deleted = 0 OR c.is_deleted IS NULL
+            GROUP BY c.id
+            ORDER BY book_count DESC, c.name
+            LIMIT ?
+        """
+        rows = self.execute(sql, parameters=(limit,), fetchall=True)
         return [Category.from_row(row) for row in (rows or [])]
 
     # =================== KITOBLAR (YANGILANGAN) ===================
@@ -425,7 +641,7 @@ class BookDatabase(Database):
                  file_type: Union[str, FileType] = 'pdf', author: str = None, narrator: str = None,
                  description: str = None, duration: int = None, file_size: int = None) -> int:
         """Kitob qo'shish"""
-        file_type_value = file_type.value if isinstance(file_type, FileType) else file_type
+        file_type_value = _file_type_value(file_type)
 
         sql = """
         INSERT INTO Books (title, file_id, file_type, category_id, author, narrator, 
@@ -435,6 +651,7 @@ class BookDatabase(Database):
         cursor = self.execute(sql, parameters=(title, file_id, file_type_value, category_id, author,
                                                narrator, description, duration, file_size, uploaded_by),
                               commit=True)
+        self.clear_cache()
         return cursor.lastrowid if hasattr(cursor, 'lastrowid') else None
 
     def add_books_bulk(self, books_list: list) -> Tuple[int, int]:
@@ -458,12 +675,14 @@ class BookDatabase(Database):
             except Exception as e:
                 logger.error(f"Error adding book {book[0]}: {e}")
                 errors += 1
+        self.clear_cache()
         return added, errors
 
     def get_books(self, category_id: int = None, file_type: Union[str, FileType] = None,
                   include_deleted: bool = False, page: int = 1, per_page: int = 20,
                   sort_by: BookSortBy = BookSortBy.CREATED_AT,
-                  sort_order: SortOrder = SortOrder.DESC) -> PaginatedResult:
+                  sort_order: SortOrder = SortOrder.DESC,
+                  include_subcategories: bool = False) -> PaginatedResult:
         """Kitoblarni olish (pagination bilan, dataclass)"""
 
         conditions = []
@@ -471,11 +690,14 @@ class BookDatabase(Database):
 
         if not include_deleted:
             conditions.append("(b.is_deleted = 0 OR b.is_deleted IS NULL)")
-        if category_id:
+        if category_id and include_subcategories:
+            conditions.append(f"b.category_id IN ({SQL_SUBTREE_IDS})")
+            params.append(category_id)
+        elif category_id:
             conditions.append("b.category_id = ?")
             params.append(category_id)
         if file_type:
-            file_type_value = file_type.value if isinstance(file_type, FileType) else file_type
+            file_type_value = _file_type_value(file_type)
             conditions.append("b.file_type = ?")
             params.append(file_type_value)
 
@@ -494,9 +716,8 @@ class BookDatabase(Database):
         sort_order_value = sort_order.value if isinstance(sort_order, SortOrder) else sort_order
 
         sql = f"""
-            SELECT b.*, c.name as category_name
+            SELECT b.*
             FROM Books b
-            LEFT JOIN Categories c ON b.category_id = c.id
             {where_clause}
             ORDER BY b.{sort_by_value} {sort_order_value}
             LIMIT ? OFFSET ?
@@ -516,24 +737,75 @@ class BookDatabase(Database):
             has_prev=page > 1
         )
 
+    def get_category_with_books(self, category_id: int, file_type: Union[str, FileType] = None,
+                                page: int = 1, per_page: int = 20) -> Tuple[Optional[Category], PaginatedResult]:
+        """Kategoriya va uning kitoblari (bitta JOIN so'rovda, pagination bilan)"""
+        file_type_value = _file_type_value(file_type)
+
+        book_filter = "(b.is_deleted = 0 OR b.is_deleted IS NULL)"
+        params = []
+        if file_type_value:
+            book_filter += " AND b.file_type = ?"
+            params.append(file_type_value)
+
+        sql = f"""
+            SELECT c.id AS c_id, c.name AS c_name, c.description AS c_description,
+                   c.parent_id AS c_parent_id, c.created_at AS c_created_at, c.created_by AS c_created_by,
+                   b.*, COUNT(b.id) OVER () AS total_count
+            FROM Categories c
+            LEFT JOIN Books b ON b.category_id = c.id AND {book_filter}
+            WHERE c.id = ?
+            ORDER BY b.created_at DESC
+            LIMIT ? OFFSET ?
+        """
+        params.extend([category_id, per_page, (page - 1) * per_page])
+        rows = self.execute(sql, parameters=tuple(params), fetchall=True) or []
+
+        if rows:
+            first = rows[0]
+            category = Category(
+                id=first["c_id"],
+                name=first["c_name"],
+                description=first["c_description"],
+                parent_id=first["c_parent_id"],
+                created_at=_parse_datetime(first["c_created_at"], datetime.now()),
+                created_by=first["c_created_by"]
+            )
+            total = first["total_count"]
+        else:
+            # Sahifa chegaradan tashqarida — faqat kategoriyani olamiz
+            category = self.get_category_by_id(category_id)
+            total = self.count_books_by_category(category_id, file_type_value) if category else 0
+
+        books = [Book.from_row(row) for row in rows if row["id"] is not None]
+        total_pages = (total + per_page - 1) // per_page if total > 0 else 1
+
+        return category, PaginatedResult(
+            items=books,
+            total=total,
+            page=page,
+            per_page=per_page,
+            total_pages=total_pages,
+            has_next=page < total_pages,
+            has_prev=page > 1
+        )
+
     def get_all_books(self, file_type: Union[str, FileType] = None) -> List[Book]:
         """Barcha kitoblar (dataclass)"""
-        file_type_value = file_type.value if isinstance(file_type, FileType) else file_type
+        file_type_value = _file_type_value(file_type)
 
         if file_type_value:
             sql = """
-            SELECT Books.*, Categories.name as category_name 
-            FROM Books 
-            LEFT JOIN Categories ON Books.category_id = Categories.id
+            SELECT *
+            FROM Books
             WHERE (Books.is_deleted = 0 OR Books.is_deleted IS NULL) AND Books.file_type = ?
             ORDER BY Books.created_at DESC
             """
             rows = self.execute(sql, parameters=(file_type_value,), fetchall=True)
         else:
             sql = """
-            SELECT Books.*, Categories.name as category_name 
-            FROM Books 
-            LEFT JOIN Categories ON Books.category_id = Categories.id
+            SELECT *
+            FROM Books
             WHERE Books.is_deleted = 0 OR Books.is_deleted IS NULL
             ORDER BY Books.created_at DESC
             """
@@ -542,38 +814,36 @@ class BookDatabase(Database):
         return [Book.from_row(row) for row in (rows or [])]
 
     def get_books_by_category(self, category_id: int, file_type: Union[str, FileType] = None,
-                              page: int = 1, per_page: int = 20) -> PaginatedResult:
+                              page: int = 1, per_page: int = 20,
+                              include_subcategories: bool = False) -> PaginatedResult:
         """Kategoriya bo'yicha kitoblar (pagination bilan)"""
-        return self.get_books(category_id=category_id, file_type=file_type, page=page, per_page=per_page)
+        return self.get_books(category_id=category_id, file_type=file_type, page=page, per_page=per_page,
+                              include_subcategories=include_subcategories)
 
     def get_book_by_id(self, book_id: int) -> Optional[Book]:
-        """ID bo'yicha kitob (dataclass)"""
-        sql = """
-        SELECT Books.*, Categories.name as category_name 
-        FROM Books 
-        LEFT JOIN Categories ON Books.category_id = Categories.id
-        WHERE Books.id = ?
-        """
-        row = self.execute(sql, parameters=(book_id,), fetchone=True)
-        return Book.from_row(row)
+        """ID bo'yicha kitob (dataclass, keshlangan; topilmasa keshlanmaydi)"""
+        book = self._book_cache.get(book_id)
+        if book is None:
+            row = self.execute(SQL_BOOK_BY_ID, parameters=(book_id,), fetchone=True)
+            book = Book.from_row(row)
+            if book:
+                self._book_cache.set(book_id, book)
+        return book
 
     def get_book_by_file_id(self, file_id: str) -> Optional[Book]:
         """File ID bo'yicha kitob (dataclass)"""
         sql = """
-        SELECT Books.*, Categories.name as category_name 
-        FROM Books 
-        LEFT JOIN Categories ON Books.category_id = Categories.id
+        SELECT *
+        FROM Books
         WHERE Books.file_id = ?
         """
         row = self.execute(sql, parameters=(file_id,), fetchone=True)
         return Book.from_row(row)
 
-    def search_books(self, query: str, file_type: Union[str, FileType] = None,
-                     page: int = 1, per_page: int = 20, use_fts: bool = False) -> PaginatedResult:
-        """Kitob qidirish (pagination bilan)"""
+    @staticmethod
+    def _search_where(query: str, file_type_value: str = None) -> Tuple[str, list]:
+        """Qidiruv uchun WHERE qismi va parametrlar"""
         search_query = f"%{query}%"
-        file_type_value = file_type.value if isinstance(file_type, FileType) else file_type
-
         conditions = [
             "(Books.is_deleted = 0 OR Books.is_deleted IS NULL)",
             "(Books.title LIKE ? OR Books.author LIKE ? OR Books.narrator LIKE ?)"
@@ -584,7 +854,21 @@ class BookDatabase(Database):
             conditions.append("Books.file_type = ?")
             params.append(file_type_value)
 
-        where_clause = f"WHERE {' AND '.join(conditions)}"
+        return f"WHERE {' AND '.join(conditions)}", params
+
+    def count_search_books(self, query: str) -> Tuple[int, int]:
+        """Qidiruv natijalari soni turlar bo'yicha, faqat COUNT: (pdf, audio)"""
+        where_clause, params = self._search_where(query)
+        sql = f"SELECT file_type, COUNT(*) FROM Books {where_clause} GROUP BY file_type"
+        rows = self.execute(sql, parameters=tuple(params), fetchall=True)
+        counts = {row[0]: row[1] for row in (rows or [])}
+        return counts.get(FileType.PDF.value, 0), counts.get(FileType.AUDIO.value, 0)
+
+    def search_books(self, query: str, file_type: Union[str, FileType] = None,
+                     page: int = 1, per_page: int = 20, use_fts: bool = False) -> PaginatedResult:
+        """Kitob qidirish (pagination bilan)"""
+        file_type_value = _file_type_value(file_type)
+        where_clause, params = self._search_where(query, file_type_value)
 
         # Count
         count_sql = f"SELECT COUNT(*) FROM Books {where_clause}"
@@ -596,9 +880,8 @@ class BookDatabase(Database):
 
         # Ma'lumotlar
         sql = f"""
-        SELECT Books.*, Categories.name as category_name 
-        FROM Books 
-        LEFT JOIN Categories ON Books.category_id = Categories.id
+        SELECT *
+        FROM Books
         {where_clause}
         ORDER BY Books.title
         LIMIT ? OFFSET ?
@@ -625,11 +908,13 @@ class BookDatabase(Database):
         else:
             sql = "UPDATE Books SET is_deleted = 1, deleted_at = CURRENT_TIMESTAMP WHERE id = ?"
         self.execute(sql, parameters=(book_id,), commit=True)
+        self.clear_cache()
 
     def restore_book(self, book_id: int):
         """O'chirilgan kitobni qaytarish"""
         sql = "UPDATE Books SET is_deleted = 0, deleted_at = NULL WHERE id = ?"
         self.execute(sql, parameters=(book_id,), commit=True)
+        self.clear_cache()
 
     def delete_books_bulk(self, book_ids: list, hard_delete: bool = False) -> int:
         """Ko'p kitobni o'chirish"""
@@ -642,18 +927,34 @@ class BookDatabase(Database):
                 continue
         return deleted
 
-    def increment_download_count(self, book_id: int) -> int:
-        """Yuklab olishlar sonini oshirish"""
-        sql = "UPDATE Books SET download_count = download_count + 1 WHERE id = ?"
-        self.execute(sql, parameters=(book_id,), commit=True)
+    def queue_download(self, book_id: int):
+        """Yuklab olishni navbatga qo'shish (bazaga flush_download_counts da yoziladi)"""
+        self._pending_downloads[book_id] += 1
 
-        result = self.execute("SELECT download_count FROM Books WHERE id = ?",
-                              parameters=(book_id,), fetchone=True)
-        return result[0] if result else 0
+    def flush_download_counts(self) -> int:
+        """Navbatdagi yuklab olishlarni bitta executemany bilan bazaga yozish"""
+        if not self._pending_downloads:
+            return 0
+        pending = self._pending_downloads
+        self._pending_downloads = Counter()
+        try:
+            self.executemany(SQL_ADD_DOWNLOADS, [(count, book_id) for book_id, count in pending.items()])
+        except sqlite3.Error:
+            # Yozilmadi (masalan, baza band): sonlar yo'qolmasin, keyingi flushda qayta urinamiz
+            self._pending_downloads.update(pending)
+            raise
+        return len(pending)
 
     def count_books(self, file_type: Union[str, FileType] = None, include_deleted: bool = False) -> int:
-        """Kitoblar soni"""
-        file_type_value = file_type.value if isinstance(file_type, FileType) else file_type
+        """Kitoblar soni (keshlangan)"""
+        file_type_value = _file_type_value(file_type)
+        return self._cache.get_or_set(
+            ("count_books", file_type_value, include_deleted),
+            lambda: self._fetch_count_books(file_type_value, include_deleted)
+        )
+
+    def _fetch_count_books(self, file_type_value: str = None, include_deleted: bool = False) -> int:
+        """Kitoblar soni (bazadan)"""
 
         conditions = []
         params = []
@@ -670,11 +971,13 @@ class BookDatabase(Database):
         result = self.execute(sql, parameters=tuple(params), fetchone=True)
         return result[0] if result else 0
 
-    def count_books_by_category(self, category_id: int, file_type: Union[str, FileType] = None) -> int:
-        """Kategoriya bo'yicha kitoblar soni"""
-        file_type_value = file_type.value if isinstance(file_type, FileType) else file_type
+    def count_books_by_category(self, category_id: int, file_type: Union[str, FileType] = None,
+                                include_subcategories: bool = False) -> int:
+        """Kategoriya bo'yicha kitoblar soni (ixtiyoriy: subkategoriyalari bilan)"""
+        file_type_value = _file_type_value(file_type)
 
-        conditions = ["category_id = ?", "(is_deleted = 0 OR is_deleted IS NULL)"]
+        category_filter = f"category_id IN ({SQL_SUBTREE_IDS})" if include_subcategories else "category_id = ?"
+        conditions = [category_filter, "(is_deleted = 0 OR is_deleted IS NULL)"]
         params = [category_id]
 
         if file_type_value:
@@ -685,15 +988,46 @@ class BookDatabase(Database):
         result = self.execute(sql, parameters=tuple(params), fetchone=True)
         return result[0] if result else 0
 
+    def count_books_by_type(self, category_id: int = None,
+                            include_subcategories: bool = False) -> Tuple[int, int]:
+        """PDF va audio kitoblar soni: (pdf, audio) (keshlangan)"""
+        return self._cache.get_or_set(
+            ("count_by_type", category_id, include_subcategories),
+            lambda: self._fetch_count_books_by_type(category_id, include_subcategories)
+        )
+
+    def _fetch_count_books_by_type(self, category_id: int = None,
+                                   include_subcategories: bool = False) -> Tuple[int, int]:
+        """PDF va audio kitoblar soni bitta GROUP BY so'rovda (bazadan)"""
+        conditions = ["(is_deleted = 0 OR is_deleted IS NULL)"]
+        params = []
+
+        if category_id:
+            category_filter = f"category_id IN ({SQL_SUBTREE_IDS})" if include_subcategories else "category_id = ?"
+            conditions.append(category_filter)
+            params.append(category_id)
+
+        sql = f"SELECT file_type, COUNT(*) FROM Books WHERE {' AND '.join(conditions)} GROUP BY file_type"
+        rows = self.execute(sql, parameters=tuple(params), fetchall=True)
+        counts = {row[0]: row[1] for row in (rows or [])}
+        return counts.get(FileType.PDF.value, 0), counts.get(FileType.AUDIO.value, 0)
+
     def get_popular_books(self, limit: int = 10, file_type: Union[str, FileType] = None) -> List[Book]:
-        """Eng mashhur kitoblar (dataclass)"""
-        file_type_value = file_type.value if isinstance(file_type, FileType) else file_type
+        """Eng mashhur kitoblar (dataclass, keshlangan)"""
+        file_type_value = _file_type_value(file_type)
+        return self._cache.get_or_set(
+            ("popular", limit, file_type_value),
+            lambda: self._fetch_popular_books(limit, file_type_value),
+            ttl=POPULAR_CACHE_TTL
+        )
+
+    def _fetch_popular_books(self, limit: int, file_type_value: str = None) -> List[Book]:
+        """Eng mashhur kitoblar (bazadan)"""
 
         if file_type_value:
             sql = """
-            SELECT Books.*, Categories.name as category_name 
-            FROM Books 
-            LEFT JOIN Categories ON Books.category_id = Categories.id
+            SELECT *
+            FROM Books
             WHERE (Books.is_deleted = 0 OR Books.is_deleted IS NULL) AND Books.file_type = ?
             ORDER BY Books.download_count DESC
             LIMIT ?
@@ -701,9 +1035,8 @@ class BookDatabase(Database):
             rows = self.execute(sql, parameters=(file_type_value, limit), fetchall=True)
         else:
             sql = """
-            SELECT Books.*, Categories.name as category_name 
-            FROM Books 
-            LEFT JOIN Categories ON Books.category_id = Categories.id
+            SELECT *
+            FROM Books
             WHERE Books.is_deleted = 0 OR Books.is_deleted IS NULL
             ORDER BY Books.download_count DESC
             LIMIT ?
@@ -714,13 +1047,12 @@ class BookDatabase(Database):
 
     def get_recent_books(self, limit: int = 10, file_type: Union[str, FileType] = None) -> List[Book]:
         """Eng yangi kitoblar (dataclass)"""
-        file_type_value = file_type.value if isinstance(file_type, FileType) else file_type
+        file_type_value = _file_type_value(file_type)
 
         if file_type_value:
             sql = """
-            SELECT Books.*, Categories.name as category_name 
-            FROM Books 
-            LEFT JOIN Categories ON Books.category_id = Categories.id
+            SELECT *
+            FROM Books
             WHERE (Books.is_deleted = 0 OR Books.is_deleted IS NULL) AND Books.file_type = ?
             ORDER BY Books.created_at DESC
             LIMIT ?
@@ -728,9 +1060,8 @@ class BookDatabase(Database):
             rows = self.execute(sql, parameters=(file_type_value, limit), fetchall=True)
         else:
             sql = """
-            SELECT Books.*, Categories.name as category_name 
-            FROM Books 
-            LEFT JOIN Categories ON Books.category_id = Categories.id
+            SELECT *
+            FROM Books
             WHERE Books.is_deleted = 0 OR Books.is_deleted IS NULL
             ORDER BY Books.created_at DESC
             LIMIT ?
@@ -773,7 +1104,7 @@ class BookDatabase(Database):
             updates.append("file_id = ?")
             params.append(file_id)
         if file_type is not None:
-            file_type_value = file_type.value if isinstance(file_type, FileType) else file_type
+            file_type_value = _file_type_value(file_type)
             updates.append("file_type = ?")
             params.append(file_type_value)
         if file_size is not None:
@@ -789,6 +1120,7 @@ class BookDatabase(Database):
         params.append(book_id)
         sql = f"UPDATE Books SET {', '.join(updates)} WHERE id = ?"
         self.execute(sql, parameters=tuple(params), commit=True)
+        self.clear_cache()
         return True
 
     # Backward compatible metodlar
@@ -815,22 +1147,44 @@ class BookDatabase(Database):
     # =================== STATISTIKA ===================
 
     def get_statistics(self) -> Statistics:
-        """To'liq statistika (dataclass)"""
-        total_downloads_sql = "SELECT COALESCE(SUM(download_count), 0) FROM Books WHERE is_deleted = 0 OR is_deleted IS NULL"
-        total_downloads = self.execute(total_downloads_sql, fetchone=True)[0] or 0
+        """To'liq statistika (dataclass, keshlangan)"""
+        return self._cache.get_or_set("statistics", self._fetch_statistics, ttl=STATS_CACHE_TTL)
 
-        deleted_books = self.count_books(include_deleted=True) - self.count_books()
-        deleted_cats = self.count_categories(include_deleted=True) - self.count_categories()
+    def _fetch_statistics(self) -> Statistics:
+        """To'liq statistika (bazadan, bitta so'rovda)"""
+        sql = """
+        SELECT
+            c.total_categories, c.main_categories, c.deleted_categories,
+            b.total_books, b.pdf_books, b.audio_books, b.total_downloads, b.deleted_books
+        FROM (
+            SELECT
+                COALESCE(SUM(COALESCE(is_deleted, 0) = 0), 0) AS total_categories,
+                COALESCE(SUM(COALESCE(is_deleted, 0) = 0 AND parent_id IS NULL), 0) AS main_categories,
+                COALESCE(SUM(COALESCE(is_deleted, 0) != 0), 0) AS deleted_categories
+            FROM Categories
+        ) c, (
+            SELECT
+                COALESCE(SUM(COALESCE(is_deleted, 0) = 0), 0) AS total_books,
+                COALESCE(SUM(COALESCE(is_deleted, 0) = 0 AND file_type = 'pdf'), 0) AS pdf_books,
+                COALESCE(SUM(COALESCE(is_deleted, 0) = 0 AND file_type = 'audio'), 0) AS audio_books,
+                COALESCE(SUM(CASE WHEN COALESCE(is_deleted, 0) = 0 THEN download_count END), 0) AS total_downloads,
+                COALESCE(SUM(COALESCE(is_deleted, 0) != 0), 0) AS deleted_books
+            FROM Books
+        ) b
+        """
+        row = self.execute(sql, fetchone=True)
+        if not row:
+            return Statistics(0, 0, 0, 0, 0)
 
         return Statistics(
-            total_categories=self.count_categories(),
-            main_categories=len(self.get_main_categories()),
-            total_books=self.count_books(),
-            pdf_books=self.count_books(file_type='pdf'),
-            audio_books=self.count_books(file_type='audio'),
-            total_downloads=total_downloads,
-            deleted_books=deleted_books,
-            deleted_categories=deleted_cats
+            total_categories=row["total_categories"],
+            main_categories=row["main_categories"],
+            total_books=row["total_books"],
+            pdf_books=row["pdf_books"],
+            audio_books=row["audio_books"],
+            total_downloads=row["total_downloads"],
+            deleted_books=row["deleted_books"],
+            deleted_categories=row["deleted_categories"]
         )
 
     def get_deleted_items_count(self) -> Dict[str, int]:
@@ -874,8 +1228,10 @@ class BookDatabase(Database):
         except:
             pass
 
+        self.clear_cache()
         return {"books": books_deleted, "categories": cats_deleted}
 
     def clear_cache(self):
-        """Cache ni tozalash (placeholder)"""
-        pass
\ No newline at end of file
+        """Cache ni tozalash"""
+        self._cache.clear()
+        self._book_cache.clear()
\ No newline at end of file
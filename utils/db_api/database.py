@@ -1,7 +1,22 @@
 # database.py: Umumiy ma'lumotlar bazasi bilan bog'lanish va "execute" funksiyasi
 import sqlite3
+import threading
 from datetime import datetime
 
+# Baza band bo'lsa kutish vaqti (soniya)
+DB_TIMEOUT = 10
+# Har bir ulanishda tayyorlangan (prepared) so'rovlar keshi hajmi
+CACHED_STATEMENTS = 256
+# Har bir yangi ulanishda bajariladigan sozlamalar:
+# WAL o'quvchilarni yozuvchi bilan bloklamaydi, NORMAL WAL da xavfsiz va tezroq,
+# mmap o'qishni sahifa keshi orqali tezlashtiradi
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+)
+
 def logger(statement):
     print(f"""
 _____________________________________________________        
@@ -13,33 +28,80 @@ _____________________________________________________
 class Database:
     def __init__(self, path_to_db="main.db"):
         self.path_to_db = path_to_db
+        # Har bir oqim (thread) uchun bitta doimiy ulanish
+        self._local = threading.local()
 
     @property
     def connection(self):
-        return sqlite3.connect(self.path_to_db)
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path_to_db, timeout=DB_TIMEOUT, cached_statements=CACHED_STATEMENTS
+            )
+            # Qatorlar ham indeks (row[0]), ham nom (row["id"]) bo'yicha o'qiladi
+            connection.row_factory = sqlite3.Row
+            for pragma in CONNECTION_PRAGMAS:
+                connection.execute(pragma)
+            connection.set_trace_callback(logger)
+            self._local.connection = connection
+        return connection
 
     def execute(self, sql: str, parameters: tuple = None, fetchone=False, fetchall=False, commit=False):
         if not parameters:
             parameters = ()
         connection = self.connection
-        connection.set_trace_callback(logger)
         cursor = connection.cursor()
         data = None
         try:
             cursor.execute(sql, parameters)
-            if commit:
-                connection.commit()
+            # RETURNING natijalari commit dan oldin o'qilishi kerak
             if fetchall:
                 data = cursor.fetchall()
             if fetchone:
                 data = cursor.fetchone()
+            if commit:
+                connection.commit()
         except sqlite3.Error as e:
             print(f"SQLite error: {e}")
             connection.rollback()
         finally:
-            connection.close()
+            cursor.close()
+            # commit qilinmagan o'zgarishlar keyingi so'rovga o'tib ketmasin
+            if connection.in_transaction:
+                connection.rollback()
         return data
 
+    def executemany(self, sql: str, seq_of_parameters, commit=True):
+        """
+        Bitta so'rovni ko'p parametrlar bilan bajarish (bitta tranzaksiyada).
+
+        Xatoda rollback qilinadi va sqlite3.Error qayta ko'tariladi: chaqiruvchi
+        (masalan, navbatdagi yozuvlarni flush qiluvchi) ma'lumotni qayta navbatga qo'yishi mumkin.
+        """
+        connection = self.connection
+        cursor = connection.cursor()
+        try:
+            cursor.executemany(sql, seq_of_parameters)
+            rowcount = cursor.rowcount
+            if commit:
+                connection.commit()
+        except sqlite3.Error as e:
+            print(f"SQLite error: {e}")
+            connection.rollback()
+            raise
+        finally:
+            cursor.close()
+            if connection.in_transaction:
+                connection.rollback()
+        return rowcount
+
+    def close(self):
+        """Joriy oqim ulanishini yopish"""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
     @staticmethod
     def format_args(sql, parameters: dict):
         sql += " AND ".join([f"{item} = ?" for item in parameters])
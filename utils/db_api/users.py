@@ -1,8 +1,21 @@
 from .database import Database
 from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Set
+import sqlite3
+import time
+
+# Bitta foydalanuvchi faolligi shu oraliqdan (soniya) tez-tez yozilmaydi
+ACTIVITY_DEBOUNCE = 30
 
 
 class UserDatabase(Database):
+    def __init__(self, path_to_db="main.db"):
+        super().__init__(path_to_db)
+        self._pending_active: Set[int] = set()
+        self._last_seen: Dict[int, float] = {}
+        # telegram_id -> Users.id (har xabarda SELECT qilmaslik uchun)
+        self._known_users: Dict[int, int] = {}
+
     def create_table_users(self):
         # Foydalanuvchilar jadvali
         sql_users = """
@@ -49,6 +62,21 @@ class UserDatabase(Database):
         else:
             print(f"User with telegram_id {telegram_id} already exists.")
 
+    def upsert_user(self, telegram_id: int, username: str) -> bool:
+        """Foydalanuvchini qo'shish yoki faolligini yangilash (bitta so'rov). Yangi bo'lsa True"""
+        now = datetime.now().isoformat()
+        sql = """
+        INSERT INTO Users (telegram_id, username, last_active, is_active, created_at)
+        VALUES (?, ?, ?, TRUE, ?)
+        ON CONFLICT (telegram_id) DO UPDATE
+        SET username = excluded.username, last_active = excluded.last_active, is_active = TRUE
+        RETURNING id, created_at = ?
+        """
+        result = self.execute(sql, parameters=(telegram_id, username, now, now, now), fetchone=True, commit=True)
+        if result:
+            self._known_users[telegram_id] = result[0]
+        return bool(result and result[1])
+
     def select_all_users(self):
         sql = "SELECT * FROM Users"
         return self.execute(sql, fetchall=True)
@@ -63,6 +91,7 @@ class UserDatabase(Database):
 
     def delete_users(self):
         self.execute("DELETE FROM Users WHERE TRUE", commit=True)
+        self._known_users.clear()
 
     def update_user_last_active(self, telegram_id: int):
         sql = """
@@ -73,6 +102,55 @@ class UserDatabase(Database):
         last_active = datetime.now().isoformat()
         self.execute(sql, parameters=(last_active, telegram_id), commit=True)
 
+    def load_known_users(self) -> int:
+        """Ro'yxatdan o'tgan telegram_id larni xotiraga yuklash (startup da)"""
+        rows = self.execute("SELECT telegram_id, id FROM Users", fetchall=True)
+        self._known_users = {row[0]: row[1] for row in (rows or [])}
+        return len(self._known_users)
+
+    def is_known_user(self, telegram_id: int) -> bool:
+        """Foydalanuvchi ro'yxatdan o'tganmi (bazaga murojaatsiz)"""
+        return telegram_id in self._known_users
+
+    def get_user_id(self, telegram_id: int) -> Optional[int]:
+        """Telegram ID dan Users.id (avval xotiradan, bo'lmasa bazadan)"""
+        user_id = self._known_users.get(telegram_id)
+        if user_id is None:
+            row = self.execute("SELECT id FROM Users WHERE telegram_id = ?", parameters=(telegram_id,), fetchone=True)
+            if row:
+                user_id = self._known_users[telegram_id] = row[0]
+        return user_id
+
+    def bulk_touch_last_active(self, telegram_ids: Iterable[int]):
+        """
+        Ko'p foydalanuvchining last_active ini bitta tranzaksiyada yangilash.
+        Xatoda sqlite3.Error ko'tariladi (executemany).
+        """
+        last_active = datetime.now().isoformat()
+        sql = "UPDATE Users SET last_active = ?, is_active = TRUE WHERE telegram_id = ?"
+        self.executemany(sql, [(last_active, telegram_id) for telegram_id in telegram_ids])
+
+    def mark_active(self, telegram_id: int):
+        """Faollikni belgilash (bazaga flush_last_active da yoziladi)"""
+        now = time.monotonic()
+        if now - self._last_seen.get(telegram_id, 0) > ACTIVITY_DEBOUNCE:
+            self._last_seen[telegram_id] = now
+            self._pending_active.add(telegram_id)
+
+    def flush_last_active(self) -> int:
+        """Navbatdagi faolliklarni bazaga yozish"""
+        if not self._pending_active:
+            return 0
+        telegram_ids = self._pending_active
+        self._pending_active = set()
+        try:
+            self.bulk_touch_last_active(telegram_ids)
+        except sqlite3.Error:
+            # Yozilmadi: id lar keyingi flushda qayta urinish uchun navbatga qaytadi
+            self._pending_active |= telegram_ids
+            raise
+        return len(telegram_ids)
+
     def deactivate_user(self, telegram_id: int):
         sql = """
         UPDATE Users
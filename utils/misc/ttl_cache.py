@@ -0,0 +1,51 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Jarayon ichidagi oddiy TTL kesh.
+
+    Yozuvlar `ttl` soniyadan keyin eskiradi, `maxsize` dan oshsa
+    eng eski yozuv chiqarib tashlanadi.
+    """
+
+    def __init__(self, ttl: float = 60, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Keshdan olish (eskirgan bo'lsa default)"""
+        item = self._data.get(key)
+        if item is not None and item[0] > time.monotonic():
+            return item[1]
+        return default
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """Keshdan olish, bo'lmasa factory() natijasini saqlash"""
+        item = self._data.get(key)
+        if item is not None and item[0] > time.monotonic():
+            return item[1]
+        value = factory()
+        self.set(key, value, ttl)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Qiymatni saqlash"""
+        self._data[key] = (time.monotonic() + (ttl or self.ttl), value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable):
+        """Bitta yozuvni o'chirish"""
+        self._data.pop(key, None)
+
+    def clear(self):
+        """Hammasini tozalash"""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
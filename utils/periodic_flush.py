@@ -0,0 +1,23 @@
+import asyncio
+import logging
+
+from loader import book_db, user_db
+
+# Navbatdagi yozuvlarni bazaga yozish oralig'i (soniya)
+FLUSH_INTERVAL = 10
+
+
+def flush_pending_writes():
+    """Xotirada yig'ilgan yozuvlarni bazaga yozish (biri xato bersa, ikkinchisi baribir yoziladi)"""
+    for flush in (user_db.flush_last_active, book_db.flush_download_counts):
+        try:
+            flush()
+        except Exception as err:
+            logging.exception(f"Error while flushing pending writes ({flush.__name__}): {err}")
+
+
+async def periodic_flush(interval: int = FLUSH_INTERVAL):
+    """Navbatdagi yozuvlarni vaqti-vaqti bilan bazaga yozish"""
+    while True:
+        await asyncio.sleep(interval)
+        flush_pending_writes()